@@ -0,0 +1,66 @@
+import sys
+import time
+import uuid
+
+from validator import generate_user_id, USER_ID_SPACE
+
+
+def build_users(count: int):
+    """Distinct synthetic registrations, generated lazily"""
+    for i in range(count):
+        yield {
+            'username': f'user{i}',
+            'password': 'password123',
+            'email': f'user{i}@example.com',
+            'age': 18 + i % 80,
+            'deviceID': f'DEV{i:07d}',
+            'uuid': str(uuid.UUID(int=i))
+        }
+
+
+def legacy_user_id(user_data):
+    """Original per-process userId, kept here as the benchmark baseline"""
+    return f"USR{str(hash(str(user_data)))[-6:].zfill(6)}"
+
+
+def count_collisions(generator, count: int) -> int:
+    """How many generated ids were already taken by an earlier user"""
+    seen = bytearray(USER_ID_SPACE)
+    collisions = 0
+    for user in build_users(count):
+        slot = int(generator(user)[3:])
+        if seen[slot]:
+            collisions += 1
+        else:
+            seen[slot] = 1
+    return collisions
+
+
+def time_generator(generator, users) -> float:
+    start = time.perf_counter()
+    for user in users:
+        generator(user)
+    return time.perf_counter() - start
+
+
+def run_benchmark(count: int = 10_000_000, timing_sample: int = 200_000):
+    """Compare the keyed-digest userId with the legacy hash() userId"""
+    # A perfectly uniform generator still collides once ids outnumber the
+    # 6-digit space; this is the best achievable distinct count
+    ideal_distinct = USER_ID_SPACE * (1 - (1 - 1 / USER_ID_SPACE) ** count)
+
+    print(f"📊 Generating {count:,} userIds into a space of {USER_ID_SPACE:,}")
+    print(f"Ideal uniform generator: {ideal_distinct:,.0f} distinct ({1 - ideal_distinct / count:.2%} collision rate)")
+
+    # Timed on a prebuilt sample so building users does not count
+    users = list(build_users(min(count, timing_sample)))
+
+    for name, generator in (('Keyed digest', generate_user_id), ('Legacy hash()', legacy_user_id)):
+        ids_per_second = len(users) / time_generator(generator, users)
+        collisions = count_collisions(generator, count)
+        print(f"{name:<14} {ids_per_second:,.0f} ids/s | {count - collisions:,} distinct | "
+              f"{collisions / count:.2%} collision rate")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
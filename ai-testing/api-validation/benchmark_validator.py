@@ -0,0 +1,212 @@
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import tempfile
+from typing import Dict, List, Any
+
+from validator import APIValidator
+
+
+def legacy_validate_request(requirements: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Original rule interpreter, kept here as the benchmark baseline"""
+    errors = []
+
+    for field, rules in requirements['request'].items():
+        if rules.get('required', False) and field not in data:
+            errors.append({'field': field, 'message': f'{field} is required'})
+            continue
+
+        if field in data:
+            value = data[field]
+
+            if rules['type'] == 'string' and not isinstance(value, str):
+                errors.append({'field': field, 'message': f'{field} must be a string'})
+                continue
+
+            if rules['type'] == 'integer' and not isinstance(value, int):
+                errors.append({'field': field, 'message': f'{field} must be an integer'})
+                continue
+
+            if isinstance(value, str):
+                if 'min_length' in rules and len(value) < rules['min_length']:
+                    errors.append({'field': field, 'message': f'{field} must be at least {rules["min_length"]} characters'})
+
+                if 'max_length' in rules and len(value) > rules['max_length']:
+                    errors.append({'field': field, 'message': f'{field} must be at most {rules["max_length"]} characters'})
+
+            if isinstance(value, int):
+                if 'min' in rules and value < rules['min']:
+                    errors.append({'field': field, 'message': f'{field} must be at least {rules["min"]}'})
+
+                if 'max' in rules and value > rules['max']:
+                    errors.append({'field': field, 'message': f'{field} must be at most {rules["max"]}'})
+
+            if 'pattern' in rules and isinstance(value, str):
+                if rules['pattern'] == 'alphanumeric':
+                    if not re.match(r'^[a-zA-Z0-9]+$', value):
+                        errors.append({'field': field, 'message': f'{field} must contain only alphanumeric characters'})
+
+            if 'format' in rules and isinstance(value, str):
+                if rules['format'] == 'email':
+                    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
+                        errors.append({'field': field, 'message': f'{field} must be a valid email address'})
+
+                if rules['format'] == 'uuid':
+                    try:
+                        uuid.UUID(value)
+                    except ValueError:
+                        errors.append({'field': field, 'message': f'{field} must be a valid UUID'})
+
+    return {
+        'valid': len(errors) == 0,
+        'errors': errors
+    }
+
+
+def build_payloads(count: int) -> List[Dict[str, Any]]:
+    """Mix of valid and invalid registration payloads"""
+    templates = [
+        {
+            'username': 'testuser123',
+            'password': 'password123',
+            'email': 'test@example.com',
+            'age': 25,
+            'deviceID': 'ABC1234567',
+            'uuid': str(uuid.uuid4())
+        },
+        {
+            'username': 'usr',
+            'password': '123',
+            'email': 'invalid-email',
+            'age': 15,
+            'deviceID': '123'
+        },
+        {
+            'username': 'user@123',
+            'password': 'password123',
+            'email': 'test@example',
+            'age': '25',
+            'deviceID': 'ABC1234567',
+            'uuid': 'invalid-uuid'
+        },
+        {'username': 'testuser123'}
+    ]
+    return [templates[i % len(templates)] for i in range(count)]
+
+
+def run_benchmark(requirements_file: str = 'requirements.json', count: int = 100000):
+    """Time the legacy interpreter against the compiled validator"""
+    validator = APIValidator(requirements_file)
+    payloads = build_payloads(count)
+
+    # Both paths must agree before their timings mean anything
+    for payload in payloads[:100]:
+        assert legacy_validate_request(validator.requirements, payload) == validator.validate_request(payload)
+
+    start = time.perf_counter()
+    for payload in payloads:
+        legacy_validate_request(validator.requirements, payload)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for payload in payloads:
+        validator.validate_request(payload)
+    compiled_seconds = time.perf_counter() - start
+
+    print(f"📊 Validated {count} payloads against {requirements_file}")
+    print(f"Legacy interpreter: {legacy_seconds:.3f}s ({count / legacy_seconds:,.0f} req/s)")
+    print(f"Compiled validator: {compiled_seconds:.3f}s ({count / compiled_seconds:,.0f} req/s)")
+    print(f"Speedup: {legacy_seconds / compiled_seconds:.2f}x")
+
+    return {
+        'count': count,
+        'legacy_seconds': legacy_seconds,
+        'compiled_seconds': compiled_seconds
+    }
+
+
+def naive_rule_scan(rules: List[Dict[str, Any]], data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Evaluate every dependent rule's trigger in turn, the unindexed alternative"""
+    fired = []
+    for rule in rules:
+        trigger = rule['when']
+        operator = trigger.get('operator', 'equals')
+        value = data.get(trigger['field'])
+        if value is None:
+            continue
+        if operator == 'equals':
+            matched = value == trigger['value']
+        elif operator == 'in':
+            matched = value in trigger['value']
+        elif operator == 'domain_in':
+            matched = isinstance(value, str) and value.rpartition('@')[2].lower() in trigger['value']
+        else:
+            matched = isinstance(value, int) and {
+                'lt': value < trigger['value'], 'lte': value <= trigger['value'],
+                'gt': value > trigger['value'], 'gte': value >= trigger['value']
+            }[operator]
+        if matched:
+            fired.append(rule)
+    return fired
+
+
+def synthetic_rules(count: int) -> List[Dict[str, Any]]:
+    """Dependent rules on extra user types and age thresholds that sample payloads rarely fire"""
+    rules = []
+    for i in range(count):
+        if i % 2:
+            when = {'field': 'userType', 'operator': 'equals', 'value': f'PARTNER{i}'}
+        else:
+            when = {'field': 'age', 'operator': 'gt', 'value': 60 + i}
+        rules.append({'name': f'synthetic_{i}', 'when': when,
+                      'then': {f'extra_{i}': {'type': 'string', 'required': True}}})
+    return rules
+
+
+def run_dependent_rule_benchmark(rule_counts=(5, 50, 200, 800), count: int = 20000):
+    """Per-request cost of the indexed dependent rules as the rule count grows"""
+    with open('enhanced_requirements.json', 'r') as f:
+        base = json.load(f)
+
+    payloads = [
+        {'username': 'student123', 'email': 'student@university.edu', 'age': 20, 'deviceID': 'STUD12345',
+         'userType': 'STUDENT', 'student_id': 'STU123456', 'university_email': 'student@university.edu'},
+        {'username': 'corp123', 'email': 'user@company.com', 'age': 30, 'deviceID': 'CORP12345',
+         'userType': 'EMPLOYEE', 'employee_id': 'EMP12345', 'department': 'IT', 'password': 'weak123'},
+        {'username': 'teen123', 'email': 'teen@example.com', 'age': 16, 'deviceID': 'REGULAR123',
+         'userType': 'GUEST'}
+    ]
+    payloads = [payloads[i % len(payloads)] for i in range(count)]
+
+    print(f"📊 Dependent rules: {count} requests per rule count")
+    for rule_count in rule_counts:
+        requirements = dict(base, dependent_rules=base['dependent_rules'] + synthetic_rules(rule_count))
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(requirements, f)
+        try:
+            validator = APIValidator(f.name)
+        finally:
+            os.remove(f.name)
+
+        start = time.perf_counter()
+        for payload in payloads:
+            validator.validate_request(payload)
+        indexed = (time.perf_counter() - start) / count * 1e6
+
+        start = time.perf_counter()
+        for payload in payloads:
+            naive_rule_scan(requirements['dependent_rules'], payload)
+        scan = (time.perf_counter() - start) / count * 1e6
+
+        print(f"{len(requirements['dependent_rules']):>5} rules: indexed validate_request {indexed:7.1f} us/req | "
+              f"trigger scan alone {scan:8.1f} us/req")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'dependent':
+        run_dependent_rule_benchmark()
+    else:
+        run_benchmark(count=int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
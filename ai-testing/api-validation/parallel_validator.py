@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from validator import APIValidator, MALFORMED_RESULT, iter_jsonl_chunks
+
+# Built once per worker process by _init_worker, never pickled
+_worker_validator = None
+
+
+def _init_worker(requirements_file: str):
+    """Build this worker's validator from the requirements file"""
+    global _worker_validator
+    _worker_validator = APIValidator(requirements_file)
+
+
+def split_shards(capture_file: str, shard_count: int) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges; each range owns the lines that start inside it"""
+    size = os.path.getsize(capture_file)
+    if size == 0:
+        return []
+    step = -(-size // max(1, min(shard_count, size)))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _iter_shard_lines(capture_file: str, start: int, end: int) -> Iterator[str]:
+    """Yield the lines that begin in [start, end)"""
+    with open(capture_file, 'rb') as f:
+        if start > 0:
+            # Skip the line already owned by the previous shard
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8')
+
+
+def _validate_shard(task: Tuple[str, int, int, int, int]) -> Dict[str, Any]:
+    """Validate one shard and summarize it as counts plus a few error samples"""
+    capture_file, start, end, chunk_size, max_samples = task
+    summary = {'records': 0, 'valid': 0, 'invalid': 0, 'error_counts': {}, 'samples': []}
+    error_counts = summary['error_counts']
+    samples = summary['samples']
+
+    for chunk in iter_jsonl_chunks(_iter_shard_lines(capture_file, start, end), chunk_size):
+        requests = [record for record in chunk if isinstance(record, dict)]
+        results = iter(_worker_validator.validate_batch(requests))
+
+        for position, record in enumerate(chunk, start=summary['records']):
+            result = next(results) if isinstance(record, dict) else MALFORMED_RESULT
+            if result['valid']:
+                summary['valid'] += 1
+                continue
+
+            summary['invalid'] += 1
+            for error in result['errors']:
+                error_counts[error['field']] = error_counts.get(error['field'], 0) + 1
+            if len(samples) < max_samples:
+                samples.append({'record': position, 'errors': result['errors']})
+
+        summary['records'] += len(chunk)
+
+    return summary
+
+
+class ParallelValidationRunner:
+    def __init__(self, requirements_file: str = 'requirements.json', workers: Optional[int] = None,
+                 chunk_size: int = 10000, max_samples: int = 100, shards_per_worker: int = 4):
+        self.requirements_file = requirements_file
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_samples = max_samples
+        # Several shards per worker keeps every core busy when shards finish unevenly
+        self.shards_per_worker = shards_per_worker
+
+    def run(self, capture_file: str) -> Dict[str, Any]:
+        """Validate a JSONL capture across a process pool and merge shard summaries in order"""
+        start_time = time.perf_counter()
+        shards = split_shards(capture_file, self.workers * self.shards_per_worker)
+        tasks = [(capture_file, start, end, self.chunk_size, self.max_samples) for start, end in shards]
+
+        merged = {'records': 0, 'valid': 0, 'invalid': 0, 'error_counts': {}, 'samples': []}
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.requirements_file,)) as executor:
+            # map yields in submission order, so shards merge in file order
+            for summary in executor.map(_validate_shard, tasks):
+                for sample in summary['samples']:
+                    if len(merged['samples']) >= self.max_samples:
+                        break
+                    merged['samples'].append({
+                        'record': merged['records'] + sample['record'],
+                        'errors': sample['errors']
+                    })
+
+                for field, count in summary['error_counts'].items():
+                    merged['error_counts'][field] = merged['error_counts'].get(field, 0) + count
+
+                merged['records'] += summary['records']
+                merged['valid'] += summary['valid']
+                merged['invalid'] += summary['invalid']
+
+        merged['workers'] = self.workers
+        merged['shards'] = len(tasks)
+        merged['seconds'] = time.perf_counter() - start_time
+        merged['records_per_second'] = merged['records'] / merged['seconds'] if merged['seconds'] > 0 else 0.0
+        return merged
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Validate a JSONL request capture across a process pool')
+    parser.add_argument('capture', help='JSONL file of requests')
+    parser.add_argument('--requirements', default='requirements.json', help='requirements file')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='requests validated per chunk')
+    parser.add_argument('--samples', type=int, default=20, help='error samples to keep')
+    args = parser.parse_args(argv)
+
+    runner = ParallelValidationRunner(args.requirements, args.workers, args.chunk_size, args.samples)
+    summary = runner.run(args.capture)
+
+    print(f"✅ Validated {summary['records']} requests ({summary['valid']} valid, {summary['invalid']} invalid) "
+          f"on {summary['workers']} workers in {summary['seconds']:.2f}s - "
+          f"{summary['records_per_second']:,.0f} records/s", file=sys.stderr)
+    print(json.dumps({key: summary[key] for key in ('records', 'valid', 'invalid', 'error_counts', 'samples')},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
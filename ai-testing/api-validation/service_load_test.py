@@ -0,0 +1,94 @@
+import json
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Any, Optional
+
+from benchmark_validator import build_payloads
+from validation_service import read_http_message
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def _run_client(host: str, port: int, path: str, bodies: List[bytes], latencies: List[float],
+                      statuses: Dict[int, int]):
+    """Send every body over one keep-alive connection, recording per-request latency"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (f"POST {path} HTTP/1.1\r\n"
+                       f"Host: {host}:{port}\r\n"
+                       f"Content-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            message = await read_http_message(reader)
+            latencies.append(time.perf_counter() - start)
+
+            if message is None:
+                raise ConnectionError('service closed the connection')
+            status = int(message[0].split(' ')[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load_test(host: str = '127.0.0.1', port: int = 8080, clients: int = 16,
+                        requests_per_client: int = 200, batch_size: int = 0) -> Dict[str, Any]:
+    """Hit the validation service from concurrent keep-alive clients and summarize latency"""
+    if batch_size:
+        path = '/validate/batch'
+        bodies = [json.dumps(build_payloads(batch_size)).encode('utf-8')] * requests_per_client
+    else:
+        path = '/validate'
+        bodies = [json.dumps(payload).encode('utf-8') for payload in build_payloads(requests_per_client)]
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_run_client(host, port, path, bodies, latencies, statuses) for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'endpoint': path,
+        'clients': clients,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'statuses': statuses
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Load test a running validation_service.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--clients', type=int, default=16, help='concurrent keep-alive connections')
+    parser.add_argument('--requests', type=int, default=200, help='requests sent by each client')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help='payloads per /validate/batch call (0 uses /validate)')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load_test(args.host, args.port, args.clients, args.requests, args.batch_size))
+
+    print(f"📊 {report['requests']} requests to {report['endpoint']} from {report['clients']} clients "
+          f"in {report['seconds']:.2f}s ({report['requests_per_second']:,.0f} req/s)")
+    print(f"Latency p50: {report['p50_ms']:.2f} ms | p99: {report['p99_ms']:.2f} ms | max: {report['max_ms']:.2f} ms")
+    print(f"Status codes: {report['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
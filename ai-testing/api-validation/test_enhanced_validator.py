@@ -1,5 +1,7 @@
+import io
+import json
 import pytest
-from validator import APIValidator as EnhancedAPIValidator
+from validator import APIValidator as EnhancedAPIValidator, stream_validate
 
 class TestEnhancedAPIValidator:
     def setup_method(self):
@@ -244,6 +246,40 @@ class TestEnhancedAPIValidator:
         assert 'error_breakdown' in response
         assert response['error_breakdown']['independent_errors'] > 0
         assert response['error_breakdown']['dependent_errors'] > 0
+    
+    def test_bool_trigger_does_not_match_numeric_rule(self, tmp_path):
+        """Test True/False only trigger rules keyed on booleans, not on 1/0 (True == 1 in Python)"""
+        requirements = json.load(open('enhanced_requirements.json'))
+        requirements['dependent_rules'] = [
+            {'name': 'tier_one', 'when': {'field': 'tier', 'operator': 'equals', 'value': 1},
+             'then': {'tier_code': {'type': 'string', 'required': True}}},
+            {'name': 'beta', 'when': {'field': 'beta', 'operator': 'in', 'value': [True]},
+             'then': {'beta_key': {'type': 'string', 'required': True}}}
+        ]
+        requirements_file = tmp_path / 'requirements.json'
+        requirements_file.write_text(json.dumps(requirements))
+        validator = EnhancedAPIValidator(str(requirements_file))
+        
+        assert validator.validate_dependent_requirements({'tier': True}) == []
+        assert validator.validate_dependent_requirements({'beta': 1}) == []
+        assert [e['field'] for e in validator.validate_dependent_requirements({'tier': 1})] == ['tier_code']
+        assert [e['field'] for e in validator.validate_dependent_requirements({'beta': True})] == ['beta_key']
+    
+    def test_malformed_record_response_meets_contract(self):
+        """Test a non-object JSONL line still gets the error_breakdown the invalid response contract requires"""
+        sink = io.StringIO()
+        stream_validate(self.validator, ['not json\n', '[1, 2]\n'], sink)
+        responses = [json.loads(line) for line in sink.getvalue().splitlines()]
+        
+        assert len(responses) == 2
+        for response in responses:
+            assert response['error_breakdown'] == {'independent_errors': 1, 'dependent_errors': 0}
+            assert self.validator.validate_response(response)['valid']
+        
+        # Without the requirement in the contract, responses keep their old shape
+        assert 'error_breakdown' not in EnhancedAPIValidator('requirements.json').generate_response(
+            {'valid': False, 'errors': [{'field': 'request', 'message': 'request must be a JSON object'}]}
+        )
 
 if __name__ == "__main__":
     # Run tests
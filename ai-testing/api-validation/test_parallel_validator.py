@@ -0,0 +1,45 @@
+import json
+import pytest
+from validator import APIValidator
+from benchmark_validator import build_payloads
+from parallel_validator import ParallelValidationRunner, split_shards, _iter_shard_lines
+
+class TestParallelValidationRunner:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.validator = APIValidator('requirements.json')
+        self.payloads = build_payloads(37)
+
+    def write_capture(self, tmp_path):
+        capture = tmp_path / 'capture.jsonl'
+        capture.write_text(''.join(json.dumps(payload) + '\n' for payload in self.payloads))
+        return str(capture)
+
+    def test_shards_cover_every_line_once(self, tmp_path):
+        """Test byte-range shards own each line exactly once"""
+        capture = self.write_capture(tmp_path)
+
+        lines = []
+        for start, end in split_shards(capture, 16):
+            lines.extend(_iter_shard_lines(capture, start, end))
+
+        assert [json.loads(line) for line in lines] == self.payloads
+
+    def test_parallel_run_matches_sequential(self, tmp_path):
+        """Test merged shard summaries match validating the capture in one process"""
+        capture = self.write_capture(tmp_path)
+        expected = [self.validator.validate_request(payload) for payload in self.payloads]
+        invalid_records = [i for i, result in enumerate(expected) if not result['valid']]
+
+        summary = ParallelValidationRunner(workers=2, chunk_size=4, max_samples=5).run(capture)
+
+        assert summary['records'] == len(self.payloads)
+        assert summary['invalid'] == len(invalid_records)
+        assert summary['valid'] == len(self.payloads) - len(invalid_records)
+        assert sum(summary['error_counts'].values()) == sum(len(r['errors']) for r in expected)
+        assert [s['record'] for s in summary['samples']] == invalid_records[:5]
+        assert summary['samples'][0]['errors'] == expected[invalid_records[0]]['errors']
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,148 @@
+import os
+import json
+import shutil
+import asyncio
+import time
+import pytest
+from benchmark_validator import build_payloads
+from validation_service import MAX_BODY_BYTES, ValidationService, read_http_message
+
+async def post_many(port, requests):
+    """Send (path, body) pairs over one keep-alive connection"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    replies = []
+    for path, body in requests:
+        data = json.dumps(body).encode('utf-8')
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+        await writer.drain()
+        start_line, headers, payload = await read_http_message(reader)
+        replies.append((int(start_line.split(' ')[1]), headers, json.loads(payload)))
+    writer.close()
+    return replies
+
+class TestValidationService:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.valid, self.invalid = build_payloads(2)
+
+    def run_against_service(self, requests, requirements_file='requirements.json'):
+        async def scenario():
+            service = await ValidationService(requirements_file, port=0, reload_interval=0).start()
+            try:
+                return await post_many(service.port, requests)
+            finally:
+                await service.close()
+        return asyncio.run(scenario())
+
+    def test_validate_over_keep_alive_connection(self):
+        """Test several /validate calls share one connection"""
+        replies = self.run_against_service([('/validate', self.valid), ('/validate', self.invalid)])
+
+        assert [status for status, _, _ in replies] == [200, 400]
+        assert replies[0][1]['connection'] == 'keep-alive'
+        assert replies[0][2]['data']['userId'].startswith('USR')
+        assert replies[1][2]['status'] == 'Failed'
+
+    def test_validate_batch_endpoint(self):
+        """Test /validate/batch returns one response per request"""
+        [(status, _, responses)] = self.run_against_service([('/validate/batch', [self.valid, self.invalid, 42])])
+
+        assert status == 200
+        assert [r['statusCode'] for r in responses] == [200, 400, 400]
+
+    def test_unknown_endpoint(self):
+        """Test unknown paths return 404"""
+        [(status, _, _)] = self.run_against_service([('/nope', {})])
+        assert status == 404
+
+    def test_invalid_content_length(self):
+        """Test a non-numeric or negative Content-Length is a 400, not a 413"""
+        async def send(length):
+            service = await ValidationService(port=0, reload_interval=0).start()
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+                writer.write(f"POST /validate HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                await writer.drain()
+                start_line, _, _ = await read_http_message(reader)
+                writer.close()
+                return int(start_line.split(' ')[1])
+            finally:
+                await service.close()
+
+        assert asyncio.run(send('abc')) == 400
+        assert asyncio.run(send('-5')) == 400
+        assert asyncio.run(send(str(MAX_BODY_BYTES + 1))) == 413
+
+    def test_batch_does_not_block_other_connections(self):
+        """Test a slow batch runs off the event loop while other clients are answered"""
+        async def scenario():
+            service = await ValidationService(port=0, reload_interval=0).start()
+            validate_batch = service.validator.validate_batch
+
+            def slow_batch(records):
+                time.sleep(0.5)
+                return validate_batch(records)
+            service.validator.validate_batch = slow_batch
+
+            finished = []
+
+            async def post(name, path, body):
+                [(status, _, _)] = await post_many(service.port, [(path, body)])
+                finished.append((name, status))
+
+            try:
+                batch = asyncio.create_task(post('batch', '/validate/batch', [self.valid]))
+                await asyncio.sleep(0.1)
+                await post('single', '/validate', self.valid)
+                await batch
+                return finished
+            finally:
+                await service.close()
+
+        # The single request, sent while the batch is being validated, is answered first
+        assert asyncio.run(scenario()) == [('single', 200), ('batch', 200)]
+
+    def test_hot_reload(self, tmp_path):
+        """Test the service recompiles rules when requirements.json changes"""
+        requirements_file = tmp_path / 'requirements.json'
+        shutil.copy('requirements.json', requirements_file)
+        service = ValidationService(str(requirements_file), reload_interval=0)
+        assert service.validator.validate_request(self.valid)['valid']
+
+        requirements = json.loads(requirements_file.read_text())
+        requirements['request']['username']['min_length'] = 20
+        requirements_file.write_text(json.dumps(requirements))
+        os.utime(requirements_file, ns=(0, 0))
+
+        assert service.reload_if_changed()
+        assert not service.validator.validate_request(self.valid)['valid']
+        assert not service.reload_if_changed()
+
+    def test_failed_reload_keeps_old_rules_and_retries(self, tmp_path, capsys):
+        """Test any error compiling new requirements keeps the old validator and is retried on the next check"""
+        requirements_file = tmp_path / 'requirements.json'
+        shutil.copy('requirements.json', requirements_file)
+        service = ValidationService(str(requirements_file), reload_interval=0)
+        validator = service.validator
+
+        # Valid JSON that fails while compiling, with an error type the loader does not raise itself
+        requirements = json.loads(requirements_file.read_text())
+        broken = dict(requirements, request=list(requirements['request']))
+        requirements_file.write_text(json.dumps(broken))
+        os.utime(requirements_file, ns=(0, 0))
+
+        assert not service.reload_if_changed()
+        assert not service.reload_if_changed()
+        assert service.validator is validator
+        assert capsys.readouterr().err.count('Could not reload') == 2
+
+        requirements['request']['username']['min_length'] = 20
+        requirements_file.write_text(json.dumps(requirements))
+        os.utime(requirements_file, ns=(0, 0))
+        assert service.reload_if_changed()
+        assert not service.validator.validate_request(self.valid)['valid']
+        assert not service.reload_if_changed()
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
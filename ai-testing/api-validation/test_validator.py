@@ -1,6 +1,13 @@
+import io
+import os
+import re
+import sys
+import json
+import subprocess
 import pytest
 import uuid
-from validator import APIValidator
+from validator import APIValidator, generate_user_id, stream_validate
+from benchmark_validator import build_payloads, legacy_validate_request
 
 class TestAPIValidator:
     def setup_method(self):
@@ -70,7 +77,7 @@ class TestAPIValidator:
             data = {'email': email}
             result = self.validator.validate_request(data)
             assert not result['valid']
-            
+        
         # Valid email
         data = {'email': 'test@example.com'}
         result = self.validator.validate_request(data)
@@ -153,6 +160,177 @@ class TestAPIValidator:
         assert response['status'] == 'Failed'
         assert len(response['errors']) > 0
         assert response['data'] is None
+    
+    def test_compiled_rules_match_legacy_interpreter(self):
+        """Test compiled validation returns the same errors as the original interpreter"""
+        for payload in build_payloads(8):
+            expected = legacy_validate_request(self.validator.requirements, payload)
+            assert self.validator.validate_request(payload) == expected
+    
+    def test_type_error_skips_remaining_checks(self):
+        """Test a wrong type reports one error and skips the field's other rules"""
+        result = self.validator.validate_request({'age': '25', 'username': 12345})
+        age_errors = [e for e in result['errors'] if e['field'] == 'age']
+        username_errors = [e for e in result['errors'] if e['field'] == 'username']
+        assert age_errors == [{'field': 'age', 'message': 'age must be an integer'}]
+        assert username_errors == [{'field': 'username', 'message': 'username must be a string'}]
+    
+    def test_validate_batch_matches_validate_request(self):
+        """Test batch validation returns the same per-row results as validate_request"""
+        payloads = build_payloads(8) + [{'age': True, 'uuid': str(uuid.uuid4()).replace('-', '')}, {}]
+        expected = [self.validator.validate_request(payload) for payload in payloads]
+        assert self.validator.validate_batch(payloads) == expected
+    
+    def test_validate_batch_dataframe(self):
+        """Test batch validation over a pandas DataFrame"""
+        pd = pytest.importorskip('pandas')
+        frame = pd.DataFrame([
+            {'username': 'testuser123', 'password': 'password123', 'email': 'test@example.com',
+             'age': 25, 'deviceID': 'ABC1234567', 'uuid': str(uuid.uuid4())},
+            {'username': 'usr', 'password': 'password123', 'email': 'test@example',
+             'age': 15, 'deviceID': 'ABC1234567', 'uuid': str(uuid.uuid4())}
+        ])
+        
+        results = self.validator.validate_batch(frame)
+        assert results[0] == {'valid': True, 'errors': []}
+        assert [e['field'] for e in results[1]['errors']] == ['username', 'email', 'age']
+    
+    def test_validate_batch_dataframe_missing_integer(self):
+        """Test a missing int cell (which makes the column float64) leaves the other rows' ints valid"""
+        pd = pytest.importorskip('pandas')
+        valid_row = {'username': 'testuser123', 'password': 'password123', 'email': 'test@example.com',
+                     'age': 25, 'deviceID': 'ABC1234567', 'uuid': str(uuid.uuid4())}
+        row_without_age = {key: value for key, value in valid_row.items() if key != 'age'}
+        frame = pd.DataFrame([valid_row, row_without_age, {**valid_row, 'age': 25.5}])
+        assert frame['age'].dtype == float
+        
+        results = self.validator.validate_batch(frame)
+        assert results[0] == {'valid': True, 'errors': []}
+        assert results[1]['errors'] == [{'field': 'age', 'message': 'age is required'}]
+        assert results[2]['errors'] == [{'field': 'age', 'message': 'age must be an integer'}]
+    
+    def test_validate_batch_explicit_none_matches_validate_request(self):
+        """Test an explicit None is a wrong-typed value in batches too, not a missing key"""
+        valid_row = {'username': 'testuser123', 'password': 'password123', 'email': 'test@example.com',
+                     'age': 25, 'deviceID': 'ABC1234567', 'uuid': str(uuid.uuid4())}
+        rows = [{**valid_row, 'username': None}, {**valid_row, 'age': None}, {'username': None}, {}, valid_row]
+        
+        assert self.validator.validate_batch(rows) == [self.validator.validate_request(row) for row in rows]
+        assert self.validator.validate_batch(rows)[0]['errors'] == [
+            {'field': 'username', 'message': 'username must be a string'}
+        ]
+    
+    def test_stream_validate_jsonl(self):
+        """Test streaming validation writes one response per input line"""
+        payloads = build_payloads(5)
+        lines = [json.dumps(payload) + '\n' for payload in payloads] + ['\n', 'not json\n']
+        sink = io.StringIO()
+        
+        stats = stream_validate(self.validator, lines, sink, chunk_size=2)
+        responses = [json.loads(line) for line in sink.getvalue().splitlines()]
+        
+        assert stats['records'] == 6
+        assert stats['valid'] == 2
+        assert stats['invalid'] == 4
+        assert [r['statusCode'] for r in responses] == [200, 400, 400, 400, 200, 400]
+        assert responses[-1]['errors'][0]['field'] == 'request'
+    
+    def test_validation_modes(self):
+        """Test first_error, max_errors and bool_only modes"""
+        invalid_data = {'username': 'usr', 'password': '123', 'email': 'invalid-email'}
+        all_errors = self.validator.validate_request(invalid_data)['errors']
+        
+        result = self.validator.validate_request(invalid_data, mode='first_error')
+        assert not result['valid']
+        assert result['errors'] == all_errors[:1]
+        
+        result = self.validator.validate_request(invalid_data, max_errors=3)
+        assert result['errors'] == all_errors[:3]
+        
+        assert self.validator.validate_request(invalid_data, mode='bool_only') == {'valid': False, 'errors': []}
+        valid_data = build_payloads(1)[0]
+        assert self.validator.validate_request(valid_data, mode='bool_only') == {'valid': True, 'errors': []}
+        
+        with pytest.raises(ValueError):
+            self.validator.validate_request(invalid_data, mode='unknown')
+    
+    def test_format_cache_counts_repeated_values(self):
+        """Test repeated pattern/format values are served from the LRU cache"""
+        data = {'email': 'test@example.com', 'deviceID': 'ABC1234567'}
+        first = self.validator.validate_request(data)
+        second = self.validator.validate_request(data)
+        
+        info = self.validator.format_cache_info()
+        assert first == second
+        assert info['misses'] == 2
+        assert info['hits'] == 2
+        
+        uncached = APIValidator('requirements.json', format_cache_size=0)
+        assert uncached.validate_request(data) == first
+        assert uncached.format_cache_info()['hits'] == 0
+    
+    def test_user_id_is_deterministic(self):
+        """Test userId is stable across processes and follows ^USR[0-9]{6}$"""
+        valid_data = build_payloads(1)[0]
+        user_id = generate_user_id(valid_data)
+        
+        script = f"from validator import generate_user_id; print(generate_user_id({valid_data!r}))"
+        for seed in ('1', '2'):
+            output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                                    env={**os.environ, 'PYTHONHASHSEED': seed}, check=True)
+            assert output.stdout.strip() == user_id
+        
+        assert re.match(r'^USR[0-9]{6}$', user_id)
+        assert generate_user_id({**valid_data, 'password': 'different123'}) == user_id
+        assert generate_user_id({**valid_data, 'username': 'otheruser1'}) != user_id
+        response = self.validator.generate_response(self.validator.validate_request(valid_data), valid_data)
+        assert response['data']['userId'] == user_id
+    
+    def test_generated_responses_match_response_contract(self):
+        """Test generate_response output satisfies the response section"""
+        responses = [self.validator.generate_response(self.validator.validate_request(payload), payload)
+                     for payload in build_payloads(4)]
+        
+        results = self.validator.validate_response_batch(responses)
+        assert all(result['valid'] for result in results)
+    
+    def test_response_contract_violations(self):
+        """Test response validation reports constants, patterns and error item shapes"""
+        result = self.validator.validate_response({
+            'statusCode': 200, 'status': 'ok', 'message': 'done',
+            'data': {'userId': 'USR12'}, 'errors': []
+        })
+        assert [e['field'] for e in result['errors']] == ['status', 'data.userId']
+        
+        result = self.validator.validate_response({
+            'statusCode': 400, 'status': 'Failed', 'errors': [{'field': 'age'}, 'oops'], 'data': None
+        })
+        assert [e['field'] for e in result['errors']] == ['errors[0].message', 'errors[1]']
+        
+        result = self.validator.validate_response({'statusCode': 500})
+        assert result['errors'][0]['field'] == 'statusCode'
+    
+    def test_response_item_paths_in_long_and_nested_arrays(self, tmp_path):
+        """Test item errors name their full path however long or deeply nested the arrays are"""
+        requirements = json.load(open('requirements.json'))
+        requirements['response']['invalid']['errors']['items']['details'] = {
+            'type': 'array', 'required': False,
+            'items': {'code': {'type': 'integer', 'required': True}}
+        }
+        requirements_file = tmp_path / 'requirements.json'
+        requirements_file.write_text(json.dumps(requirements))
+        validator = APIValidator(str(requirements_file))
+        
+        items = [{'field': 'age', 'message': 'age is required'} for _ in range(5000)]
+        items[4321] = {'field': 'age', 'message': 7}
+        items[17] = {'field': 'age', 'message': 'm', 'details': [{'code': 1}, {'code': 'x'}, {}]}
+        result = validator.validate_response({'statusCode': 400, 'status': 'Failed', 'errors': items})
+        
+        assert result['errors'] == [
+            {'field': 'errors[17].details[1].code', 'message': 'errors[17].details[1].code must be an integer'},
+            {'field': 'errors[17].details[2].code', 'message': 'errors[17].details[2].code is required'},
+            {'field': 'errors[4321].message', 'message': 'errors[4321].message must be a string'}
+        ]
 
 if __name__ == "__main__":
     # Run tests
@@ -0,0 +1,223 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from validator import APIValidator, MALFORMED_RESULT
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large'
+}
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class HTTPError(Exception):
+    """A malformed request, answered with status and the connection closed"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_http_message(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+    """Read one HTTP/1.1 message as (start line, lower-cased headers, body); None on EOF"""
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = headers.get('content-length', '0')
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(400, 'invalid Content-Length')
+    length = int(length)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, 'request body too large')
+    body = await reader.readexactly(length) if length else b''
+    return start_line.decode('latin-1').strip(), headers, body
+
+
+def encode_http_response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+class ValidationService:
+    def __init__(self, requirements_file: str = 'requirements.json', host: str = '127.0.0.1',
+                 port: int = 8080, reload_interval: float = 1.0):
+        self.requirements_file = requirements_file
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.validator = APIValidator(requirements_file)
+        self.loaded_at = datetime.now().isoformat()
+        self._requirements_stamp = self._stat_requirements()
+        self._server = None
+        self._reload_task = None
+
+    def _stat_requirements(self) -> Tuple[int, int]:
+        stat = os.stat(self.requirements_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> bool:
+        """Swap in a freshly compiled validator when the requirements file changed"""
+        try:
+            stamp = self._stat_requirements()
+        except OSError:
+            return False
+        if stamp == self._requirements_stamp:
+            return False
+
+        try:
+            validator = APIValidator(self.requirements_file)
+        except Exception as e:
+            # Keep serving the last good requirements, and try again next time until a load succeeds
+            print(f"❌ Could not reload {self.requirements_file}: {e}", file=sys.stderr)
+            return False
+
+        self._requirements_stamp = stamp
+        self.validator = validator
+        self.loaded_at = datetime.now().isoformat()
+        print(f"🔄 Reloaded {self.requirements_file}", file=sys.stderr)
+        return True
+
+    async def _watch_requirements(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            self.reload_if_changed()
+
+    async def start(self):
+        """Start listening; with port=0 the bound port is stored on self.port"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.reload_interval:
+            self._reload_task = asyncio.create_task(self._watch_requirements())
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🚀 Validation service listening on http://{self.host}:{self.port}", file=sys.stderr)
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    message = await read_http_message(reader)
+                except HTTPError as e:
+                    writer.write(encode_http_response(e.status, {'error': str(e)}, False))
+                    break
+                if message is None:
+                    break
+
+                start_line, headers, body = message
+                method, path, version = (start_line.split(' ') + ['', '', ''])[:3]
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+
+                if path.startswith('/validate/batch'):
+                    # Batches of up to MAX_BODY_BYTES are parsed, validated and encoded in a worker
+                    # thread, so the loop keeps serving other connections meanwhile
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        None, self._respond, method, path, body, keep_alive)
+                else:
+                    response = self._respond(method, path, body, keep_alive)
+                writer.write(response)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, method: str, path: str, body: bytes, keep_alive: bool) -> bytes:
+        status, payload = self.handle_request(method, path, body)
+        return encode_http_response(status, payload, keep_alive)
+
+    def handle_request(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Route one request to (HTTP status, JSON payload)"""
+        path = path.split('?', 1)[0]
+
+        if path == '/health':
+            return 200, {'status': 'ok', 'requirements': self.requirements_file, 'loaded_at': self.loaded_at}
+
+        if path not in ('/validate', '/validate/batch'):
+            return 404, {'error': f'unknown endpoint {path}'}
+        if method != 'POST':
+            return 405, {'error': f'{path} only accepts POST'}
+
+        # One validator per request, so a hot reload never changes rules mid-request
+        validator = self.validator
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            data = None
+
+        if path == '/validate':
+            if not isinstance(data, dict):
+                response = validator.generate_response(MALFORMED_RESULT)
+            else:
+                response = validator.generate_response(validator.validate_request(data), data)
+            return response['statusCode'], response
+
+        if not isinstance(data, list):
+            return 400, {'error': '/validate/batch expects a JSON array of requests'}
+
+        requests = [record for record in data if isinstance(record, dict)]
+        results = iter(validator.validate_batch(requests))
+        responses = []
+        for record in data:
+            if isinstance(record, dict):
+                responses.append(validator.generate_response(next(results), record))
+            else:
+                responses.append(validator.generate_response(MALFORMED_RESULT))
+        return 200, responses
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Serve APIValidator over HTTP')
+    parser.add_argument('--requirements', default='requirements.json', help='requirements file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help='seconds between requirements file checks (0 disables hot reload)')
+    args = parser.parse_args(argv)
+
+    service = ValidationService(args.requirements, args.host, args.port, args.reload_interval)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Validation service stopped", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,737 @@
 import re
+import sys
 import json
-from typing import Dict, List, Any
+import time
+import argparse
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, TextIO, Tuple, Union
 import uuid
+import bisect
+import hashlib
+from datetime import datetime, timedelta
+from itertools import islice
+from functools import lru_cache
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# Named patterns and formats understood by requirements.json, compiled once
+PATTERNS = {
+    'alphanumeric': (re.compile(r'^[a-zA-Z0-9]+$'), 'must contain only alphanumeric characters')
+}
+
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+VALIDATION_MODES = ('all', 'first_error', 'bool_only')
+
+# userId is a keyed digest of the fields that identify a registration, so it
+# is stable across processes and ignores the rest of the payload
+USER_ID_FIELDS = ('username', 'email', 'deviceID', 'uuid')
+USER_ID_KEY = b'api-validation-user-id'
+USER_ID_SPACE = 10 ** 6  # USR + 6 digits
+
+TYPE_CLASSES = {
+    'string': str,
+    'integer': int,
+    'boolean': bool,
+    'object': dict,
+    'array': list
+}
+
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+FORMATS = {
+    'email': (lambda value: EMAIL_REGEX.match(value) is not None, 'must be a valid email address'),
+    'uuid': (_is_uuid, 'must be a valid UUID')
+}
+
+# Fast-path regexes for column-wise matching, always applied as full matches.
+# Values they reject are rechecked one by one, so they only need to accept
+# a subset of what the scalar checks accept.
+COLUMN_REGEXES = {
+    'alphanumeric': r'[a-zA-Z0-9]+',
+    'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    'uuid': r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+}
+
+
+# Validation result for JSONL lines that are not JSON objects
+MALFORMED_RESULT = {
+    'valid': False,
+    'errors': [{'field': 'request', 'message': 'request must be a JSON object'}]
+}
+
+# Trigger operators for dependent rules; comparisons are indexed by sorted threshold
+DEPENDENT_OPERATORS = ('equals', 'in', 'domain_in', 'lt', 'lte', 'gt', 'gte')
+
+# Appends {'field', 'message'} errors for one response field found in a container
+# (prefix locates the enclosing array item, None at the top level)
+ResponseCheck = Callable[[Dict[str, Any], List[Dict[str, str]], Any], None]
+
+# (check, message) pairs; a check returns True when the value passes
+Check = Tuple[Callable[[Any], bool], str]
+# Column-wise equivalent of each check, e.g. ('min_length', 5) or ('match', regex)
+ColumnOp = Tuple[Any, ...]
+# (field, required message or None, type name, type check or None, type message, checks, column ops)
+CompiledField = Tuple[str, Optional[str], Optional[str], Optional[Callable[[Any], bool]], Optional[str],
+                      Tuple[Check, ...], Tuple[ColumnOp, ...]]
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _type_message(field: str, type_name: str) -> str:
+    return f'{field} must be {"an" if type_name[0] in "aeiou" else "a"} {type_name}'
+
+
+def _response_path(prefix: Optional[Tuple[Any, str, int]], path: Optional[str]) -> str:
+    """Full path of a response field from its item prefix (outer prefix, array path, index)"""
+    if prefix is None:
+        return path
+    outer, array, index = prefix
+    item = f'{_response_path(outer, array)}[{index}]'
+    return item if path is None else f'{item}.{path}'
+
+
+def _string_mask(column: 'pd.Series') -> 'pd.Series':
+    """Rows holding str values"""
+    if pd.api.types.is_object_dtype(column) or pd.api.types.is_string_dtype(column):
+        return column.map(type).eq(str)
+    return pd.Series(False, index=column.index)
+
+
+def _integer_mask(column: 'pd.Series') -> 'pd.Series':
+    """Rows holding int values (bool included, as isinstance does)
+    
+    pandas widens an int column to float64 as soon as one row lacks the value,
+    so whole numbers in a float column count as ints.
+    """
+    if pd.api.types.is_integer_dtype(column) or pd.api.types.is_bool_dtype(column):
+        return column.notna()
+    if pd.api.types.is_float_dtype(column):
+        return column.notna() & (column % 1 == 0)
+    if pd.api.types.is_object_dtype(column):
+        return column.map(type).isin((int, bool))
+    return pd.Series(False, index=column.index)
+
+
+def _frame_records(frame: 'pd.DataFrame') -> List[Dict[str, Any]]:
+    """Row dicts without the null cells, with whole numbers in float columns turned back into ints"""
+    float_columns = {column for column in frame.columns if pd.api.types.is_float_dtype(frame[column])}
+    return [
+        {key: int(value) if key in float_columns and value % 1 == 0 else value
+         for key, value in row.items() if not _is_null(value)}
+        for row in frame.to_dict('records')
+    ]
+
+
+def _column_failures(column: 'pd.Series', eligible: 'pd.Series', strings: Optional['pd.Series'],
+                     numbers: Optional['pd.Series'], op: ColumnOp, check: Callable[[Any], bool]) -> 'pd.Series':
+    """Boolean mask of rows failing one compiled check, computed column-wise"""
+    kind = op[0]
+    
+    if kind == 'enum':
+        return eligible & ~column.isin(list(op[1]))
+    
+    if kind == 'value':
+        failed = eligible.copy()
+        failed[eligible] = ~column[eligible].map(check).astype(bool)
+        return failed
+    
+    if kind in ('min_length', 'max_length'):
+        if strings is None:
+            return pd.Series(False, index=column.index)
+        lengths = strings.str.len()
+        failed = lengths < op[1] if kind == 'min_length' else lengths > op[1]
+        return failed.fillna(False).astype(bool)
+    
+    if kind in ('min', 'max'):
+        if numbers is None:
+            return pd.Series(False, index=column.index)
+        failed = numbers < op[1] if kind == 'min' else numbers > op[1]
+        return failed.fillna(False).astype(bool)
+    
+    # kind == 'match'; without a fast regex every string goes to the exact check
+    if strings is None:
+        return pd.Series(False, index=column.index)
+    failed = strings.notna() if op[1] is None \
+        else (strings.notna() & ~strings.str.fullmatch(op[1])).fillna(False).astype(bool)
+    if failed.any():
+        # The fast regex may reject values the exact check accepts
+        failed[failed] = ~column[failed].map(check).astype(bool)
+    return failed
+
+
+def _iter_plan_errors(plan: Tuple[CompiledField, ...], data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Lazily yield (field, message) violations of a compiled field plan"""
+    for field, required_message, _, type_check, type_message, checks, _ in plan:
+        if field not in data:
+            if required_message is not None:
+                yield field, required_message
+            continue
+        
+        value = data[field]
+        
+        if type_check is not None and not type_check(value):
+            yield field, type_message
+            continue
+        
+        for check, message in checks:
+            if not check(value):
+                yield field, message
+
+
+def _trigger_key(value: Any) -> Any:
+    """Index key of a trigger value; bools get keys of their own, since True == 1 in a dict lookup"""
+    return (bool, value) if isinstance(value, bool) else value
+
+
+@lru_cache(maxsize=None)
+def _user_id_hasher(key: bytes):
+    # Keying blake2b costs more than copying an already keyed state
+    return hashlib.blake2b(digest_size=8, key=key)
+
+
+def generate_user_id(user_data: Optional[Dict[str, Any]], key: bytes = USER_ID_KEY, prefix: str = 'USR') -> str:
+    """Deterministic userId matching ^USR[0-9]{6}$ for the identifying fields of user_data"""
+    user_data = user_data or {}
+    hasher = _user_id_hasher(key).copy()
+    hasher.update('\x1f'.join([str(user_data.get(field, '')) for field in USER_ID_FIELDS]).encode('utf-8'))
+    return f"{prefix}{int.from_bytes(hasher.digest(), 'big') % USER_ID_SPACE:06d}"
 
 class APIValidator:
-    def __init__(self, requirements_file: str):
+    def __init__(self, requirements_file: str, format_cache_size: Optional[int] = 10000,
+                 user_id_key: bytes = USER_ID_KEY):
         with open(requirements_file, 'r') as f:
             self.requirements = json.load(f)
+        self.user_id_key = user_id_key
+        
+        # Pattern/format outcomes keyed by (field, value); 0 disables the cache
+        self._format_checks = {}
+        self._format_cache = lru_cache(maxsize=format_cache_size)(self._format_outcomes) \
+            if format_cache_size != 0 else None
+        
+        self._request_plan = self._compile_request_rules(self.requirements['request'])
+        self._dependent_rules = self.requirements.get('dependent_rules', [])
+        self._dependent_index = self._compile_dependent_rules(self._dependent_rules)
+        self._response_plan = self._compile_response_rules(self.requirements.get('response', {}))
+        # Invalid responses carry error_breakdown whenever the contract requires it, even for
+        # results without dependent errors such as MALFORMED_RESULT
+        breakdown_rules = self.requirements.get('response', {}).get('invalid', {}).get('error_breakdown', {})
+        self._error_breakdown_required = breakdown_rules.get('required', False)
+        self._user_profiles = self._compile_user_profiles(self.requirements.get('user_profiles'))
+    
+    def _compile_request_rules(self, request_rules: Dict[str, Dict[str, Any]]) -> Tuple[CompiledField, ...]:
+        """Compile the request section into per-field check chains"""
+        return tuple(self._compile_field(field, rules) for field, rules in request_rules.items())
+    
+    def _compile_field(self, field: str, rules: Dict[str, Any], cache_key: Any = None) -> CompiledField:
+        """Turn one field's rules into a type check plus a chain of prebuilt checks"""
+        cache_key = field if cache_key is None else cache_key
+        required_message = f'{field} is required' if rules.get('required', False) else None
+        
+        type_name = rules.get('type')
+        type_class = TYPE_CLASSES.get(type_name)
+        type_check = None
+        type_message = None
+        if type_class is not None:
+            type_check = lambda value, cls=type_class: isinstance(value, cls)
+            type_message = _type_message(field, type_name)
+        
+        # Checks that only apply to strings/integers skip the isinstance guard
+        # when the declared type already guarantees it
+        def guarded(cls, check):
+            if type_class is cls:
+                return check
+            return lambda value: not isinstance(value, cls) or check(value)
+        
+        checks: List[Check] = []
+        column_ops: List[ColumnOp] = []
+        
+        # Length validation for strings
+        if 'min_length' in rules:
+            min_length = rules['min_length']
+            checks.append((guarded(str, lambda value: len(value) >= min_length),
+                           f'{field} must be at least {min_length} characters'))
+            column_ops.append(('min_length', min_length))
+        
+        if 'max_length' in rules:
+            max_length = rules['max_length']
+            checks.append((guarded(str, lambda value: len(value) <= max_length),
+                           f'{field} must be at most {max_length} characters'))
+            column_ops.append(('max_length', max_length))
+        
+        # Range validation for integers
+        if 'min' in rules:
+            minimum = rules['min']
+            checks.append((guarded(int, lambda value: value >= minimum),
+                           f'{field} must be at least {minimum}'))
+            column_ops.append(('min', minimum))
+        
+        if 'max' in rules:
+            maximum = rules['max']
+            checks.append((guarded(int, lambda value: value <= maximum),
+                           f'{field} must be at most {maximum}'))
+            column_ops.append(('max', maximum))
+        
+        # Allowed values and constants
+        if 'enum' in rules:
+            allowed = tuple(rules['enum'])
+            checks.append((lambda value: value in allowed,
+                           f'{field} must be one of {", ".join(str(option) for option in allowed)}'))
+            column_ops.append(('enum', allowed))
+        
+        if 'value' in rules:
+            expected = rules['value']
+            checks.append((lambda value: value == expected, f'{field} must be {json.dumps(expected)}'))
+            column_ops.append(('value', expected))
+        
+        format_checks = []
+        
+        # Pattern validation: a named pattern or a raw regular expression
+        if rules.get('pattern') in PATTERNS:
+            regex, description = PATTERNS[rules['pattern']]
+            format_checks.append((lambda value: regex.match(value) is not None, f'{field} {description}',
+                                  COLUMN_REGEXES[rules['pattern']]))
+        elif 'pattern' in rules:
+            custom_regex = re.compile(rules['pattern'])
+            format_checks.append((lambda value: custom_regex.match(value) is not None,
+                                  f'{field} must match {rules["pattern"]}', None))
+        
+        # Format validation
+        if rules.get('format') in FORMATS:
+            format_check, description = FORMATS[rules['format']]
+            format_checks.append((format_check, f'{field} {description}', COLUMN_REGEXES[rules['format']]))
+        
+        # Pattern and format outcomes depend only on the value, so repeated
+        # values are answered from the shared cache
+        if format_checks and self._format_cache is not None:
+            self._format_checks[cache_key] = tuple(check for check, _, _ in format_checks)
+            cache = self._format_cache
+            format_checks = [(lambda value, i=i: cache(cache_key, value)[i], message, column_regex)
+                             for i, (_, message, column_regex) in enumerate(format_checks)]
+        
+        for check, message, column_regex in format_checks:
+            checks.append((guarded(str, check), message))
+            column_ops.append(('match', column_regex))
+        
+        return (field, required_message, type_name, type_check, type_message, tuple(checks), tuple(column_ops))
+    
+    def _compile_dependent_rules(self, rules: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index dependent rules by trigger field so a request only evaluates rules it can fire
+        
+        Returns {trigger field: {'values': {value: [rule]}, 'domains': {domain: [rule]},
+        operator: (sorted thresholds, rules in threshold order)}} where each rule
+        is (definition order, compiled field plan).
+        """
+        index = {}
+        for order, rule in enumerate(rules):
+            name = rule.get('name', f'rule_{order}')
+            trigger = rule['when']
+            operator = trigger.get('operator', 'equals')
+            if operator not in DEPENDENT_OPERATORS:
+                raise ValueError(f"{name}: operator must be one of {', '.join(DEPENDENT_OPERATORS)}")
+            
+            plan = tuple(self._compile_field(field, field_rules, cache_key=(name, field))
+                         for field, field_rules in rule['then'].items())
+            compiled = (order, plan)
+            by_field = index.setdefault(trigger['field'], {'values': {}, 'domains': {}})
+            
+            if operator in ('equals', 'in'):
+                values = trigger['value'] if operator == 'in' else [trigger['value']]
+                for value in values:
+                    by_field['values'].setdefault(_trigger_key(value), []).append(compiled)
+            elif operator == 'domain_in':
+                for domain in trigger['value']:
+                    by_field['domains'].setdefault(domain.lower(), []).append(compiled)
+            else:
+                by_field.setdefault(operator, []).append((trigger['value'], compiled))
+        
+        for by_field in index.values():
+            for operator in ('lt', 'lte', 'gt', 'gte'):
+                if operator in by_field:
+                    ordered = sorted(by_field[operator], key=lambda entry: entry[0])
+                    by_field[operator] = ([threshold for threshold, _ in ordered], [rule for _, rule in ordered])
+        
+        return index
+    
+    def _applicable_rules(self, data: Dict[str, Any]) -> List[Tuple[int, Tuple[CompiledField, ...]]]:
+        """Rules whose trigger matches this request, in definition order"""
+        matched = []
+        for trigger_field, by_field in self._dependent_index.items():
+            if trigger_field not in data:
+                continue
+            value = data[trigger_field]
+            
+            if isinstance(value, (str, int, float, bool)):
+                matched.extend(by_field['values'].get(_trigger_key(value), ()))
+            
+            if isinstance(value, str) and by_field['domains']:
+                matched.extend(by_field['domains'].get(value.rpartition('@')[2].lower(), ()))
+            
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if 'lt' in by_field:
+                    thresholds, rules = by_field['lt']
+                    matched.extend(rules[bisect.bisect_right(thresholds, value):])
+                if 'lte' in by_field:
+                    thresholds, rules = by_field['lte']
+                    matched.extend(rules[bisect.bisect_left(thresholds, value):])
+                if 'gt' in by_field:
+                    thresholds, rules = by_field['gt']
+                    matched.extend(rules[:bisect.bisect_left(thresholds, value)])
+                if 'gte' in by_field:
+                    thresholds, rules = by_field['gte']
+                    matched.extend(rules[:bisect.bisect_right(thresholds, value)])
+        
+        if len(matched) > 1:
+            matched.sort(key=lambda rule: rule[0])
+        return matched
+    
+    def validate_dependent_requirements(self, data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Errors from the dependent rules this request triggers"""
+        errors = []
+        for _, plan in self._applicable_rules(data):
+            errors.extend({'field': field, 'message': message} for field, message in _iter_plan_errors(plan, data))
+        return errors
+    
+    def _format_outcomes(self, cache_key: Any, value: str) -> Tuple[bool, ...]:
+        """Run every pattern/format check of a field; called on cache misses only"""
+        return tuple(check(value) for check in self._format_checks[cache_key])
+    
+    def format_cache_info(self) -> Dict[str, Any]:
+        """Hit/miss counters of the pattern/format cache"""
+        if self._format_cache is None:
+            return {'hits': 0, 'misses': 0, 'maxsize': 0, 'currsize': 0}
+        info = self._format_cache.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'maxsize': info.maxsize, 'currsize': info.currsize}
+    
+    def clear_format_cache(self):
+        if self._format_cache is not None:
+            self._format_cache.cache_clear()
+    
+    def validate_request(self, data: Dict[str, Any], mode: str = 'all',
+                         max_errors: Optional[int] = None) -> Dict[str, Any]:
+        """Validate request data against the compiled requirements
+        
+        mode='first_error' stops at the first violation, max_errors caps how
+        many errors are collected, and mode='bool_only' only decides validity
+        and returns an empty error list.
+        """
+        if mode == 'bool_only':
+            return {
+                'valid': next(self._iter_errors(data), None) is None,
+                'errors': []
+            }
+        
+        if mode == 'first_error':
+            max_errors = 1
+        elif mode != 'all':
+            raise ValueError(f"mode must be one of {', '.join(VALIDATION_MODES)}")
+        elif max_errors is not None and max_errors < 1:
+            raise ValueError('max_errors must be at least 1')
+        
+        if max_errors is not None:
+            independent = [{'field': field, 'message': message}
+                           for field, message in islice(_iter_plan_errors(self._request_plan, data), max_errors)]
+            dependent = [{'field': field, 'message': message}
+                         for field, message in islice(self._iter_dependent_errors(data), max_errors - len(independent))]
+            return self._validation_result(independent, dependent)
+        
+        independent = self.validate_independent_requirements(data)
+        dependent = self.validate_dependent_requirements(data) if self._dependent_index else []
+        return self._validation_result(independent, dependent)
+    
+    def _validation_result(self, independent: List[Dict[str, str]], dependent: List[Dict[str, str]]) -> Dict[str, Any]:
+        if not self._dependent_index:
+            return {
+                'valid': len(independent) == 0,
+                'errors': independent
+            }
+        return {
+            'valid': len(independent) == 0 and len(dependent) == 0,
+            'errors': independent + dependent,
+            'independent_errors': independent,
+            'dependent_errors': dependent
+        }
     
-    def validate_request(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate request data against requirements"""
+    def validate_independent_requirements(self, data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Errors from the per-field rules of the request section"""
         errors = []
         
-        for field, rules in self.requirements['request'].items():
-            # Check if required field is present
-            if rules.get('required', False) and field not in data:
-                errors.append({
-                    'field': field,
-                    'message': f'{field} is required'
-                })
+        for field, required_message, _, type_check, type_message, checks, _ in self._request_plan:
+            if field not in data:
+                if required_message is not None:
+                    errors.append({'field': field, 'message': required_message})
                 continue
             
-            if field in data:
-                value = data[field]
-                
-                # Type validation
-                if rules['type'] == 'string' and not isinstance(value, str):
-                    errors.append({
-                        'field': field,
-                        'message': f'{field} must be a string'
-                    })
-                    continue
-                
-                if rules['type'] == 'integer' and not isinstance(value, int):
-                    errors.append({
-                        'field': field,
-                        'message': f'{field} must be an integer'
-                    })
-                    continue
-                
-                # Length validation for strings
-                if isinstance(value, str):
-                    if 'min_length' in rules and len(value) < rules['min_length']:
-                        errors.append({
-                            'field': field,
-                            'message': f'{field} must be at least {rules["min_length"]} characters'
-                        })
-                    
-                    if 'max_length' in rules and len(value) > rules['max_length']:
-                        errors.append({
-                            'field': field,
-                            'message': f'{field} must be at most {rules["max_length"]} characters'
-                        })
-                
-                # Range validation for integers
-                if isinstance(value, int):
-                    if 'min' in rules and value < rules['min']:
-                        errors.append({
-                            'field': field,
-                            'message': f'{field} must be at least {rules["min"]}'
-                        })
-                    
-                    if 'max' in rules and value > rules['max']:
-                        errors.append({
-                            'field': field,
-                            'message': f'{field} must be at most {rules["max"]}'
-                        })
-                
-                # Pattern validation
-                if 'pattern' in rules and isinstance(value, str):
-                    if rules['pattern'] == 'alphanumeric':
-                        if not re.match(r'^[a-zA-Z0-9]+$', value):
-                            errors.append({
-                                'field': field,
-                                'message': f'{field} must contain only alphanumeric characters'
-                            })
-                
-                # Format validation
-                if 'format' in rules and isinstance(value, str):
-                    if rules['format'] == 'email':
-                        if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', value):
-                            errors.append({
-                                'field': field,
-                                'message': f'{field} must be a valid email address'
-                            })
-                    
-                    if rules['format'] == 'uuid':
-                        try:
-                            uuid.UUID(value)
-                        except ValueError:
-                            errors.append({
-                                'field': field,
-                                'message': f'{field} must be a valid UUID'
-                            })
+            value = data[field]
+            
+            if type_check is not None and not type_check(value):
+                errors.append({'field': field, 'message': type_message})
+                continue
+            
+            for check, message in checks:
+                if not check(value):
+                    errors.append({'field': field, 'message': message})
+        
+        return errors
+    
+    def _iter_errors(self, data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        """Lazily yield (field, message) violations so callers can stop early"""
+        yield from _iter_plan_errors(self._request_plan, data)
+        yield from self._iter_dependent_errors(data)
+    
+    def _iter_dependent_errors(self, data: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+        if self._dependent_index:
+            for _, plan in self._applicable_rules(data):
+                yield from _iter_plan_errors(plan, data)
+    
+    def validate_batch(self, records: Union[List[Dict[str, Any]], 'pd.DataFrame']) -> List[Dict[str, Any]]:
+        """Validate many requests at once, returning one validate_request-style result per row"""
+        if not PANDAS_AVAILABLE:
+            return [self.validate_request(record) for record in records]
+        
+        if isinstance(records, pd.DataFrame):
+            frame = records.reset_index(drop=True)
+        else:
+            # object dtype keeps the original Python values, so type checks
+            # see exactly what validate_request would see
+            records = list(records)
+            frame = pd.DataFrame(records, dtype=object)
+        from_frame = isinstance(records, pd.DataFrame)
+        
+        row_errors = [[] for _ in range(len(frame))]
+        
+        for field, required_message, type_name, type_check, type_message, checks, column_ops in self._request_plan:
+            if field not in frame.columns:
+                if required_message is not None:
+                    for errors in row_errors:
+                        errors.append({'field': field, 'message': required_message})
+                continue
+            
+            column = frame[field]
+            # In a DataFrame null cells stand for absent keys; in dicts only a missing key
+            # is absent, and an explicit None is a value with the wrong type
+            if from_frame:
+                present = column.notna()
+            else:
+                present = pd.Series([field in record for record in records], index=frame.index)
+            failures = []
+            
+            if required_message is not None:
+                failures.append((~present, required_message))
+            
+            kinds = {op[0] for op in column_ops}
+            needs_str = type_name == 'string' or bool(kinds & {'min_length', 'max_length', 'match'})
+            needs_int = type_name == 'integer' or bool(kinds & {'min', 'max'})
+            is_str = present & _string_mask(column) if needs_str else None
+            is_int = present & _integer_mask(column) if needs_int else None
+            
+            eligible = present
+            if type_name == 'string':
+                failures.append((present & ~is_str, type_message))
+                eligible = is_str
+            elif type_name == 'integer':
+                failures.append((present & ~is_int, type_message))
+                eligible = is_int
+            elif type_check is not None:
+                type_ok = present & column.map(type_check).astype(bool)
+                failures.append((present & ~type_ok, type_message))
+                eligible = type_ok
+            
+            # Converted once per field so every string op runs on a native string column
+            strings = column.where(eligible & is_str).astype('string') if needs_str and is_str.any() else None
+            numbers = pd.to_numeric(column.where(eligible & is_int), errors='coerce') \
+                if needs_int and is_int.any() else None
+            
+            for (check, message), op in zip(checks, column_ops):
+                failures.append((_column_failures(column, eligible, strings, numbers, op, check), message))
+            
+            for mask, message in failures:
+                for row in mask.to_numpy(dtype=bool).nonzero()[0]:
+                    row_errors[row].append({'field': field, 'message': message})
+        
+        if not self._dependent_index:
+            return [{'valid': len(errors) == 0, 'errors': errors} for errors in row_errors]
+        
+        # Dependent rules are looked up per row through the trigger index
+        if from_frame:
+            records = _frame_records(frame)
+        return [self._validation_result(errors, self.validate_dependent_requirements(record))
+                for errors, record in zip(row_errors, records)]
+    
+    def _compile_response_rules(self, response_rules: Dict[str, Dict[str, Any]]) -> Dict[int, Tuple[ResponseCheck, ...]]:
+        """Compile each response section into field checks keyed by its statusCode"""
+        plan = {}
+        for section in response_rules.values():
+            fields = {name: spec for name, spec in section.items() if name != 'statusCode'}
+            plan[section['statusCode']] = tuple(
+                self._compile_response_field(name, name, spec) for name, spec in fields.items()
+            )
+        return plan
+    
+    def _compile_response_field(self, path: str, name: str, spec: Dict[str, Any]) -> ResponseCheck:
+        """Build the check for one response field, recursing into objects and array items
+        
+        path is relative to the enclosing array item, if any, so item checks are
+        compiled once per field; the full path is only built when an error is reported.
+        """
+        required = spec.get('required', False)
+        nullable = spec.get('nullable', False)
+        type_name = spec.get('type')
+        type_class = TYPE_CLASSES.get(type_name)
+        type_suffix = _type_message('', type_name) if type_class is not None else None
+        value_checks = []
+        
+        def report(errors, prefix, suffix):
+            field = _response_path(prefix, path)
+            errors.append({'field': field, 'message': field + suffix})
+        
+        if 'value' in spec:
+            expected = spec['value']
+            value_suffix = f' must be {json.dumps(expected)}'
+            
+            def check_value(value, errors, prefix):
+                if value != expected:
+                    report(errors, prefix, value_suffix)
+            value_checks.append(check_value)
+        
+        if 'pattern' in spec:
+            regex, description = PATTERNS[spec['pattern']] if spec['pattern'] in PATTERNS \
+                else (re.compile(spec['pattern']), f'must match {spec["pattern"]}')
+            pattern_suffix = f' {description}'
+            
+            def check_pattern(value, errors, prefix):
+                if not isinstance(value, str) or regex.match(value) is None:
+                    report(errors, prefix, pattern_suffix)
+            value_checks.append(check_pattern)
+        
+        if spec.get('empty', False):
+            def check_empty(value, errors, prefix):
+                if len(value) != 0:
+                    report(errors, prefix, ' must be empty')
+            value_checks.append(check_empty)
+        
+        if 'fields' in spec:
+            nested = tuple(self._compile_response_field(f'{path}.{child}', child, child_spec)
+                           for child, child_spec in spec['fields'].items())
+            
+            def check_fields(value, errors, prefix):
+                for check in nested:
+                    check(value, errors, prefix)
+            value_checks.append(check_fields)
+        
+        if 'items' in spec:
+            item_checks = tuple(self._compile_response_field(child, child, child_spec)
+                                for child, child_spec in spec['items'].items())
+            
+            def check_items(value, errors, prefix):
+                for index, item in enumerate(value):
+                    item_prefix = (prefix, path, index)
+                    if not isinstance(item, dict):
+                        field = _response_path(item_prefix, None)
+                        errors.append({'field': field, 'message': f'{field} must be an object'})
+                        continue
+                    for check in item_checks:
+                        check(item, errors, item_prefix)
+            value_checks.append(check_items)
+        
+        value_checks = tuple(value_checks)
+        
+        def check_field(container, errors, prefix=None):
+            if name not in container:
+                if required:
+                    report(errors, prefix, ' is required')
+                return
+            
+            value = container[name]
+            if value is None and nullable:
+                return
+            
+            if type_class is not None and not isinstance(value, type_class):
+                report(errors, prefix, type_suffix)
+                return
+            
+            for check in value_checks:
+                check(value, errors, prefix)
+        
+        return check_field
+    
+    def validate_response(self, response: Any) -> Dict[str, Any]:
+        """Validate an API response against the response section of the requirements"""
+        if not isinstance(response, dict):
+            return {
+                'valid': False,
+                'errors': [{'field': 'response', 'message': 'response must be a JSON object'}]
+            }
+        
+        status_code = response.get('statusCode')
+        checks = self._response_plan.get(status_code) if isinstance(status_code, int) else None
+        if checks is None:
+            expected = ', '.join(str(code) for code in self._response_plan)
+            return {
+                'valid': False,
+                'errors': [{'field': 'statusCode', 'message': f'statusCode must be one of {expected}'}]
+            }
+        
+        errors = []
+        for check in checks:
+            check(response, errors)
         
         return {
             'valid': len(errors) == 0,
             'errors': errors
         }
     
+    def validate_response_batch(self, responses: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Validate many recorded responses, one validate_response result each"""
+        validate = self.validate_response
+        return [validate(response) for response in responses]
+    
+    def _compile_user_profiles(self, profiles: Optional[Dict[str, Any]]) -> Optional[Tuple[str, Dict[Any, Tuple]]]:
+        """Precompute per-user-type response data as (type field, {type: profile})"""
+        if not profiles:
+            return None
+        compiled = {}
+        for user_type, profile in profiles['profiles'].items():
+            compiled[user_type] = (
+                profile.get('userId_prefix', 'USR'),
+                dict(profile.get('data', {})),
+                tuple(profile.get('copy_fields', ())),
+                profile.get('expires_in_days')
+            )
+        return profiles['field'], compiled
+    
+    def _response_data(self, user_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Success payload, shaped by the user's profile when profiles are configured"""
+        profile = None
+        if self._user_profiles is not None and user_data:
+            type_field, profiles = self._user_profiles
+            user_type = user_data.get(type_field)
+            profile = profiles.get(user_type) if isinstance(user_type, str) else None
+        
+        if profile is None:
+            return {'userId': generate_user_id(user_data, self.user_id_key)}
+        
+        prefix, data, copy_fields, expires_in_days = profile
+        response_data = {'userId': generate_user_id(user_data, self.user_id_key, prefix)}
+        response_data.update(data)
+        for field in copy_fields:
+            response_data[field] = user_data.get(field)
+        if expires_in_days is not None:
+            response_data['expires_at'] = (datetime.now() + timedelta(days=expires_in_days)).isoformat()
+        return response_data
+    
     def generate_response(self, validation_result: Dict[str, Any], user_data: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate API response based on validation result"""
         if validation_result['valid']:
@@ -106,24 +739,93 @@ class APIValidator:
                 'statusCode': 200,
                 'status': 'success',
                 'message': 'User registered successfully',
-                'data': {
-                    'userId': f"USR{str(hash(str(user_data)))[-6:].zfill(6)}"
-                },
+                'data': self._response_data(user_data),
                 'errors': []
             }
         else:
-            return {
+            response = {
                 'statusCode': 400,
                 'status': 'Failed',
                 'errors': validation_result['errors'],
                 'message': 'Validation failed',
                 'data': None
             }
+            if 'dependent_errors' in validation_result:
+                response['error_breakdown'] = {
+                    'independent_errors': len(validation_result['independent_errors']),
+                    'dependent_errors': len(validation_result['dependent_errors'])
+                }
+            elif self._error_breakdown_required:
+                response['error_breakdown'] = {
+                    'independent_errors': len(validation_result['errors']),
+                    'dependent_errors': 0
+                }
+            return response
 
-# Test the validator
-if __name__ == "__main__":
+def iter_jsonl_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[List[Any]]:
+    """Parse newline-delimited JSON into lists of at most chunk_size records"""
+    chunk = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            chunk.append(json.loads(line))
+        except ValueError:
+            # Reported downstream like any other non-object record
+            chunk.append(None)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_validate(validator: APIValidator, lines: Iterable[str], sink: TextIO,
+                    chunk_size: int = 10000, responses: bool = False) -> Dict[str, Any]:
+    """Validate a JSONL stream chunk by chunk, writing one response per line to sink
+    
+    With responses=True the lines are recorded API responses and each output
+    line is their validate_response result instead.
+    """
+    stats = {'records': 0, 'valid': 0, 'invalid': 0}
+    start = time.perf_counter()
+    
+    for chunk in iter_jsonl_chunks(lines, chunk_size):
+        if responses:
+            results = validator.validate_response_batch(chunk)
+            for result in results:
+                stats['valid' if result['valid'] else 'invalid'] += 1
+            sink.write('\n'.join(json.dumps(result) for result in results) + '\n')
+            stats['records'] += len(chunk)
+            continue
+        
+        requests = [record for record in chunk if isinstance(record, dict)]
+        results = iter(validator.validate_batch(requests))
+        
+        output = []
+        for record in chunk:
+            if isinstance(record, dict):
+                result = next(results)
+            else:
+                result = MALFORMED_RESULT
+                record = None
+            output.append(json.dumps(validator.generate_response(result, record)))
+            stats['valid' if result['valid'] else 'invalid'] += 1
+        
+        sink.write('\n'.join(output) + '\n')
+        stats['records'] += len(chunk)
+    
+    stats['seconds'] = time.perf_counter() - start
+    stats['records_per_second'] = stats['records'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+    stats['format_cache'] = validator.format_cache_info()
+    return stats
+
+
+def run_demo(requirements_file: str = 'requirements.json'):
+    """Validate one valid and one invalid sample payload"""
     # Test with valid data
-    validator = APIValidator('requirements.json')
+    validator = APIValidator(requirements_file)
     
     valid_data = {
         'username': 'testuser123',
@@ -154,4 +856,45 @@ if __name__ == "__main__":
     response = validator.generate_response(result, invalid_data)
     
     print("\n❌ Invalid Data Test:")
-    print(json.dumps(response, indent=2))
\ No newline at end of file
+    print(json.dumps(response, indent=2))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Validate API requests against requirements.json')
+    parser.add_argument('--requirements', default='requirements.json', help='requirements file')
+    parser.add_argument('--input', help="JSONL file of requests, or '-' for stdin")
+    parser.add_argument('--output', default='-', help="JSONL file for responses, or '-' for stdout")
+    parser.add_argument('--chunk-size', type=int, default=10000, help='requests validated per chunk')
+    parser.add_argument('--responses', action='store_true',
+                        help='input lines are recorded API responses to check against the response contract')
+    parser.add_argument('--format-cache-size', type=int, default=10000,
+                        help='pattern/format results cached per (field, value); 0 disables the cache')
+    args = parser.parse_args(argv)
+    
+    if args.input is None:
+        run_demo(args.requirements)
+        return
+    
+    validator = APIValidator(args.requirements, args.format_cache_size)
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = stream_validate(validator, source, sink, args.chunk_size, args.responses)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    
+    # Stats go to stderr so stdout can carry the responses
+    kind = 'responses' if args.responses else 'requests'
+    print(f"✅ Validated {stats['records']} {kind} ({stats['valid']} valid, {stats['invalid']} invalid) "
+          f"in {stats['seconds']:.2f}s - {stats['records_per_second']:,.0f} records/s", file=sys.stderr)
+    if not args.responses:
+        cache = stats['format_cache']
+        print(f"🗃️  Format cache: {cache['hits']} hits, {cache['misses']} misses "
+              f"({cache['currsize']}/{cache['maxsize']} entries)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
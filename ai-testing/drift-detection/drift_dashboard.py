@@ -5,33 +5,312 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import threading
+import time
+from drift_detector import DriftDetector
+from drift_storage import read_dataset, resolve_dataset
+from drift_store import MonitoringStore
+from drift_profile import file_stamp, file_digest
+from drift_views import (TOP_FEATURES, column_histograms, dataset_schema, page_count, page_items, rank_features,
+                         search_features, shared_features)
+
+@st.cache_resource
+def cache_events():
+    """When each cached computation last ran; held as a resource so it survives script reruns"""
+    return {}
+
+def cached_call(function, *args):
+    """(result, whether it came from the cache) for a cached function that records its runs in cache_events"""
+    key = (function.__name__,) + tuple(arg for arg in args if not isinstance(arg, pd.DataFrame))
+    before = cache_events().get(key)
+    result = function(*args)
+    after = cache_events().get(key)
+    return result, before is not None and before == after
+
+@st.cache_data(show_spinner=False)
+def dataset_digest(path, stamp):
+    """Content hash of a dataset, cached per (mtime_ns, size) so it is only recomputed when the file changes"""
+    cache_events()[('dataset_digest', path, stamp)] = datetime.now()
+    return file_digest(path)
+
+def dataset_key(path):
+    """(path, content hash) identifying one version of a dataset, and whether the hash was reused"""
+    digest, hit = cached_call(dataset_digest, path, file_stamp(path))
+    return (path, digest), hit
+
+@st.cache_data(show_spinner=False)
+def cached_schema(path, digest):
+    """drift_views.dataset_schema of one dataset version; a CSV is scanned once per version"""
+    cache_events()[('cached_schema', path, digest)] = datetime.now()
+    return dataset_schema(path)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_dataset(path, digest):
+    """Numeric columns of one dataset version, shared read-only across reruns and sessions without copying"""
+    cache_events()[('load_dataset', path, digest)] = datetime.now()
+    return read_dataset(path, numeric_only=True)
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_columns(path, digest, columns):
+    """Just the given columns of one dataset version, for the features on screen
+    
+    Parquet and npy read nothing else from disk; a CSV is still scanned, but only
+    these columns are parsed.
+    """
+    cache_events()[('load_columns', path, digest, columns)] = datetime.now()
+    return read_dataset(path, columns=list(columns))
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def describe_dataset(_frame, path, digest, columns):
+    """describe() of some columns of one dataset version"""
+    cache_events()[('describe_dataset', path, digest, columns)] = datetime.now()
+    return _frame.describe()
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def cached_histograms(_frame, path, digest, columns):
+    """drift_views.column_histograms, computed once per dataset version and column set
+    
+    The frame itself is not hashed (leading underscore); path, digest and columns
+    key the cache. Plots get bins x columns numbers however many rows the data has.
+    """
+    return column_histograms(_frame)
+
+def histogram_bars(histogram, name, color):
+    """Bar trace of precomputed bin counts, one bar per bin"""
+    edges = histogram['edges']
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=histogram['counts'],
+        width=np.diff(edges),
+        name=name,
+        opacity=0.7,
+        marker_color=color
+    )
+
+class DriftRun:
+    """One drift detection over the dashboard's cached frames, run on a background thread
+    
+    The detector gets the cached frames directly, so a run neither starts a Python
+    process nor re-parses data the dashboard already holds. The page polls progress and message while it runs
+    and takes results from memory; they are also saved to results_path for the CLI.
+    """
+    
+    def __init__(self, reference_data, current_data, data_keys, results_path='drift_results.json'):
+        self.data_keys = data_keys
+        self.progress = 0.0
+        self.message = "Starting"
+        self.results = None
+        self.error = None
+        self.seconds = None
+        self._start = time.perf_counter()
+        self._detector = DriftDetector(results_path=results_path, progress=self._update)
+        self._detector.use_frames(reference_data, current_data)
+        self._thread = threading.Thread(target=self._run, name='drift-run', daemon=True)
+        self._thread.start()
+    
+    def _update(self, fraction, message):
+        self.progress, self.message = fraction, message
+    
+    def _run(self):
+        try:
+            self.results = self._detector.detect_drift()
+            if self.results is None or 'error' in self.results:
+                self.error = (self.results or {}).get('error', "Drift detection returned no results")
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.seconds = time.perf_counter() - self._start
+    
+    @property
+    def running(self):
+        return self._thread.is_alive()
 
 class DriftDashboard:
-    def __init__(self):
-        self.reference_data = None
-        self.current_data = None
-        
+    def __init__(self, reference_path='data/reference', current_path='data/current', store_path='drift_monitoring.db'):
+        self.reference_path = reference_path
+        self.current_path = current_path
+        self.store_path = store_path
+        self.reference_key = None
+        self.current_key = None
+        self.reference_schema = None
+        self.current_schema = None
+        self.cache_status = {}
+    
     def load_data(self):
-        """Load reference and current data"""
+        """Find the reference and current data (CSV, Parquet or npy) and read their schemas
+        
+        No values are read here: each view loads only the columns it shows, through
+        load_features. Versions are keyed by (path, content hash): a rerun with
+        unchanged files costs a stat per file, an edited file is re-read, and a
+        touched one only re-hashed.
+        """
         try:
-            self.reference_data = pd.read_csv('data/reference.csv')
-            self.current_data = pd.read_csv('data/current.csv')
+            self.cache_status = {}
+            for name, path in (('reference', self.reference_path), ('current', self.current_path)):
+                start = time.perf_counter()
+                key, hash_reused = dataset_key(resolve_dataset(path))
+                schema, _ = cached_call(cached_schema, *key)
+                setattr(self, f"{name}_key", key)
+                setattr(self, f"{name}_schema", schema)
+                self.cache_status[name] = {
+                    'path': key[0],
+                    'digest': key[1],
+                    'hash_reused': hash_reused,
+                    'reads': 0,
+                    'cached_reads': 0,
+                    'columns_read': 0,
+                    'seconds': time.perf_counter() - start
+                }
             return True
         except:
             return False
     
+    def features(self):
+        """Numeric features present in both datasets, in reference file order"""
+        return shared_features(self.reference_schema['columns'], self.current_schema['columns'])
+    
+    def load_features(self, columns):
+        """(reference, current) frames holding only these columns, from the cache when already read"""
+        columns = tuple(columns)
+        frames = []
+        for name in ('reference', 'current'):
+            start = time.perf_counter()
+            frame, cached = cached_call(load_columns, *getattr(self, f"{name}_key"), columns)
+            status = self.cache_status[name]
+            status['reads'] += 1
+            status['cached_reads'] += cached
+            status['columns_read'] += 0 if cached else len(columns)
+            status['seconds'] += time.perf_counter() - start
+            frames.append(frame)
+        return frames
+    
+    def show_cache_status(self):
+        """Sidebar indicator: how many of this rerun's column reads came from the cache"""
+        st.sidebar.subheader("🗄️ Cache")
+        for name, status in self.cache_status.items():
+            if status['reads'] == status['cached_reads']:
+                state = "⚡ cached"
+            else:
+                state = f"📥 {status['columns_read']} of {len(self.features())} columns read from disk"
+            hashed = "reused" if status['hash_reused'] else "computed"
+            st.sidebar.caption(f"{name.title()}: {state} in {status['seconds'] * 1000:.0f} ms "
+                               f"({os.path.basename(status['path'])}, hash {status['digest'][:8]} {hashed})")
+        if st.sidebar.button("🧹 Clear Cache"):
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            st.rerun()
+    
+    def drift_run(self):
+        """This session's latest DriftRun, None before the first"""
+        return st.session_state.get('drift_run')
+    
+    def start_drift_run(self):
+        """Start drift detection over every numeric column unless a run is already going"""
+        run = self.drift_run()
+        if run is None or not run.running:
+            # Detection scores every column, so this is the one place the full datasets are loaded
+            with st.spinner("Loading all columns..."):
+                reference_data = load_dataset(*self.reference_key)
+                current_data = load_dataset(*self.current_key)
+            st.session_state['drift_run'] = DriftRun(reference_data, current_data,
+                                                     (self.reference_key, self.current_key))
+    
+    def show_drift_run(self):
+        """Sidebar progress of the latest run, polled without rerunning the rest of the page"""
+        run = self.drift_run()
+        if run is None:
+            return
+        
+        @st.fragment(run_every=0.5 if run.running else None)
+        def progress():
+            if run.running:
+                st.progress(run.progress, text=f"🧪 {run.message}...")
+                return
+            if run.error:
+                st.error(f"❌ Drift detection failed: {run.error}")
+            else:
+                st.success(f"✅ Drift detection completed in {run.seconds:.1f}s")
+            # The fragment polled on its own; rerun the page once so it shows the new results
+            if st.session_state.get('drift_run_shown') is not run:
+                st.session_state['drift_run_shown'] = run
+                st.rerun()
+        
+        with st.sidebar:
+            progress()
+    
+    def latest_drift_results(self):
+        """This session's run results from memory, else the last ones saved to drift_results.json, else None"""
+        run = self.drift_run()
+        if run is not None and run.results is not None and not run.error:
+            return run.results
+        try:
+            with open('drift_results.json', 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Missing, or cut short by a writer that does not replace it atomically
+            return None
+    
+    def ranked_features(self, drift_results=None):
+        """Shared features by drift score, highest first; features without a score follow in file order"""
+        return rank_features(self.features(), drift_results)
+    
     def create_distribution_plots(self):
-        """Create distribution comparison plots"""
-        if self.reference_data is None or self.current_data is None:
+        """Distribution plots for the most drifted features, with the rest behind search and pages
+        
+        Only the columns on screen are read and binned, so the tab costs the same with
+        ten features or ten thousand.
+        """
+        if self.reference_schema is None or self.current_schema is None:
             st.error("Data not loaded!")
             return
         
-        # Get numeric columns
-        numeric_columns = self.reference_data.select_dtypes(include=[np.number]).columns
+        features = self.ranked_features(self.latest_drift_results())
+        if not features:
+            st.warning("The reference and current data share no numeric features.")
+            return
+        
+        top = features[:TOP_FEATURES]
+        st.subheader(f"🔝 Top {len(top)} of {len(features)} Features by Drift Score")
+        self.plot_features(top)
+        
+        if len(features) <= len(top):
+            return
+        
+        st.subheader("🔎 More Features")
+        query = st.text_input("Search features", key='feature_search').strip().lower()
+        if query:
+            matches = search_features(features, query)
+        elif st.toggle(f"Browse the other {len(features) - len(top)} features", key='feature_browse'):
+            matches = features[len(top):]
+        else:
+            return
         
-        for column in numeric_columns:
+        if not matches:
+            st.info(f"No feature matches '{query}'.")
+            return
+        
+        pages = page_count(len(matches))
+        # Keyed by the query, so a new search starts again at page 1
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1,
+                               key=f"feature_page_{query}")
+        shown, start = page_items(matches, page)
+        st.caption(f"{len(matches)} features, showing {start + 1}-{start + len(shown)}")
+        self.plot_features(shown)
+    
+    def plot_features(self, columns):
+        """Reference vs current histogram and means for each of the given features"""
+        reference_data, current_data = self.load_features(columns)
+        
+        # Binned once per dataset version, so reruns only ship bin counts to the browser
+        reference_histograms = cached_histograms(reference_data, *self.reference_key, tuple(columns))
+        current_histograms = cached_histograms(current_data, *self.current_key, tuple(columns))
+        
+        for column in columns:
+            if column not in reference_histograms or column not in current_histograms:
+                continue
+            reference, current = reference_histograms[column], current_histograms[column]
             st.subheader(f"📊 {column} Distribution")
             
             # Create subplot
@@ -42,26 +321,10 @@ class DriftDashboard:
             )
             
             # Reference data histogram
-            fig.add_trace(
-                go.Histogram(
-                    x=self.reference_data[column],
-                    name='Reference',
-                    opacity=0.7,
-                    marker_color='blue'
-                ),
-                row=1, col=1
-            )
+            fig.add_trace(histogram_bars(reference, 'Reference', 'blue'), row=1, col=1)
             
             # Current data histogram
-            fig.add_trace(
-                go.Histogram(
-                    x=self.current_data[column],
-                    name='Current',
-                    opacity=0.7,
-                    marker_color='red'
-                ),
-                row=1, col=2
-            )
+            fig.add_trace(histogram_bars(current, 'Current', 'red'), row=1, col=2)
             
             fig.update_layout(
                 title=f"{column} Distribution Comparison",
@@ -77,13 +340,13 @@ class DriftDashboard:
             with col1:
                 st.metric(
                     "Reference Mean",
-                    f"{self.reference_data[column].mean():.2f}",
-                    f"Std: {self.reference_data[column].std():.2f}"
+                    f"{reference['mean']:.2f}",
+                    f"Std: {reference['std']:.2f}"
                 )
             
             with col2:
-                current_mean = self.current_data[column].mean()
-                ref_mean = self.reference_data[column].mean()
+                current_mean = current['mean']
+                ref_mean = reference['mean']
                 delta = current_mean - ref_mean
                 
                 st.metric(
@@ -96,11 +359,14 @@ class DriftDashboard:
         """Create drift detection summary"""
         st.header("🔍 Drift Detection Summary")
         
-        # Load drift results if available
-        if os.path.exists('drift_results.json'):
-            with open('drift_results.json', 'r') as f:
-                drift_results = json.load(f)
-            
+        # Results of this session's run are in memory; otherwise use the last saved ones
+        run = self.drift_run()
+        drift_results = self.latest_drift_results()
+        stale = run is not None and run.data_keys != (self.reference_key, self.current_key)
+        if stale and drift_results is run.results:
+            st.info("ℹ️ The data changed since this run. Run drift detection again to update it.")
+        
+        if drift_results is not None:
             # Overall drift status
             if drift_results.get('dataset_drift_detected', False):
                 st.error("🚨 DRIFT DETECTED!")
@@ -146,24 +412,76 @@ class DriftDashboard:
         else:
             st.warning("No drift results found. Run drift detection first!")
     
+    def create_monitoring_history(self, days=7):
+        """Checks and alerts from the monitoring store, queried for the last days only"""
+        st.header("🕒 Monitoring History")
+        
+        if not os.path.exists(self.store_path):
+            st.info("No monitoring history yet. Run 'python drift_monitor.py check' or start the monitor.")
+            return
+        
+        store = MonitoringStore(self.store_path)
+        try:
+            start = datetime.now() - timedelta(days=days)
+            summary = store.summary(start=start)
+            history = pd.DataFrame(store.history(start=start))
+            alerts = store.alerts(start=start, limit=50)
+        finally:
+            store.close()
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Checks", summary['total_checks'])
+        
+        with col2:
+            st.metric("Drift Detected", summary['drift_detected'])
+        
+        with col3:
+            st.metric("Alerts", summary['alerts_triggered'])
+        
+        if history.empty:
+            st.warning(f"No checks in the last {days} days.")
+            return
+        
+        fig = px.line(history, x='timestamp', y='drift_share', markers=True, title="Drift Share per Check")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        if alerts:
+            st.subheader("🚨 Recent Alerts")
+            alerts_df = pd.DataFrame([
+                {'Time': alert['timestamp'], 'Status': alert['drift_results'].get('summary', '')}
+                for alert in reversed(alerts)
+            ])
+            st.dataframe(alerts_df, use_container_width=True)
+    
     def create_data_overview(self):
         """Create data overview section"""
         st.header("📊 Data Overview")
         
-        if self.reference_data is not None and self.current_data is not None:
+        if self.reference_schema is not None and self.current_schema is not None:
+            # Summary statistics for the features the distributions tab opens with, so both share one read
+            top = tuple(self.ranked_features(self.latest_drift_results())[:TOP_FEATURES])
+            reference_data, current_data = self.load_features(top) if top else (pd.DataFrame(), pd.DataFrame())
+            if len(self.features()) > len(top):
+                st.caption(f"Statistics for the {len(top)} features with the highest drift score; "
+                           f"search the Distributions tab for the others.")
+            
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Reference Data")
-                st.write(f"**Samples:** {len(self.reference_data)}")
-                st.write(f"**Features:** {len(self.reference_data.columns)}")
-                st.dataframe(self.reference_data.describe(), use_container_width=True)
+                st.write(f"**Samples:** {self.reference_schema['rows']}")
+                st.write(f"**Features:** {len(self.reference_schema['columns'])}")
+                if top:
+                    st.dataframe(describe_dataset(reference_data, *self.reference_key, top), use_container_width=True)
             
             with col2:
                 st.subheader("Current Data")
-                st.write(f"**Samples:** {len(self.current_data)}")
-                st.write(f"**Features:** {len(self.current_data.columns)}")
-                st.dataframe(self.current_data.describe(), use_container_width=True)
+                st.write(f"**Samples:** {self.current_schema['rows']}")
+                st.write(f"**Features:** {len(self.current_schema['columns'])}")
+                if top:
+                    st.dataframe(describe_dataset(current_data, *self.current_key, top), use_container_width=True)
         else:
             st.error("Data not loaded. Please ensure data files exist in 'data/' folder.")
 
@@ -179,23 +497,24 @@ def main():
     
     # Initialize dashboard
     dashboard = DriftDashboard()
+    loaded = dashboard.load_data()
     
     # Sidebar
     st.sidebar.header("🛠️ Controls")
     
+    history_days = st.sidebar.slider("📅 History window (days)", 1, 90, 7)
+    
     if st.sidebar.button("🔄 Refresh Data"):
         st.rerun()
     
-    if st.sidebar.button("🧪 Run Drift Detection"):
-        with st.spinner("Running drift detection..."):
-            os.system("python drift_detector.py")
-        st.success("Drift detection completed!")
-        st.rerun()
+    run = dashboard.drift_run()
+    if st.sidebar.button("🧪 Run Drift Detection", disabled=not loaded or (run is not None and run.running)):
+        dashboard.start_drift_run()
+    dashboard.show_drift_run()
     
-    # Load data
-    if dashboard.load_data():
+    if loaded:
         # Create tabs
-        tab1, tab2, tab3 = st.tabs(["📊 Overview", "🔍 Drift Analysis", "📈 Distributions"])
+        tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🔍 Drift Analysis", "📈 Distributions", "🕒 History"])
         
         with tab1:
             dashboard.create_data_overview()
@@ -205,6 +524,12 @@ def main():
         
         with tab3:
             dashboard.create_distribution_plots()
+        
+        with tab4:
+            dashboard.create_monitoring_history(history_days)
+        
+        # After the tabs, so it counts the columns they read
+        dashboard.show_cache_status()
     
     else:
         st.error("❌ Could not load data files!")
@@ -1,133 +1,387 @@
-import pandas as pd
 import numpy as np
 import json
+import argparse
+import os
+import threading
 from datetime import datetime
+from drift_stats import RunningMoments, stream_moments, drift_scores, percentage_changes
+from drift_storage import read_dataset, resolve_dataset, iter_dataset_chunks
+from drift_profile import ReferenceProfile, is_profile_file
+from drift_parallel import parallel_column_statistics, resolve_n_jobs
 
 # Using simple drift detection only
 EVIDENTLY_AVAILABLE = False
 
+# Distribution tests: small windows are judged by the KS p-value, since PSI over
+# ten bins is noisy with few rows; larger ones by PSI (0.2 is the usual cut-off) or JS
+KS_SAMPLE_LIMIT = 1000
+KS_P_VALUE = 0.05
+PSI_THRESHOLD = 0.2
+JS_THRESHOLD = 0.1
+
 class DriftDetector:
-    def __init__(self):
+    def __init__(self, reference_path='data/reference', current_path='data/current', chunk_size=None,
+                 profile_path=None, distribution_tests=False, n_jobs=1, results_path='drift_results.json',
+                 progress=None, output=None):
+        self.reference_path = reference_path
+        self.current_path = current_path
+        self.chunk_size = chunk_size
+        self.profile_path = profile_path
+        self.distribution_tests = distribution_tests
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.results_path = results_path
+        self.progress = progress
+        # Where status prints go; None is sys.stdout at print time
+        self.output = output
+        self.reference_profile = None
+        self.current_profile = None
         self.reference_data = None
         self.current_data = None
-        
+        self.reference_moments = None
+        self.current_moments = None
+        self._statistics = None
+    
     def load_data(self):
         """Load reference and current datasets"""
+        self._statistics = None
+        try:
+            self.reference_path = resolve_dataset(self.reference_path)
+            self.current_path = resolve_dataset(self.current_path)
+        except ValueError as e:
+            print(f"❌ {e}", file=self.output)
+            return False
+        if self.profile_path or is_profile_file(self.reference_path) or is_profile_file(self.current_path):
+            return self.load_data_profiled()
+        if self.chunk_size:
+            return self.load_data_streaming()
+        
+        self.reference_profile = self.current_profile = None
+        # Moments left by an earlier streamed or profiled load would take precedence over the frames
+        self.reference_moments = self.current_moments = None
+        try:
+            # Only numeric columns are scored; columnar formats skip reading the rest
+            self.reference_data = read_dataset(self.reference_path, numeric_only=True)
+            self.current_data = read_dataset(self.current_path, numeric_only=True)
+            
+            print(f"✅ Reference data loaded: {len(self.reference_data)} samples", file=self.output)
+            print(f"✅ Current data loaded: {len(self.current_data)} samples", file=self.output)
+            
+            # Show data preview
+            print("\n📊 Reference Data Preview:", file=self.output)
+            print(self.reference_data.head(), file=self.output)
+            
+            print("\n📊 Current Data Preview:", file=self.output)
+            print(self.current_data.head(), file=self.output)
+            
+            return True
+        
+        except FileNotFoundError as e:
+            print(f"❌ Data files not found: {e}", file=self.output)
+            print("💡 Run 'python scripts/generate_data.py' first!", file=self.output)
+            return False
+        except Exception as e:
+            print(f"❌ Error loading data: {e}", file=self.output)
+            return False
+    
+    def load_data_streaming(self):
+        """Summarize both datasets chunk by chunk without holding them in memory"""
+        self.reference_data = self.current_data = None
         try:
-            self.reference_data = pd.read_csv('data/reference.csv')
-            self.current_data = pd.read_csv('data/current.csv')
+            self.reference_moments, reference_rows, reference_head, self.reference_profile = self._stream_summary(
+                self.reference_path
+            )
+            self.current_moments, current_rows, current_head, self.current_profile = self._stream_summary(
+                self.current_path, columns=self.reference_moments.columns
+            )
             
-            print(f"✅ Reference data loaded: {len(self.reference_data)} samples")
-            print(f"✅ Current data loaded: {len(self.current_data)} samples")
+            print(f"✅ Reference data streamed: {reference_rows} samples in chunks of {self.chunk_size}",
+                  file=self.output)
+            print(f"✅ Current data streamed: {current_rows} samples in chunks of {self.chunk_size}", file=self.output)
             
             # Show data preview
-            print("\n📊 Reference Data Preview:")
-            print(self.reference_data.head())
+            print("\n📊 Reference Data Preview:", file=self.output)
+            print(reference_head, file=self.output)
             
-            print("\n📊 Current Data Preview:")
-            print(self.current_data.head())
+            print("\n📊 Current Data Preview:", file=self.output)
+            print(current_head, file=self.output)
             
             return True
+        
+        except FileNotFoundError as e:
+            print(f"❌ Data files not found: {e}", file=self.output)
+            print("💡 Run 'python scripts/generate_data.py' first!", file=self.output)
+            return False
+        except Exception as e:
+            print(f"❌ Error loading data: {e}", file=self.output)
+            return False
+    
+    def load_data_profiled(self):
+        """Take reference statistics from a profile and read only the current dataset
+        
+        Either path may itself be a saved profile (.npz), e.g. merged hourly partitions,
+        in which case no raw rows are read for that side at all.
+        """
+        self.reference_data = self.current_data = None
+        try:
+            origin = self.load_reference_profile()
+            self.reference_moments = self.reference_profile.moments
+            reference_columns = self.reference_moments.columns
+            
+            if is_profile_file(self.current_path):
+                self.current_profile = ReferenceProfile.load(self.current_path)
+                self.current_moments = self.current_profile.moments
+                current_rows, current_head = self.current_profile.rows, None
+            elif self.chunk_size:
+                self.current_moments, current_rows, current_head, self.current_profile = self._stream_summary(
+                    self.current_path, columns=reference_columns
+                )
+            else:
+                self.current_profile = None
+                self.current_data = read_dataset(self.current_path, numeric_only=True)
+                shared = [column for column in reference_columns if column in self.current_data.columns]
+                self.current_moments = RunningMoments.from_frame(self.current_data[shared])
+                current_rows, current_head = len(self.current_data), self.current_data.head()
+            
+            print(f"✅ Reference profile from {origin}: {self.reference_profile.rows} samples, "
+                  f"{len(reference_columns)} numeric columns", file=self.output)
+            print(f"✅ Current data loaded: {current_rows} samples", file=self.output)
+            
+            # Show data preview
+            if current_head is not None:
+                print("\n📊 Current Data Preview:", file=self.output)
+                print(current_head, file=self.output)
             
+            return True
+        
         except FileNotFoundError as e:
-            print(f"❌ Data files not found: {e}")
-            print("💡 Run 'python scripts/generate_data.py' first!")
+            print(f"❌ Data files not found: {e}", file=self.output)
+            print("💡 Run 'python scripts/generate_data.py' first!", file=self.output)
             return False
         except Exception as e:
-            print(f"❌ Error loading data: {e}")
+            print(f"❌ Error loading data: {e}", file=self.output)
             return False
     
+    def load_reference_profile(self):
+        """Set reference_profile from the reference path, reusing the cached profile when allowed; returns its origin"""
+        self.reference_path = resolve_dataset(self.reference_path)
+        if is_profile_file(self.reference_path):
+            self.reference_profile, origin = ReferenceProfile.load(self.reference_path), 'profile file'
+        elif self.profile_path:
+            self.reference_profile, origin = ReferenceProfile.load_or_build(
+                self.reference_path, self.profile_path, self.chunk_size, cached=self.reference_profile,
+                output=self.output
+            )
+        else:
+            self.reference_profile, origin = ReferenceProfile.build(self.reference_path), 'raw data'
+        return origin
+    
+    def _stream_summary(self, path, columns=None):
+        """(moments, rows, preview, profile) of a dataset read in chunks; the profile only when distribution tests need it"""
+        if self.distribution_tests:
+            profile = ReferenceProfile.build(path, self.chunk_size, columns=columns)
+            return profile.moments, profile.rows, read_dataset(path, nrows=5), profile
+        
+        moments, rows, head = stream_moments(iter_dataset_chunks(path, self.chunk_size, columns), columns)
+        return moments, rows, head, None
+    
+    def use_frames(self, reference_data, current_data):
+        """Detect drift on frames already in memory instead of reading reference_path and current_path"""
+        self.reference_profile = self.current_profile = None
+        self.reference_moments = self.current_moments = None
+        self.reference_data, self.current_data = reference_data, current_data
+        self._statistics = None
+    
+    def _report_progress(self, fraction, message):
+        """Tell the progress callback, if any, how far detect_drift has got"""
+        if self.progress is not None:
+            self.progress(fraction, message)
+    
+    def _data_loaded(self):
+        frames_loaded = self.reference_data is not None and self.current_data is not None
+        moments_loaded = self.reference_moments is not None and self.current_moments is not None
+        return frames_loaded or moments_loaded
+    
     def detect_drift(self):
         """Detect data drift between reference and current data"""
-        if self.reference_data is None or self.current_data is None:
-            print("❌ Data not loaded. Run load_data() first.")
+        if not self._data_loaded():
+            print("❌ Data not loaded. Run load_data() first.", file=self.output)
             return None
         
-        print("\n🔍 Analyzing Data Drift...")
-        print("-" * 50)
+        print("\n🔍 Analyzing Data Drift...", file=self.output)
+        print("-" * 50, file=self.output)
         
-        print("🔄 Using simple drift detection...")
+        print("🔄 Using simple drift detection...", file=self.output)
         drift_results = self._simple_drift_detection()
         
         # Display results
         self._display_drift_results(drift_results)
         
         # Save results as JSON
-        with open('drift_results.json', 'w') as f:
-            json.dump(drift_results, f, indent=2)
+        if self.results_path:
+            self._report_progress(0.9, "Saving results")
+            # Readers such as the dashboard see the old file or the new one, never a half-written one
+            temporary = f"{self.results_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump(drift_results, f, indent=2)
+            os.replace(temporary, self.results_path)
         
+        self._report_progress(1.0, "Done")
         return drift_results
     
+    def detect_window_drift(self, window):
+        """Score a drift_stream.SlidingWindow against its reference profile
+        
+        Reads no files and prints or saves nothing, since a streaming monitor calls
+        this after every batch of new rows.
+        """
+        self.reference_data = self.current_data = None
+        self.reference_profile, self.current_profile = window.profile, window
+        self.reference_moments, self.current_moments = window.profile.moments, window.moments()
+        self._statistics = None
+        return self._build_drift_results(self._column_statistics())
+    
     def _display_drift_results(self, results):
         """Display drift results in a readable format"""
         if 'error' in results:
-            print(f"❌ {results['error']}")
+            print(f"❌ {results['error']}", file=self.output)
             return
         
-        print(f"\n📊 DRIFT DETECTION RESULTS")
-        print("=" * 50)
-        print(f"Timestamp: {results['timestamp']}")
-        print(f"Summary: {results['summary']}")
+        print(f"\n📊 DRIFT DETECTION RESULTS", file=self.output)
+        print("=" * 50, file=self.output)
+        print(f"Timestamp: {results['timestamp']}", file=self.output)
+        print(f"Summary: {results['summary']}", file=self.output)
         
         if results.get('drift_by_columns'):
-            print(f"\n📈 Feature-Level Drift Analysis:")
-            print("-" * 30)
+            print(f"\n📈 Feature-Level Drift Analysis:", file=self.output)
+            print("-" * 30, file=self.output)
             
             for column, drift_info in results['drift_by_columns'].items():
                 drift_detected = drift_info.get('drift_detected', False)
                 drift_score = drift_info.get('drift_score', 'N/A')
                 
                 status = "🚨 DRIFT" if drift_detected else "✅ OK"
-                print(f"{column:<20} {status:<10} (Score: {drift_score})")
+                if 'psi' in drift_info:
+                    print(f"{column:<20} {status:<10} (Score: {drift_score}, PSI: {drift_info['psi']:.3f}, "
+                          f"KS: {drift_info['ks_statistic']:.3f}, JS: {drift_info['js_divergence']:.3f})",
+                          file=self.output)
+                else:
+                    print(f"{column:<20} {status:<10} (Score: {drift_score})", file=self.output)
         
         # Recommendations
-        print(f"\n💡 RECOMMENDATIONS:")
+        print(f"\n💡 RECOMMENDATIONS:", file=self.output)
         if results['dataset_drift_detected']:
-            print("- 🔄 Consider retraining your model")
-            print("- 📊 Investigate drifted features")
-            print("- ⚠️  Monitor model performance closely")
+            print("- 🔄 Consider retraining your model", file=self.output)
+            print("- 📊 Investigate drifted features", file=self.output)
+            print("- ⚠️  Monitor model performance closely", file=self.output)
         else:
-            print("- ✅ Model is stable, continue monitoring")
-            print("- 📈 Current data matches training distribution")
+            print("- ✅ Model is stable, continue monitoring", file=self.output)
+            print("- 📈 Current data matches training distribution", file=self.output)
     
     def calculate_simple_drift_metrics(self):
         """Calculate simple drift metrics manually"""
-        if self.reference_data is None or self.current_data is None:
-            print("❌ Data not loaded.")
+        if not self._data_loaded():
+            print("❌ Data not loaded.", file=self.output)
             return None
         
-        print("\n🧮 Simple Drift Metrics:")
-        print("-" * 30)
+        print("\n🧮 Simple Drift Metrics:", file=self.output)
+        print("-" * 30, file=self.output)
         
         metrics = {}
         
-        for column in self.reference_data.columns:
-            if column in self.current_data.columns:
-                ref_mean = self.reference_data[column].mean()
-                curr_mean = self.current_data[column].mean()
-                
-                # Calculate percentage change
-                if ref_mean != 0:
-                    pct_change = abs((curr_mean - ref_mean) / ref_mean) * 100
-                else:
-                    pct_change = 0
-                
-                metrics[column] = {
-                    'reference_mean': ref_mean,
-                    'current_mean': curr_mean,
-                    'percentage_change': pct_change,
-                    'drift_detected': pct_change > 10  # 10% threshold
-                }
-                
-                status = "🚨 DRIFT" if pct_change > 10 else "✅ OK"
-                print(f"{column:<20} {status} ({pct_change:.1f}% change)")
+        statistics = self._column_statistics()
+        changes = statistics['percentage_change']
+        
+        for column, ref_mean, curr_mean, pct_change in zip(statistics['columns'], statistics['reference_mean'].tolist(),
+                                                           statistics['current_mean'].tolist(), changes.tolist()):
+            metrics[column] = {
+                'reference_mean': ref_mean,
+                'current_mean': curr_mean,
+                'percentage_change': pct_change,
+                'drift_detected': pct_change > 10  # 10% threshold
+            }
+            
+            status = "🚨 DRIFT" if pct_change > 10 else "✅ OK"
+            print(f"{column:<20} {status} ({pct_change:.1f}% change)", file=self.output)
         
         return metrics
     
+    def _column_statistics(self):
+        """Means, stds, drift scores and percentage changes for all shared numeric columns as arrays
+        
+        Computed in one vectorized pass and cached until the data is reloaded, so
+        _simple_drift_detection and calculate_simple_drift_metrics share the work.
+        """
+        if self._statistics is not None:
+            return self._statistics
+        
+        self._report_progress(0.1, "Computing column statistics")
+        tests = None
+        if self.reference_moments is not None:
+            reference, current = self.reference_moments, self.current_moments
+            numeric_columns = reference.columns
+        else:
+            numeric_columns = self.reference_data.select_dtypes(include=[np.number]).columns
+            current_columns = set(self.current_data.columns)
+            shared = [column for column in numeric_columns if column in current_columns]
+            if self.n_jobs > 1 and shared:
+                reference, current, tests = parallel_column_statistics(
+                    self.reference_data, self.current_data, shared, self.n_jobs,
+                    distribution_tests=self.distribution_tests
+                )
+            else:
+                reference = RunningMoments.from_frame(self.reference_data[shared])
+                current = RunningMoments.from_frame(self.current_data[shared])
+        
+        current_columns = set(current.columns)
+        columns = [column for column in reference.columns if column in current_columns]
+        reference, current = reference.select(columns), current.select(columns)
+        
+        reference_mean, reference_std, current_mean = reference.means(), reference.stds(), current.means()
+        self._statistics = {
+            'number_of_columns': len(numeric_columns),
+            'columns': columns,
+            'reference_mean': reference_mean,
+            'reference_std': reference_std,
+            'current_mean': current_mean,
+            'drift_score': drift_scores(reference_mean, reference_std, current_mean),
+            'percentage_change': percentage_changes(reference_mean, current_mean)
+        }
+        if self.distribution_tests:
+            self._report_progress(0.5, "Running distribution tests")
+            self._statistics.update(tests if tests is not None else self._distribution_statistics(columns))
+        return self._statistics
+    
+    def _distribution_statistics(self, columns):
+        """PSI, KS and JS arrays for the given columns, scored against the reference profile's bins"""
+        reference = self.reference_profile
+        if reference is None:
+            reference = ReferenceProfile.from_frame(self.reference_data, columns)
+        
+        if self.current_profile is not None:
+            current = self.current_profile
+        elif self.n_jobs > 1 and columns:
+            _, _, tests = parallel_column_statistics(None, self.current_data, columns, self.n_jobs,
+                                                     reference_profile=reference.select(columns),
+                                                     distribution_tests=True)
+            return tests
+        else:
+            values = self.current_data[columns].to_numpy(dtype=float, na_value=np.nan)
+            ordered = np.sort(values, axis=0)
+            valid = np.count_nonzero(~np.isnan(values), axis=0)
+            current = {column: ordered[:valid[i], i] for i, column in enumerate(columns)}
+        
+        tests = reference.distribution_tests(current)
+        positions = reference.columns.get_indexer(columns)
+        return {name: values[positions] for name, values in tests.items()}
+    
     def _simple_drift_detection(self):
         """Simple drift detection without Evidently"""
-        print("📊 Running simple statistical drift detection...")
+        print("📊 Running simple statistical drift detection...", file=self.output)
         
+        return self._build_drift_results(self._column_statistics())
+    
+    def _build_drift_results(self, statistics):
+        """Lay out vectorized column statistics as drift_results, the same for both load modes"""
         drift_results = {
             'timestamp': datetime.now().isoformat(),
             'dataset_drift_detected': False,
@@ -138,52 +392,65 @@ class DriftDetector:
             'summary': ''
         }
         
-        numeric_columns = self.reference_data.select_dtypes(include=[np.number]).columns
-        drift_results['number_of_columns'] = len(numeric_columns)
+        number_of_columns = statistics['number_of_columns']
+        drift_results['number_of_columns'] = number_of_columns
         
-        drifted_count = 0
+        # Determine if drift detected (threshold: 2.0)
+        drifted = statistics['drift_score'] > 2.0
+        if 'psi' in statistics:
+            small_window = statistics['current_count'] <= KS_SAMPLE_LIMIT
+            drifted |= np.where(small_window, statistics['ks_p_value'] < KS_P_VALUE,
+                                (statistics['psi'] > PSI_THRESHOLD) | (statistics['js_divergence'] > JS_THRESHOLD))
+        drifted_count = int(drifted.sum())
         
-        for column in numeric_columns:
-            if column in self.current_data.columns:
-                # Calculate statistical measures
-                ref_mean = self.reference_data[column].mean()
-                curr_mean = self.current_data[column].mean()
-                ref_std = self.reference_data[column].std()
-                
-                # Calculate drift score (normalized difference)
-                if ref_std > 0:
-                    drift_score = abs(curr_mean - ref_mean) / ref_std
-                else:
-                    drift_score = 0
-                
-                # Determine if drift detected (threshold: 2.0)
-                drift_detected = drift_score > 2.0
-                
-                if drift_detected:
-                    drifted_count += 1
-                
-                drift_results['drift_by_columns'][column] = {
-                    'drift_detected': drift_detected,
-                    'drift_score': float(drift_score),
-                    'reference_mean': float(ref_mean),
-                    'current_mean': float(curr_mean)
-                }
+        for column, detected, score, ref_mean, curr_mean in zip(
+            statistics['columns'], drifted.tolist(), statistics['drift_score'].tolist(),
+            statistics['reference_mean'].tolist(), statistics['current_mean'].tolist()
+        ):
+            drift_results['drift_by_columns'][column] = {
+                'drift_detected': detected,
+                'drift_score': score,
+                'reference_mean': ref_mean,
+                'current_mean': curr_mean
+            }
+        
+        if 'psi' in statistics:
+            for name in ('psi', 'ks_statistic', 'ks_p_value', 'js_divergence'):
+                for column, value in zip(statistics['columns'], statistics[name].tolist()):
+                    drift_results['drift_by_columns'][column][name] = value
         
         # Calculate overall drift metrics
         drift_results['number_of_drifted_columns'] = drifted_count
-        drift_results['drift_share'] = drifted_count / len(numeric_columns) if len(numeric_columns) > 0 else 0
+        drift_results['drift_share'] = drifted_count / number_of_columns if number_of_columns > 0 else 0
         drift_results['dataset_drift_detected'] = drifted_count > 0
         
         # Create summary
         if drift_results['dataset_drift_detected']:
-            drift_results['summary'] = f"🚨 DRIFT DETECTED: {drifted_count}/{len(numeric_columns)} features drifted ({drift_results['drift_share']:.1%} drift share)"
+            drift_results['summary'] = f"🚨 DRIFT DETECTED: {drifted_count}/{number_of_columns} features drifted ({drift_results['drift_share']:.1%} drift share)"
         else:
             drift_results['summary'] = f"✅ NO DRIFT: All features stable ({drift_results['drift_share']:.1%} drift share)"
         
         return drift_results
 
 if __name__ == "__main__":
-    detector = DriftDetector()
+    parser = argparse.ArgumentParser(description='Detect data drift between reference and current datasets')
+    parser.add_argument('--reference', default='data/reference',
+                        help='reference dataset: CSV, Parquet, npy directory or .npz profile; without an extension, '
+                             'whichever of .parquet, .pq, .npy and .csv exists (an error if several do)')
+    parser.add_argument('--current', default='data/current',
+                        help='current dataset, in any format --reference takes')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='stream both files in chunks of this many rows instead of loading them whole')
+    parser.add_argument('--profile', default=None,
+                        help='cache the reference statistics in this .npz and reuse them while the reference is unchanged')
+    parser.add_argument('--distribution-tests', action='store_true',
+                        help='also score PSI, KS and Jensen-Shannon divergence per column')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='worker processes for per-column work on in-memory data (-1 uses every core)')
+    args = parser.parse_args()
+    
+    detector = DriftDetector(args.reference, args.current, args.chunk_size, args.profile, args.distribution_tests,
+                             args.n_jobs)
     
     if detector.load_data():
         results = detector.detect_drift()
@@ -1,27 +1,37 @@
 import pandas as pd
 import numpy as np
-import json
 import time
 from datetime import datetime, timedelta
-import os
 import smtplib
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from drift_detector import DriftDetector
+from drift_stream import FeedTail, SlidingWindow
+from drift_store import MonitoringStore
+from drift_watch import ChangeWatcher, content_digest
+from drift_storage import resolve_dataset
 
 class DriftMonitor:
-    def __init__(self, drift_threshold=0.2, check_interval_hours=24):
+    def __init__(self, drift_threshold=0.2, check_interval_hours=24, store_path='drift_monitoring.db',
+                 detector=None, store=None, name='default', distribution_tests=False, output=None):
         self.drift_threshold = drift_threshold
         self.check_interval_hours = check_interval_hours
-        self.detector = DriftDetector()
-        self.monitoring_log = []
-        
+        self.name = name
+        # Where status prints go; None is sys.stdout at print time
+        self.output = output
+        # The reference never changes between checks, so its statistics and bins come from a cached profile.
+        # PSI, KS and JS also flag shape changes the mean score misses, so more checks alert: opt in to them
+        self.detector = detector or DriftDetector(profile_path='data/reference_profile.npz',
+                                                  distribution_tests=distribution_tests, output=output)
+        # Checks and alerts are appended to an indexed store instead of rewriting JSON files
+        self.store = store or MonitoringStore(store_path, output=output)
+    
     def start_monitoring(self):
         """Start continuous drift monitoring"""
-        print("🚀 Starting AI Drift Monitoring System")
-        print(f"📊 Drift threshold: {self.drift_threshold}")
-        print(f"⏰ Check interval: {self.check_interval_hours} hours")
-        print("-" * 50)
+        print("🚀 Starting AI Drift Monitoring System", file=self.output)
+        print(f"📊 Drift threshold: {self.drift_threshold}", file=self.output)
+        print(f"⏰ Check interval: {self.check_interval_hours} hours", file=self.output)
+        print("-" * 50, file=self.output)
         
         while True:
             try:
@@ -35,31 +45,135 @@ class DriftMonitor:
                     # Check if action needed
                     if self.should_alert(drift_results):
                         self.send_alert(drift_results)
-                    
-                    # Save monitoring history
-                    self.save_monitoring_history()
                 
                 # Wait for next check
-                print(f"⏰ Next check in {self.check_interval_hours} hours...")
+                print(f"⏰ Next check in {self.check_interval_hours} hours...", file=self.output)
                 time.sleep(self.check_interval_hours * 3600)  # Convert to seconds
-                
+            
             except KeyboardInterrupt:
-                print("\n🛑 Monitoring stopped by user")
+                print("\n🛑 Monitoring stopped by user", file=self.output)
                 break
             except Exception as e:
-                print(f"❌ Error in monitoring: {e}")
+                print(f"❌ Error in monitoring: {e}", file=self.output)
                 time.sleep(300)  # Wait 5 minutes before retry
     
+    def start_streaming(self, feed_path, window_rows=5000, poll_seconds=1.0, min_rows=None, from_start=False):
+        """Tail an append-only CSV/JSONL feed and re-score a sliding window as rows arrive
+        
+        Each poll reads only the bytes appended since the last one and folds them into
+        the window, so an alert fires within about poll_seconds of the shift reaching
+        the feed. Alerts fire when drift starts, not again on every check while it lasts.
+        """
+        min_rows = min_rows or max(1, window_rows // 10)
+        origin = self.detector.load_reference_profile()
+        window = SlidingWindow(self.detector.reference_profile, window_rows)
+        tail = FeedTail(feed_path, from_start=from_start, output=self.output)
+        
+        print("🚀 Starting streaming drift monitoring", file=self.output)
+        print(f"📡 Feed: {feed_path} | window: {window_rows} rows | poll: {poll_seconds}s", file=self.output)
+        print(f"📊 Reference profile from {origin}: {window.profile.rows} samples, {len(window.columns)} numeric columns",
+              file=self.output)
+        print("-" * 50, file=self.output)
+        
+        alerting = False
+        while True:
+            try:
+                frame = tail.read()
+                if frame.empty:
+                    time.sleep(poll_seconds)
+                    continue
+                
+                window.add(frame)
+                if window.rows < min_rows:
+                    continue
+                
+                drift_results = self.detector.detect_window_drift(window)
+                alert = self.should_alert(drift_results)
+                print(f"{datetime.now().strftime('%H:%M:%S')} +{len(frame)} rows | window {window.rows} | "
+                      f"{'🚨 DRIFT' if drift_results['dataset_drift_detected'] else '✅ OK'} | "
+                      f"drift share {drift_results['drift_share']:.1%}", file=self.output)
+                
+                # Record state changes only; a row per poll would fill the history every second
+                if alert != alerting:
+                    self.log_monitoring_result(drift_results)
+                    if alert:
+                        self.send_alert(drift_results)
+                alerting = alert
+            
+            except KeyboardInterrupt:
+                print("\n🛑 Streaming monitor stopped by user", file=self.output)
+                break
+            except Exception as e:
+                print(f"❌ Error in streaming monitor: {e}", file=self.output)
+                time.sleep(poll_seconds)
+    
+    def start_watching(self, paths=None, poll_seconds=1.0, debounce_seconds=2.0):
+        """Run a check whenever the watched data changes, instead of on a fixed interval
+        
+        paths (files or directories) default to the current and reference datasets; the
+        check itself always reads the detector's datasets. Bursts of writes are debounced
+        into one check, and a change that leaves both datasets' content as it was (a
+        touch, a rewrite of the same rows) is skipped by comparing content hashes. Only
+        files whose stat changed are hashed again; the reference reuses the hash its
+        cached profile keeps.
+        """
+        datasets = [self.detector.current_path, self.detector.reference_path]
+        watcher = ChangeWatcher(paths or [resolve_dataset(path) for path in datasets], poll_seconds, debounce_seconds)
+        
+        print("🚀 Starting event-driven drift monitoring", file=self.output)
+        print(f"👀 Watching: {', '.join(watcher.paths)} | debounce: {debounce_seconds}s", file=self.output)
+        print("-" * 50, file=self.output)
+        
+        last_digest = None
+        digests = {}
+        changed = ['startup']
+        while True:
+            try:
+                if changed is None:
+                    changed = watcher.wait()
+                elif self.detector.profile_path:
+                    # At startup, load the profile first: the check reuses it and its hash spares reading the reference
+                    self.detector.load_reference_profile()
+                
+                digest = content_digest(datasets, digests, self._profile_digests())
+                if digest is not None and digest == last_digest:
+                    print(f"⏭️  {', '.join(changed)} changed but the data content did not, skipping the check",
+                          file=self.output)
+                else:
+                    print(f"📥 Change detected: {', '.join(changed)}", file=self.output)
+                    drift_results = self.run_drift_check()
+                    if drift_results:
+                        self.log_monitoring_result(drift_results)
+                        if self.should_alert(drift_results):
+                            self.send_alert(drift_results)
+                        last_digest = digest
+            
+            except KeyboardInterrupt:
+                print("\n🛑 Watch stopped by user", file=self.output)
+                break
+            except Exception as e:
+                # No fixed back-off: the next change retries
+                print(f"❌ Error in watch mode: {e}", file=self.output)
+            changed = None
+    
+    def _profile_digests(self):
+        """{path: (stamp, content hash)} of the reference, from the detector's reference profile if it has one"""
+        profile = self.detector.reference_profile
+        if profile is None or 'content_hash' not in profile.source:
+            return {}
+        source = profile.source
+        return {source['path']: ((source['mtime_ns'], source['size']), source['content_hash'])}
+    
     def run_drift_check(self):
         """Run a single drift detection check"""
-        print(f"\n🔍 Running drift check at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"\n🔍 Running drift check at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=self.output)
         
         # Load data and detect drift
         if self.detector.load_data():
             drift_results = self.detector.detect_drift()
             return drift_results
         else:
-            print("❌ Could not load data for drift check")
+            print("❌ Could not load data for drift check", file=self.output)
             return None
     
     def should_alert(self, drift_results):
@@ -80,34 +194,23 @@ class DriftMonitor:
     
     def send_alert(self, drift_results):
         """Send drift alert (console for now, can be extended to email/Slack)"""
-        print("\n🚨 DRIFT ALERT TRIGGERED!")
-        print("=" * 40)
+        print("\n🚨 DRIFT ALERT TRIGGERED!", file=self.output)
+        print("=" * 40, file=self.output)
         
         alert_message = self.create_alert_message(drift_results)
-        print(alert_message)
+        print(alert_message, file=self.output)
         
-        # Save alert to file
+        # Append alert to the store
         alert_data = {
             'timestamp': datetime.now().isoformat(),
+            'job': self.name,
             'alert_type': 'drift_detected',
             'drift_results': drift_results,
             'message': alert_message
         }
+        self.store.append_alert(alert_data)
         
-        # Append to alerts log
-        alerts_file = 'drift_alerts.json'
-        alerts = []
-        
-        if os.path.exists(alerts_file):
-            with open(alerts_file, 'r') as f:
-                alerts = json.load(f)
-        
-        alerts.append(alert_data)
-        
-        with open(alerts_file, 'w') as f:
-            json.dump(alerts, f, indent=2)
-        
-        print(f"📝 Alert logged to {alerts_file}")
+        print(f"📝 Alert logged to {self.store.path}", file=self.output)
     
     def create_alert_message(self, drift_results):
         """Create human-readable alert message"""
@@ -115,6 +218,7 @@ class DriftMonitor:
 🚨 DATA DRIFT ALERT
 ==================
 Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Job: {self.name}
 Status: {drift_results.get('summary', 'Drift detected')}
 
 Details:
@@ -135,50 +239,54 @@ This is an automated alert from your AI Drift Monitoring System.
         """Log monitoring result to history"""
         log_entry = {
             'timestamp': datetime.now().isoformat(),
+            'job': self.name,
             'dataset_drift_detected': drift_results.get('dataset_drift_detected', False),
             'drift_share': drift_results.get('drift_share', 0),
             'number_of_drifted_columns': drift_results.get('number_of_drifted_columns', 0),
             'alert_triggered': self.should_alert(drift_results)
         }
         
-        self.monitoring_log.append(log_entry)
+        self.store.append_history(log_entry)
         
         # Print summary
         status = "🚨 DRIFT" if log_entry['dataset_drift_detected'] else "✅ OK"
-        print(f"Status: {status} | Drift Share: {log_entry['drift_share']:.1%} | Alert: {log_entry['alert_triggered']}")
+        print(f"Status: {status} | Drift Share: {log_entry['drift_share']:.1%} | Alert: {log_entry['alert_triggered']}",
+              file=self.output)
     
-    def save_monitoring_history(self):
-        """Save monitoring history to file"""
-        history_file = 'drift_monitoring_history.json'
+    def generate_monitoring_report(self, hours=None, job=None):
+        """Generate a monitoring summary report, over the last hours or the whole history, for one job or all"""
+        start = datetime.now() - timedelta(hours=hours) if hours else None
+        summary = self.store.summary(start=start, job=job)
         
-        with open(history_file, 'w') as f:
-            json.dump(self.monitoring_log, f, indent=2)
-    
-    def generate_monitoring_report(self):
-        """Generate a monitoring summary report"""
-        if not self.monitoring_log:
-            print("No monitoring data available")
+        if not summary['total_checks']:
+            print("No monitoring data available", file=self.output)
             return
         
-        print("\n📊 DRIFT MONITORING REPORT")
-        print("=" * 30)
+        print("\n📊 DRIFT MONITORING REPORT", file=self.output)
+        print("=" * 30, file=self.output)
+        if hours:
+            print(f"Period: last {hours} hours", file=self.output)
+        if job:
+            print(f"Job: {job}", file=self.output)
+        
+        total_checks = summary['total_checks']
+        drift_detected_count = summary['drift_detected']
+        alerts_triggered = summary['alerts_triggered']
         
-        total_checks = len(self.monitoring_log)
-        drift_detected_count = sum(1 for log in self.monitoring_log if log['dataset_drift_detected'])
-        alerts_triggered = sum(1 for log in self.monitoring_log if log['alert_triggered'])
+        print(f"Total Checks: {total_checks}", file=self.output)
+        print(f"Drift Detected: {drift_detected_count} ({drift_detected_count/total_checks*100:.1f}%)",
+              file=self.output)
+        print(f"Alerts Triggered: {alerts_triggered}", file=self.output)
         
-        print(f"Total Checks: {total_checks}")
-        print(f"Drift Detected: {drift_detected_count} ({drift_detected_count/total_checks*100:.1f}%)")
-        print(f"Alerts Triggered: {alerts_triggered}")
+        latest_check = summary['latest_check']
+        print(f"Latest Check: {latest_check['timestamp']}", file=self.output)
+        print(f"Latest Status: {'🚨 DRIFT' if latest_check['dataset_drift_detected'] else '✅ OK'}", file=self.output)
         
-        if self.monitoring_log:
-            latest_check = self.monitoring_log[-1]
-            print(f"Latest Check: {latest_check['timestamp']}")
-            print(f"Latest Status: {'🚨 DRIFT' if latest_check['dataset_drift_detected'] else '✅ OK'}")
+        return summary
     
     def run_single_check(self):
         """Run a single drift check (for testing)"""
-        print("🧪 Running single drift check...")
+        print("🧪 Running single drift check...", file=self.output)
         
         drift_results = self.run_drift_check()
         
@@ -188,33 +296,45 @@ This is an automated alert from your AI Drift Monitoring System.
             if self.should_alert(drift_results):
                 self.send_alert(drift_results)
             else:
-                print("✅ No alert needed - drift within acceptable limits")
+                print("✅ No alert needed - drift within acceptable limits", file=self.output)
             
             return drift_results
         else:
-            print("❌ Drift check failed")
+            print("❌ Drift check failed", file=self.output)
             return None
 
 # CLI interface
 if __name__ == "__main__":
     import sys
     
-    monitor = DriftMonitor(drift_threshold=0.15, check_interval_hours=1)  # 1 hour for demo
+    args = [arg for arg in sys.argv[1:] if arg != '--distribution-tests']
+    monitor = DriftMonitor(drift_threshold=0.15, check_interval_hours=1,  # 1 hour for demo
+                           distribution_tests='--distribution-tests' in sys.argv)
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    if args:
+        command = args[0]
         
         if command == "start":
             monitor.start_monitoring()
         elif command == "check":
             monitor.run_single_check()
         elif command == "report":
-            monitor.generate_monitoring_report()
+            monitor.generate_monitoring_report(float(args[1]) if len(args) > 1 else None)
+        elif command == "watch":
+            monitor.start_watching(args[1:] or None)
+        elif command == "stream":
+            feed_path = args[1] if len(args) > 1 else 'data/current.csv'
+            window_rows = int(args[2]) if len(args) > 2 else 5000
+            monitor.start_streaming(feed_path, window_rows)
         else:
-            print("Usage: python drift_monitor.py [start|check|report]")
+            print("Usage: python drift_monitor.py [start|check|report [hours]|watch [paths]|stream [feed] [window rows]] "
+                  "[--distribution-tests]")
     else:
         print("🔍 AI Drift Monitor")
         print("Available commands:")
         print("  python drift_monitor.py start  - Start continuous monitoring")
         print("  python drift_monitor.py check  - Run single drift check")
-        print("  python drift_monitor.py report - Generate monitoring report")
\ No newline at end of file
+        print("  python drift_monitor.py report [hours] - Generate monitoring report")
+        print("  python drift_monitor.py watch [paths] - Check whenever the data (or the given files/directories) change")
+        print("  python drift_monitor.py stream [feed.csv|feed.jsonl] [window rows] - Tail a feed and alert within seconds")
+        print("  Add --distribution-tests to also alert on PSI, KS and Jensen-Shannon drift, not only mean shifts")
\ No newline at end of file
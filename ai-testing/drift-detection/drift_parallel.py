@@ -0,0 +1,114 @@
+import pandas as pd
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from drift_stats import RunningMoments
+from drift_profile import ReferenceProfile
+
+def resolve_n_jobs(n_jobs):
+    """n_jobs as in scikit-learn: -1 means every core"""
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+def _share_columns(frame, columns):
+    """Copy columns into one column-major float block in shared memory; returns (block, (name, shape))"""
+    shape = (len(frame), len(columns))
+    block = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+    try:
+        values = np.ndarray(shape, dtype=float, buffer=block.buf, order='F')
+        # Column by column, so the parent never holds a second full copy
+        for i, column in enumerate(columns):
+            values[:, i] = frame[column].to_numpy(dtype=float, na_value=np.nan)
+        del values
+    except Exception:
+        # The caller only frees blocks it gets back, so a failed copy frees its own
+        values = None
+        block.close()
+        block.unlink()
+        raise
+    return block, (block.name, shape)
+
+def _attach(spec):
+    name, shape = spec
+    # Pool workers share the parent's resource tracker, and the parent unlinks the block
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=float, buffer=block.buf, order='F')
+
+def _score_columns(task):
+    """Moments and distribution tests for one contiguous range of columns, read from shared memory"""
+    reference_spec, current_spec, start, stop, columns, reference_profile, distribution_tests = task
+    blocks = []
+    try:
+        result = {}
+        reference_values = None
+        if reference_spec is not None:
+            block, values = _attach(reference_spec)
+            blocks.append(block)
+            reference_values = values[:, start:stop]
+            result['reference'] = RunningMoments.from_array(columns, reference_values)
+        
+        block, values = _attach(current_spec)
+        blocks.append(block)
+        current_values = values[:, start:stop]
+        result['current'] = RunningMoments.from_array(columns, current_values)
+        
+        if distribution_tests:
+            if reference_profile is None:
+                reference_profile = ReferenceProfile.from_frame(pd.DataFrame(reference_values, columns=columns, copy=False))
+            ordered = np.sort(current_values, axis=0)
+            valid = np.count_nonzero(~np.isnan(current_values), axis=0)
+            current = {column: ordered[:valid[i], i] for i, column in enumerate(columns)}
+            result['tests'] = reference_profile.distribution_tests(current)
+        
+        # Drop views into the blocks before closing them
+        del reference_values, current_values, values
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+
+def parallel_column_statistics(reference_data, current_data, columns, n_jobs, reference_profile=None,
+                               distribution_tests=False):
+    """Per-column work split into contiguous column ranges across a process pool
+    
+    Columns go to workers through shared memory rather than pickled copies. With a
+    reference_profile the reference frame is not needed and workers get just their
+    slice of the profile. Returns (reference moments or None, current moments,
+    distribution test arrays or None), all aligned with columns.
+    """
+    columns = list(columns)
+    workers = min(resolve_n_jobs(n_jobs), max(1, len(columns)))
+    ranges = [(r[0], r[-1] + 1) for r in np.array_split(np.arange(len(columns)), workers) if len(r)]
+    
+    blocks = []
+    try:
+        reference_spec = None
+        if reference_profile is None:
+            block, reference_spec = _share_columns(reference_data, columns)
+            blocks.append(block)
+        block, current_spec = _share_columns(current_data, columns)
+        blocks.append(block)
+        
+        tasks = [
+            (reference_spec, current_spec, start, stop, columns[start:stop],
+             reference_profile.select(columns[start:stop]) if reference_profile is not None else None,
+             distribution_tests)
+            for start, stop in ranges
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_score_columns, tasks))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    
+    reference = RunningMoments.concat([result['reference'] for result in results]) if reference_profile is None else None
+    current = RunningMoments.concat([result['current'] for result in results])
+    tests = None
+    if distribution_tests:
+        tests = {name: np.concatenate([result['tests'][name] for result in results]) for name in results[0]['tests']}
+    return reference, current, tests
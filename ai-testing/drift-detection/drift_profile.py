@@ -0,0 +1,393 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import hashlib
+import argparse
+from datetime import datetime
+from drift_stats import (RunningMoments, QuantileSketch, iter_numeric_chunks, population_stability_index,
+                         jensen_shannon_divergence, ks_p_value)
+from drift_storage import dataset_format, dataset_files, iter_dataset_chunks
+
+PROFILE_VERSION = 1
+QUANTILE_GRID = np.linspace(0, 1, 101)
+PROFILE_BINS = 10
+DEFAULT_CHUNK_SIZE = 100000
+
+def is_profile_file(path):
+    """Profiles are stored as .npz; anything else is read as a dataset (CSV, Parquet or npy)"""
+    return str(path).endswith('.npz')
+
+def file_stamp(path):
+    """(mtime_ns, size) of a dataset, the cheap check before hashing it; newest and total over npy column files"""
+    stats = [os.stat(name) for name in dataset_files(path)]
+    return max(stat.st_mtime_ns for stat in stats), sum(stat.st_size for stat in stats)
+
+def file_digest(path, block_size=1 << 20):
+    """Content hash of a dataset's files, read in blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in dataset_files(path):
+        with open(name, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+class _HashingReader:
+    """File wrapper that hashes bytes as pandas reads them, so building a profile reads the file once"""
+    
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.blake2b(digest_size=16)
+    
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.digest.update(data)
+        return data
+    
+    def __iter__(self):
+        return iter(self.f)
+    
+    def hexdigest(self):
+        self.digest.update(self.f.read())
+        return self.digest.hexdigest()
+
+class ReferenceProfile:
+    """Compact per-column summary of a reference dataset: moments, quantile sketches and histogram bins"""
+    
+    def __init__(self, moments, sketches, minimum, maximum, rows, number_of_columns, source=None, summarize=True):
+        self.moments = moments
+        self.sketches = sketches
+        self.minimum = minimum
+        self.maximum = maximum
+        self.rows = rows
+        self.number_of_columns = number_of_columns
+        self.source = source or {}
+        if summarize:
+            self._summarize()
+    
+    @property
+    def columns(self):
+        return self.moments.columns
+    
+    def _summarize(self):
+        """Derive the quantile grid and decile histogram from the sketches"""
+        columns = len(self.columns)
+        self.quantiles = np.full((columns, len(QUANTILE_GRID)), np.nan)
+        self.bin_edges = np.full((columns, PROFILE_BINS + 1), np.nan)
+        self.bin_counts = np.zeros((columns, PROFILE_BINS))
+        self.cdf_at = np.full((columns, len(QUANTILE_GRID)), np.nan)
+        self.cdf_below = np.full((columns, len(QUANTILE_GRID)), np.nan)
+        
+        bin_positions = np.linspace(0, len(QUANTILE_GRID) - 1, PROFILE_BINS + 1).astype(int)
+        for i, sketch in enumerate(self.sketches):
+            if sketch.count == 0:
+                continue
+            quantiles = sketch.quantiles(QUANTILE_GRID)
+            quantiles[0], quantiles[-1] = self.minimum[i], self.maximum[i]
+            self.quantiles[i] = quantiles
+            
+            # Reference CDF at and just below each grid point, for two-sided KS against any window
+            self.cdf_at[i] = sketch.rank(quantiles)
+            self.cdf_below[i] = sketch.rank(quantiles, strict=True)
+            
+            # Bins follow np.histogram: [edge, next edge) with the last bin closed
+            edges = quantiles[bin_positions]
+            below = sketch.rank(edges, strict=True)
+            below[-1] = 1.0
+            self.bin_edges[i] = edges
+            self.bin_counts[i] = np.diff(below) * sketch.count
+    
+    @classmethod
+    def _accumulate(cls, chunks, sketch_k):
+        """Moments, sketches, min/max and row count over (chunk, numeric columns) pairs"""
+        moments = None
+        sketches = {}
+        minimum = maximum = None
+        rows = 0
+        
+        for chunk, numeric in chunks:
+            if moments is None:
+                moments = RunningMoments(numeric)
+            elif len(numeric) < len(moments.columns):
+                positions = moments.columns.get_indexer(numeric)
+                moments = moments.select(numeric)
+                minimum, maximum = minimum[positions], maximum[positions]
+            
+            values = chunk[moments.columns].to_numpy(dtype=float, na_value=np.nan)
+            moments.merge(RunningMoments.from_array(moments.columns, values))
+            chunk_min = np.fmin.reduce(values, axis=0, initial=np.inf)
+            chunk_max = np.fmax.reduce(values, axis=0, initial=-np.inf)
+            minimum = chunk_min if minimum is None else np.fmin(minimum, chunk_min)
+            maximum = chunk_max if maximum is None else np.fmax(maximum, chunk_max)
+            
+            # One 2-D sort per chunk; NaN sorts last, so each column's values are a prefix
+            ordered = np.sort(values, axis=0)
+            valid = np.count_nonzero(~np.isnan(values), axis=0)
+            for i, (column, present) in enumerate(zip(moments.columns, valid)):
+                sketch = sketches.setdefault(column, QuantileSketch(sketch_k))
+                sketch.update_sorted(ordered[:present, i])
+            rows += len(chunk)
+        
+        if moments is None:
+            moments = RunningMoments([])
+            minimum = maximum = np.empty(0)
+        
+        minimum = np.where(np.isinf(minimum), np.nan, minimum)
+        maximum = np.where(np.isinf(maximum), np.nan, maximum)
+        return moments, [sketches[column] for column in moments.columns], minimum, maximum, rows
+    
+    @classmethod
+    def build(cls, path, chunk_size=DEFAULT_CHUNK_SIZE, sketch_k=200, columns=None):
+        """Summarize a dataset in one chunked pass; a CSV is hashed while it is parsed"""
+        mtime_ns, size = file_stamp(path)
+        
+        if dataset_format(path) == 'csv':
+            with open(path, 'rb') as f:
+                reader = _HashingReader(f)
+                moments, sketches, minimum, maximum, rows = cls._accumulate(
+                    iter_numeric_chunks(reader, chunk_size, columns), sketch_k
+                )
+                content_hash = reader.hexdigest()
+        else:
+            # Columnar formats only read the numeric columns, so the hash is a separate raw pass
+            moments, sketches, minimum, maximum, rows = cls._accumulate(
+                iter_dataset_chunks(path, chunk_size, columns), sketch_k
+            )
+            content_hash = file_digest(path)
+        
+        source = {
+            'path': os.path.abspath(path),
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'content_hash': content_hash,
+            'built_at': datetime.now().isoformat()
+        }
+        return cls(moments, sketches, minimum, maximum, rows, len(moments.columns), source)
+    
+    @classmethod
+    def from_frame(cls, frame, columns=None):
+        """Profile of an in-memory frame; the sketches keep every value, so it is exact"""
+        if columns is None:
+            columns = frame.select_dtypes(include=[np.number]).columns
+        moments, sketches, minimum, maximum, rows = cls._accumulate(
+            [(frame, pd.Index(columns))], max(200, len(frame))
+        )
+        return cls(moments, sketches, minimum, maximum, rows, len(moments.columns))
+    
+    @classmethod
+    def merge_profiles(cls, profiles):
+        """Combine profiles of disjoint partitions (hours into days, shards into a whole) without raw rows
+        
+        Columns are the union across inputs; a column missing from a partition counts
+        as having no values there. Inputs are left untouched.
+        """
+        columns = []
+        for profile in profiles:
+            columns.extend(column for column in profile.columns if column not in columns)
+        
+        moments = RunningMoments(columns)
+        minimum = np.full(len(columns), np.nan)
+        maximum = np.full(len(columns), np.nan)
+        sketch_k = max((sketch.k for profile in profiles for sketch in profile.sketches), default=200)
+        sketches = [QuantileSketch(sketch_k) for _ in columns]
+        
+        for profile in profiles:
+            positions = moments.columns.get_indexer(profile.columns)
+            part = RunningMoments(columns)
+            part.count[positions], part.mean[positions], part.m2[positions] = (
+                profile.moments.count, profile.moments.mean, profile.moments.m2
+            )
+            moments.merge(part)
+            minimum[positions] = np.fmin(minimum[positions], profile.minimum)
+            maximum[positions] = np.fmax(maximum[positions], profile.maximum)
+            for position, sketch in zip(positions, profile.sketches):
+                sketches[position].merge(sketch)
+        
+        source = {
+            'merged_from': [profile.source.get('path', profile.source.get('merged_from')) for profile in profiles],
+            'built_at': datetime.now().isoformat()
+        }
+        return cls(moments, sketches, minimum, maximum, sum(profile.rows for profile in profiles), len(columns), source)
+    
+    def select(self, columns):
+        """Profile restricted to some columns, reusing the derived arrays instead of re-summarizing"""
+        positions = self.columns.get_indexer(columns)
+        subset = ReferenceProfile(self.moments.select(columns), [self.sketches[p] for p in positions],
+                                  self.minimum[positions], self.maximum[positions], self.rows, len(positions),
+                                  self.source, summarize=False)
+        for name in ('quantiles', 'bin_edges', 'bin_counts', 'cdf_at', 'cdf_below'):
+            setattr(subset, name, getattr(self, name)[positions])
+        return subset
+    
+    def cdf_lookup(self, column, lookups, points):
+        """(fraction < each lookup, fraction <= each point, count) for one column, from its sketch"""
+        sketch = self.sketches[self.columns.get_loc(column)]
+        return sketch.rank(lookups, strict=True), sketch.rank(points), sketch.count
+    
+    def distribution_tests(self, current):
+        """PSI, KS and JS divergence per profile column against a current window
+        
+        current maps column -> sorted NaN-free values, or is anything with columns and
+        cdf_lookup (another profile, a drift_stream.SlidingWindow). Either way each column
+        costs one searchsorted over the precomputed bin edges and quantile grid. Returns
+        arrays aligned with self.columns, NaN where a side has no values.
+        """
+        results = {name: np.full(len(self.columns), np.nan) for name in ('psi', 'ks_statistic', 'ks_p_value', 'js_divergence')}
+        results['current_count'] = np.zeros(len(self.columns))
+        current_columns = set(current.columns) if hasattr(current, 'cdf_lookup') else set(current)
+        
+        for i, column in enumerate(self.columns):
+            if column not in current_columns or self.sketches[i].count == 0:
+                continue
+            
+            edges, points = self.bin_edges[i], self.quantiles[i]
+            lookups = np.concatenate([edges, points])
+            if hasattr(current, 'cdf_lookup'):
+                below, at, size = current.cdf_lookup(column, lookups, points)
+            else:
+                values = current[column]
+                size = len(values)
+                below = np.searchsorted(values, lookups, side='left') / max(size, 1)
+                at = np.searchsorted(values, points, side='right') / max(size, 1)
+            if size == 0:
+                continue
+            
+            # Bin proportions with np.histogram edges: [edge, next edge), with the outer
+            # bins open-ended so current values outside the reference range still count
+            edges_below = below[:len(edges)].copy()
+            edges_below[0], edges_below[-1] = 0.0, 1.0
+            expected = self.bin_counts[i] / self.bin_counts[i].sum()
+            actual = np.diff(edges_below)
+            
+            statistic = max(np.abs(at - self.cdf_at[i]).max(), np.abs(below[len(edges):] - self.cdf_below[i]).max())
+            results['psi'][i] = population_stability_index(expected, actual)
+            results['js_divergence'][i] = jensen_shannon_divergence(expected, actual)
+            results['ks_statistic'][i] = statistic
+            results['ks_p_value'][i] = ks_p_value(statistic, self.sketches[i].count, size)
+            results['current_count'][i] = size
+        
+        return results
+    
+    def save(self, cache_path):
+        """Write the profile as a single .npz, replacing any previous file atomically"""
+        items, levels = [], max((len(sketch.levels) for sketch in self.sketches), default=1)
+        level_sizes = np.zeros((len(self.sketches), levels), dtype=np.int64)
+        for i, sketch in enumerate(self.sketches):
+            sketch_items, sketch_sizes = sketch.to_arrays()
+            items.append(sketch_items)
+            level_sizes[i, :len(sketch_sizes)] = sketch_sizes
+        
+        meta = {
+            'version': PROFILE_VERSION,
+            'columns': list(self.columns),
+            'rows': self.rows,
+            'number_of_columns': self.number_of_columns,
+            'sketch_k': self.sketches[0].k if self.sketches else 200,
+            'source': self.source
+        }
+        
+        temporary = f"{cache_path}.tmp.npz"
+        np.savez_compressed(
+            temporary,
+            meta=np.array(json.dumps(meta)),
+            count=self.moments.count, mean=self.moments.mean, m2=self.moments.m2,
+            minimum=self.minimum, maximum=self.maximum,
+            sketch_counts=np.array([sketch.count for sketch in self.sketches], dtype=np.int64),
+            sketch_items=np.concatenate(items) if items else np.empty(0),
+            sketch_level_sizes=level_sizes
+        )
+        os.replace(temporary, cache_path)
+    
+    @classmethod
+    def load(cls, cache_path):
+        with np.load(cache_path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != PROFILE_VERSION:
+                raise ValueError(f"unsupported profile version {meta.get('version')}")
+            
+            moments = RunningMoments(meta['columns'])
+            moments.count, moments.mean, moments.m2 = data['count'], data['mean'], data['m2']
+            
+            items = data['sketch_items']
+            level_sizes = data['sketch_level_sizes']
+            offsets = np.concatenate([[0], np.cumsum(level_sizes.sum(axis=1))])
+            sketches = [
+                QuantileSketch.from_arrays(meta['sketch_k'], count, items[offsets[i]:offsets[i + 1]], level_sizes[i])
+                for i, count in enumerate(data['sketch_counts'])
+            ]
+            return cls(moments, sketches, data['minimum'], data['maximum'],
+                       meta['rows'], meta['number_of_columns'], meta['source'])
+    
+    def matches_stamp(self, path):
+        return (self.source.get('path') == os.path.abspath(path)
+                and (self.source.get('mtime_ns'), self.source.get('size')) == file_stamp(path))
+    
+    @classmethod
+    def load_or_build(cls, path, cache_path, chunk_size=DEFAULT_CHUNK_SIZE, cached=None, output=None):
+        """Reuse the in-memory or on-disk profile while the reference file is unchanged
+        
+        Returns (profile, how it was obtained). The mtime/size stamp is checked first;
+        a changed stamp with the same size falls back to hashing the content, so a
+        touched but unmodified file is not re-profiled. Warnings are printed to output.
+        """
+        if cached is not None and cached.matches_stamp(path):
+            return cached, 'memory'
+        
+        if os.path.exists(cache_path):
+            try:
+                profile = cls.load(cache_path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  Ignoring unreadable reference profile {cache_path}: {e}", file=output)
+                profile = None
+            
+            if profile is not None and profile.source.get('path') == os.path.abspath(path):
+                if profile.matches_stamp(path):
+                    return profile, 'disk'
+                
+                mtime_ns, size = file_stamp(path)
+                if size == profile.source.get('size') and file_digest(path) == profile.source.get('content_hash'):
+                    profile.source['mtime_ns'] = mtime_ns
+                    profile.save(cache_path)
+                    return profile, 'disk (content unchanged)'
+        
+        profile = cls.build(path, chunk_size or DEFAULT_CHUNK_SIZE)
+        profile.save(cache_path)
+        return profile, 'built'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build, merge and inspect drift profiles (.npz)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    build = commands.add_parser('build', help='profile one dataset partition (CSV, Parquet or npy)')
+    build.add_argument('dataset')
+    build.add_argument('-o', '--output', required=True)
+    build.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    
+    merge = commands.add_parser('merge', help='combine partition profiles into one, e.g. hourly into daily')
+    merge.add_argument('profiles', nargs='+')
+    merge.add_argument('-o', '--output', required=True)
+    
+    show = commands.add_parser('show', help='print a profile summary')
+    show.add_argument('profile')
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'build':
+        profile = ReferenceProfile.build(args.dataset, args.chunk_size)
+        profile.save(args.output)
+        print(f"✅ Profiled {args.dataset}: {profile.rows} rows, {len(profile.columns)} numeric columns -> {args.output}")
+    elif args.command == 'merge':
+        profile = ReferenceProfile.merge_profiles([ReferenceProfile.load(path) for path in args.profiles])
+        profile.save(args.output)
+        print(f"✅ Merged {len(args.profiles)} profiles: {profile.rows} rows, {len(profile.columns)} columns -> {args.output}")
+    else:
+        profile = ReferenceProfile.load(args.profile)
+        print(f"📊 {args.profile}: {profile.rows} rows, {len(profile.columns)} numeric columns")
+        means, stds = profile.moments.means(), profile.moments.stds()
+        for i, column in enumerate(profile.columns):
+            median = profile.quantiles[i][len(QUANTILE_GRID) // 2]
+            print(f"{column:<20} mean {means[i]:.4g}  std {stds[i]:.4g}  median {median:.4g}  "
+                  f"range [{profile.minimum[i]:.4g}, {profile.maximum[i]:.4g}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import asyncio
+import argparse
+import io
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from drift_detector import DriftDetector
+from drift_monitor import DriftMonitor
+from drift_store import MonitoringStore
+
+class MonitorJob:
+    """One monitored model: a DriftMonitor with its own detector, checked every interval_seconds"""
+    
+    def __init__(self, name, reference_path, current_path, drift_threshold=0.2, interval_seconds=3600,
+                 profile_path=None, distribution_tests=False, store=None, profiles_dir='data/profiles',
+                 results_dir='results'):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        # Each job caches its reference profile, so a check only reads the job's current data
+        detector = DriftDetector(reference_path, current_path,
+                                 profile_path=profile_path or os.path.join(profiles_dir, f"{name}.npz"),
+                                 distribution_tests=distribution_tests,
+                                 results_path=os.path.join(results_dir, f"{name}.json"))
+        self.monitor = DriftMonitor(drift_threshold, interval_seconds / 3600, detector=detector, store=store, name=name)
+        self.in_flight = False
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+    
+    def run_check(self, output=None):
+        """One blocking drift check: detect, log to the store and alert if needed; returns the results or None
+        
+        The monitor and detector print to output; a job never overlaps itself, so
+        setting it per check cannot mix two checks' lines.
+        """
+        self.monitor.output = self.monitor.detector.output = output
+        drift_results = self.monitor.run_drift_check()
+        if drift_results:
+            self.monitor.log_monitoring_result(drift_results)
+            if self.monitor.should_alert(drift_results):
+                self.monitor.send_alert(drift_results)
+        return drift_results
+
+class DriftScheduler:
+    """Run many MonitorJobs in one process on an asyncio loop
+    
+    Every job sleeps on its own interval, with the first run spread over the first
+    interval and each later one moved by up to jitter x interval, so hundreds of
+    jobs do not all fire together. Checks run in a thread pool behind a semaphore
+    capping how many are busy at once (pandas and numpy release the GIL for the heavy
+    parts). Backpressure: a job that comes due while its previous check is still
+    running or queued is skipped, so a slow job never piles up behind itself.
+    """
+    
+    def __init__(self, jobs, max_concurrent=None, jitter=0.1, seed=None):
+        self.jobs = jobs
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._checks = set()
+    
+    @classmethod
+    def from_config(cls, path, store_path='drift_monitoring.db', **kwargs):
+        """Jobs from a JSON file: {"jobs": [{"name", "reference", "current", "threshold", "interval_seconds"}, ...]}"""
+        with open(path, 'r') as f:
+            config = json.load(f)
+        
+        store = MonitoringStore(store_path)
+        defaults = config.get('defaults', {})
+        jobs = []
+        for entry in config['jobs']:
+            entry = dict(defaults, **entry)
+            jobs.append(MonitorJob(
+                entry['name'], entry['reference'], entry['current'],
+                drift_threshold=entry.get('threshold', 0.2),
+                interval_seconds=entry.get('interval_seconds', 3600),
+                profile_path=entry.get('profile'),
+                distribution_tests=entry.get('distribution_tests', False),
+                store=store,
+                profiles_dir=entry.get('profiles_dir', 'data/profiles'),
+                results_dir=entry.get('results_dir', 'results')
+            ))
+        return cls(jobs, **kwargs)
+    
+    def _capture_check(self, job):
+        """Run a check in a worker thread with its prints captured; returns (results, output, seconds)"""
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        drift_results = job.run_check(buffer)
+        return drift_results, buffer.getvalue(), time.perf_counter() - start
+    
+    async def _check(self, job, semaphore, executor):
+        try:
+            async with semaphore:
+                loop = asyncio.get_running_loop()
+                drift_results, output, seconds = await loop.run_in_executor(executor, self._capture_check, job)
+            job.runs += 1
+            if drift_results is None:
+                job.failures += 1
+                print(f"❌ [{job.name}] check failed in {seconds:.1f}s")
+                print(output.strip()[-500:])
+            else:
+                status = "🚨 DRIFT" if drift_results.get('dataset_drift_detected') else "✅ OK"
+                alert = " | 🚨 alert sent" if job.monitor.should_alert(drift_results) else ""
+                print(f"{datetime.now().strftime('%H:%M:%S')} [{job.name}] {status} | "
+                      f"drift share {drift_results.get('drift_share', 0):.1%} | {seconds:.1f}s{alert}")
+        except Exception as e:
+            job.failures += 1
+            print(f"❌ [{job.name}] error: {e}")
+        finally:
+            job.in_flight = False
+    
+    async def _run_job(self, job, semaphore, executor):
+        await asyncio.sleep(self._random.uniform(0, job.interval_seconds))
+        while True:
+            if job.in_flight:
+                job.skipped += 1
+                print(f"⏭️  [{job.name}] previous check still running, skipping this one")
+            else:
+                job.in_flight = True
+                # The loop only keeps weak references to tasks, so hold on to each check until it finishes
+                check = asyncio.create_task(self._check(job, semaphore, executor))
+                self._checks.add(check)
+                check.add_done_callback(self._checks.discard)
+            
+            spread = self.jitter * job.interval_seconds
+            await asyncio.sleep(max(0.0, job.interval_seconds + self._random.uniform(-spread, spread)))
+    
+    async def run(self, duration=None):
+        """Schedule every job until cancelled, or for duration seconds"""
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        for job in self.jobs:
+            for directory in (os.path.dirname(job.monitor.detector.profile_path),
+                              os.path.dirname(job.monitor.detector.results_path)):
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix='drift-check')
+        tasks = [asyncio.create_task(self._run_job(job, semaphore, executor)) for job in self.jobs]
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks + list(self._checks):
+                task.cancel()
+            await asyncio.gather(*tasks, *self._checks, return_exceptions=True)
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def start(self, duration=None):
+        """Blocking entry point: run the loop until Ctrl+C or duration, then print per-job counts"""
+        print(f"🚀 Scheduling {len(self.jobs)} drift jobs, at most {self.max_concurrent} checks at a time")
+        try:
+            asyncio.run(self.run(duration))
+        except KeyboardInterrupt:
+            print("\n🛑 Scheduler stopped by user")
+        
+        print("\n📊 Scheduler summary")
+        for job in self.jobs:
+            print(f"  {job.name}: {job.runs} checks, {job.skipped} skipped, {job.failures} failed")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Monitor drift for many datasets from one process')
+    parser.add_argument('config', help='JSON file listing the jobs')
+    parser.add_argument('--max-concurrent', type=int, default=None,
+                        help='checks allowed to run at once (default: one per core)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='random spread of each interval, as a fraction of it')
+    parser.add_argument('--store', default='drift_monitoring.db', help='monitoring store shared by all jobs')
+    parser.add_argument('--duration', type=float, default=None, help='stop after this many seconds')
+    args = parser.parse_args()
+    
+    DriftScheduler.from_config(args.config, args.store, max_concurrent=args.max_concurrent,
+                               jitter=args.jitter).start(args.duration)
@@ -0,0 +1,246 @@
+import pandas as pd
+import numpy as np
+
+class RunningMoments:
+    """Mergeable per-column count, mean and M2 (sum of squared deviations)"""
+    
+    def __init__(self, columns):
+        self.columns = pd.Index(columns)
+        self.count = np.zeros(len(self.columns))
+        self.mean = np.zeros(len(self.columns))
+        self.m2 = np.zeros(len(self.columns))
+    
+    @classmethod
+    def from_frame(cls, frame):
+        """Moments of every column of a numeric frame, skipping NaN like pandas does"""
+        return cls.from_array(frame.columns, frame.to_numpy(dtype=float, na_value=np.nan))
+    
+    @classmethod
+    def from_array(cls, columns, values):
+        """Moments of a 2-D float array with one column per entry in columns"""
+        moments = cls(columns)
+        missing = np.isnan(values)
+        has_missing = missing.any()
+        if has_missing:
+            values = np.where(missing, 0.0, values)
+        
+        moments.count = len(values) - missing.sum(axis=0).astype(float)
+        totals = values.sum(axis=0)
+        moments.mean = np.divide(totals, moments.count, out=np.zeros_like(totals), where=moments.count > 0)
+        
+        # Squared deviations in place, with missing cells zeroed so they add nothing
+        deviations = values - moments.mean
+        if has_missing:
+            deviations[missing] = 0.0
+        moments.m2 = np.square(deviations, out=deviations).sum(axis=0)
+        return moments
+    
+    def update(self, frame):
+        """Fold a chunk of rows into the running moments"""
+        self.merge(RunningMoments.from_frame(frame[self.columns]))
+        return self
+    
+    def merge(self, other):
+        """Combine with moments of the same columns computed elsewhere (Chan et al.)"""
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        weight = np.divide(other.count, total, out=np.zeros_like(total), where=total > 0)
+        
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+        self.mean = self.mean + delta * weight
+        self.count = total
+        return self
+    
+    def select(self, columns):
+        """Moments restricted to a subset of the columns"""
+        positions = self.columns.get_indexer(columns)
+        subset = RunningMoments(self.columns[positions])
+        subset.count = self.count[positions]
+        subset.mean = self.mean[positions]
+        subset.m2 = self.m2[positions]
+        return subset
+    
+    @classmethod
+    def concat(cls, parts):
+        """Side-by-side moments of disjoint column groups, in the order given"""
+        combined = cls([column for part in parts for column in part.columns])
+        if parts:
+            combined.count = np.concatenate([part.count for part in parts])
+            combined.mean = np.concatenate([part.mean for part in parts])
+            combined.m2 = np.concatenate([part.m2 for part in parts])
+        return combined
+    
+    def means(self):
+        """Column means, NaN where a column has no values"""
+        return np.where(self.count > 0, self.mean, np.nan)
+    
+    def stds(self, ddof=1):
+        """Column standard deviations, NaN where there are too few values"""
+        safe = np.where(self.count > ddof, self.count - ddof, 1)
+        return np.where(self.count > ddof, np.sqrt(self.m2 / safe), np.nan)
+
+def drift_scores(reference_mean, reference_std, current_mean):
+    """Normalized mean difference per column, 0 where the reference has no spread"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.abs(current_mean - reference_mean) / reference_std
+    return np.where(reference_std > 0, scores, 0.0)
+
+def percentage_changes(reference_mean, current_mean):
+    """Absolute percentage change of each column mean, 0 where the reference mean is 0"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = np.abs((current_mean - reference_mean) / reference_mean) * 100
+    return np.where(reference_mean != 0, changes, 0.0)
+
+def population_stability_index(expected, actual, epsilon=1e-4):
+    """PSI between two bin proportion vectors; empty bins are floored at epsilon"""
+    expected = np.maximum(expected, epsilon)
+    actual = np.maximum(actual, epsilon)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+def jensen_shannon_divergence(expected, actual):
+    """Base-2 Jensen-Shannon divergence between two proportion vectors, 0 (same) to 1 (disjoint)"""
+    middle = (expected + actual) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left = np.where(expected > 0, expected * np.log2(expected / middle), 0.0)
+        right = np.where(actual > 0, actual * np.log2(actual / middle), 0.0)
+    return float(max(0.0, (left.sum() + right.sum()) / 2))
+
+def ks_p_value(statistic, reference_size, current_size, terms=100):
+    """Asymptotic p-value of a two-sample KS statistic (Kolmogorov distribution)"""
+    effective = np.sqrt(reference_size * current_size / (reference_size + current_size))
+    scaled = (effective + 0.12 + 0.11 / effective) * statistic
+    if scaled < 1e-3:
+        return 1.0
+    k = np.arange(1, terms + 1)
+    p_value = 2 * np.sum((-1) ** (k - 1) * np.exp(-2 * (k * scaled) ** 2))
+    return float(min(1.0, max(0.0, p_value)))
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch for one column
+    
+    Level h holds sorted samples that each stand for 2**h values. A full
+    level is compacted by keeping every other item and promoting them a
+    level, alternating the offset so the rank error does not drift one way.
+    """
+    
+    def __init__(self, k=200):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._offset = 0
+    
+    def _capacity(self, level):
+        return max(2, int(self.k * (2 / 3) ** (len(self.levels) - 1 - level)))
+    
+    def update_sorted(self, values):
+        """Add already sorted, NaN-free values, halving big runs before they land"""
+        self.count += len(values)
+        level = 0
+        while len(values) > self.k:
+            values = values[self._offset::2]
+            self._offset ^= 1
+            level += 1
+        self._insert(level, values)
+        self._compress()
+        return self
+    
+    def update(self, values):
+        """Add raw values, skipping NaN"""
+        values = np.asarray(values, dtype=float)
+        return self.update_sorted(np.sort(values[~np.isnan(values)]))
+    
+    def merge(self, other):
+        """Fold in a sketch built elsewhere; the result summarizes both inputs"""
+        self.count += other.count
+        for level, items in enumerate(other.levels):
+            self._insert(level, items)
+        self._compress()
+        return self
+    
+    def _insert(self, level, items):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate([self.levels[level], items])
+    
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                odd = len(items) % 2
+                promoted = items[self._offset:len(items) - odd:2]
+                self._offset ^= 1
+                self.levels[level] = items[len(items) - odd:]
+                self._insert(level + 1, promoted)
+            level += 1
+    
+    def _weighted(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+    
+    def quantiles(self, qs):
+        """Approximate values at the given quantiles (0..1); NaN for an empty sketch"""
+        qs = np.asarray(qs, dtype=float)
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        values, cumulative = self._weighted()
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        return values[np.minimum(positions, len(values) - 1)]
+    
+    def rank(self, points, strict=False):
+        """Approximate fraction of values <= each point (< with strict)"""
+        if self.count == 0:
+            return np.zeros(len(points))
+        values, cumulative = self._weighted()
+        positions = np.searchsorted(values, points, side='left' if strict else 'right')
+        cumulative = np.concatenate([[0.0], cumulative])
+        return cumulative[positions] / cumulative[-1]
+    
+    def to_arrays(self):
+        """(items, level sizes) for storing the sketch in flat arrays"""
+        return np.concatenate(self.levels), np.array([len(items) for items in self.levels])
+    
+    @classmethod
+    def from_arrays(cls, k, count, items, sizes):
+        sketch = cls(k)
+        sketch.count = int(count)
+        sizes = np.asarray(sizes)[:max(1, np.flatnonzero(sizes).max(initial=-1) + 1)]
+        sketch.levels = list(np.split(np.asarray(items, dtype=float), np.cumsum(sizes)[:-1]))
+        return sketch
+
+def iter_numeric_chunks(source, chunk_size, columns=None):
+    """Yield (chunk, numeric columns) from a CSV path or file object, chunk by chunk
+    
+    Without columns, starts from the numeric columns of the first chunk and drops
+    any that stop parsing as numeric, so the columns yielded last match what
+    select_dtypes would pick on the fully loaded file.
+    """
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        if columns is None:
+            columns = chunk.select_dtypes(include=[np.number]).columns
+        present = [column for column in columns if column in chunk.columns]
+        columns = chunk[present].select_dtypes(include=[np.number]).columns
+        yield chunk, columns
+
+def stream_moments(chunks, columns=None):
+    """Accumulate moments over (chunk, numeric columns) pairs; returns (moments, rows, first chunk)"""
+    moments = None
+    rows = 0
+    first_chunk = None
+    
+    for chunk, numeric in chunks:
+        if moments is None:
+            first_chunk = chunk.head()
+            moments = RunningMoments(numeric)
+        elif len(numeric) < len(moments.columns):
+            moments = moments.select(numeric)
+        
+        moments.update(chunk)
+        rows += len(chunk)
+    
+    if moments is None:
+        moments = RunningMoments(columns if columns is not None else [])
+    return moments, rows, first_chunk
@@ -0,0 +1,241 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+from drift_stats import iter_numeric_chunks
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# An npy dataset is a directory with one .npy array per column and a manifest naming them
+FORMATS = ('csv', 'parquet', 'npy')
+# Extensions per format, the first being the one written
+EXTENSIONS = {'csv': ('.csv',), 'parquet': ('.parquet', '.pq'), 'npy': ('.npy',)}
+MANIFEST = 'manifest.json'
+NPY_DATASET_VERSION = 1
+
+def dataset_format(path):
+    """'parquet', 'npy' or 'csv', from the path's suffix"""
+    path = str(path).rstrip('/')
+    if path.endswith(EXTENSIONS['parquet']):
+        return 'parquet'
+    if path.endswith(EXTENSIONS['npy']) or os.path.isdir(path):
+        return 'npy'
+    return 'csv'
+
+def resolve_dataset(path):
+    """path if it exists, else the one of path + .parquet/.pq/.npy/.csv that does
+    
+    Raises ValueError when more than one does: picking by a fixed order or by age
+    would silently read a stale file after the other format was regenerated, so
+    the extension has to be given instead.
+    """
+    path = str(path).rstrip('/')
+    if os.path.exists(path):
+        return path
+    all_extensions = tuple(extension for extensions in EXTENSIONS.values() for extension in extensions)
+    stem = os.path.splitext(path)[0] if path.endswith(all_extensions) else path
+    candidates = [stem + extension for extension in all_extensions if os.path.exists(stem + extension)]
+    if len(candidates) > 1:
+        raise ValueError(f"{path} is ambiguous: {', '.join(candidates)} exist; give the extension to pick one")
+    return candidates[0] if candidates else path
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("Parquet datasets need pyarrow: pip install pyarrow")
+
+def _read_manifest(path):
+    with open(os.path.join(path, MANIFEST), 'r') as f:
+        return json.load(f)
+
+def dataset_files(path):
+    """Every file holding the dataset's bytes; the manifest first for npy directories"""
+    if dataset_format(path) != 'npy':
+        return [path]
+    manifest = _read_manifest(path)
+    return [os.path.join(path, MANIFEST)] + [os.path.join(path, column['file']) for column in manifest['columns']]
+
+def numeric_columns(path):
+    """Numeric column names from the file's schema, without reading data; None for CSV, which has no schema"""
+    fmt = dataset_format(path)
+    if fmt == 'parquet':
+        _require_pyarrow()
+        schema = pq.read_schema(path)
+        return [field.name for field in schema
+                if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)]
+    if fmt == 'npy':
+        return [column['name'] for column in _read_manifest(path)['columns']
+                if np.dtype(column['dtype']).kind in 'iuf']
+    return None
+
+def dataset_rows(path):
+    """Row count from Parquet metadata or the npy manifest; a CSV is scanned for line breaks instead of parsed"""
+    fmt = dataset_format(path)
+    if fmt == 'parquet':
+        _require_pyarrow()
+        return pq.ParquetFile(path).metadata.num_rows
+    if fmt == 'npy':
+        return _read_manifest(path)['rows']
+    
+    lines, last = 0, b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    # The header is not a row; a last line without a line break is
+    return max(0, lines - 1 + (last != b'\n'))
+
+def _npy_columns(path, columns=None):
+    """{name: read-only memmap} for the requested columns of an npy directory"""
+    manifest = _read_manifest(path)
+    entries = {column['name']: column for column in manifest['columns']}
+    names = list(entries) if columns is None else list(columns)
+    missing = [name for name in names if name not in entries]
+    if missing:
+        raise KeyError(f"Columns not in {path}: {missing}")
+    rows = manifest['rows']
+    return {name: np.load(os.path.join(path, entries[name]['file']), mmap_mode='r')[:rows] for name in names}
+
+def read_dataset(path, columns=None, numeric_only=False, nrows=None):
+    """Load a CSV, Parquet or npy dataset, reading only the requested columns where the format allows
+    
+    Parquet is memory-mapped and projected to the columns before decoding. npy
+    columns become zero-copy memmaps, so pages are only read as they are touched.
+    CSV has no schema, so numeric_only still parses every column and drops the rest.
+    """
+    fmt = dataset_format(path)
+    if numeric_only and fmt != 'csv':
+        numeric = numeric_columns(path)
+        columns = numeric if columns is None else [column for column in columns if column in numeric]
+    
+    if fmt == 'parquet':
+        _require_pyarrow()
+        if nrows is not None:
+            batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=nrows, columns=columns)
+            batch = next(batches, None)
+            if batch is not None:
+                return batch.to_pandas()
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    if fmt == 'npy':
+        arrays = _npy_columns(path, columns)
+        if nrows is not None:
+            arrays = {name: values[:nrows] for name, values in arrays.items()}
+        return pd.DataFrame(arrays, copy=False)
+    
+    frame = pd.read_csv(path, usecols=columns, nrows=nrows)
+    if numeric_only:
+        frame = frame.select_dtypes(include=[np.number])
+    return frame
+
+def iter_dataset_chunks(path, chunk_size, columns=None):
+    """Yield (chunk, numeric columns) like iter_numeric_chunks, for any supported format
+    
+    Columnar formats know their numeric columns up front, so only those are read.
+    """
+    fmt = dataset_format(path)
+    if fmt == 'csv':
+        yield from iter_numeric_chunks(path, chunk_size, columns)
+        return
+    
+    numeric = numeric_columns(path)
+    if columns is not None:
+        numeric = [column for column in columns if column in numeric]
+    numeric = pd.Index(numeric)
+    
+    if fmt == 'parquet':
+        _require_pyarrow()
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size, columns=list(numeric)):
+            yield batch.to_pandas(), numeric
+        return
+    
+    arrays = _npy_columns(path, numeric)
+    rows = len(next(iter(arrays.values()))) if arrays else 0
+    for start in range(0, rows, chunk_size):
+        yield pd.DataFrame({name: values[start:start + chunk_size] for name, values in arrays.items()}, copy=False), numeric
+
+class DatasetWriter:
+    """Write a dataset chunk by chunk in any supported format, so large ones never sit in memory whole
+    
+    npy needs the total row count up front, since each column is one preallocated
+    memory-mapped array. Non-numeric columns are stored as fixed-width strings as
+    wide as the longest one in the first chunk.
+    """
+    
+    def __init__(self, path, fmt=None, rows=None):
+        self.path = path
+        self.fmt = fmt or dataset_format(path)
+        self.rows = rows
+        self.written = 0
+        self._parquet = None
+        self._arrays = None
+        self._columns = []
+        if self.fmt == 'parquet':
+            _require_pyarrow()
+        if self.fmt == 'npy':
+            if rows is None:
+                raise ValueError("npy datasets need the total row count up front")
+            os.makedirs(path, exist_ok=True)
+            # Readers never see a half-written dataset under an old manifest
+            if os.path.exists(os.path.join(path, MANIFEST)):
+                os.remove(os.path.join(path, MANIFEST))
+    
+    def write(self, frame):
+        if self.fmt == 'csv':
+            frame.to_csv(self.path, mode='w' if self.written == 0 else 'a', header=self.written == 0, index=False)
+        elif self.fmt == 'parquet':
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            self._write_npy(frame)
+        self.written += len(frame)
+        return self
+    
+    def _write_npy(self, frame):
+        values = {}
+        for column in frame.columns:
+            series = frame[column]
+            values[column] = series.to_numpy() if series.dtype.kind in 'biuf' else series.astype(str).to_numpy(dtype=str)
+        
+        if self._arrays is None:
+            self._arrays = {}
+            for i, column in enumerate(frame.columns):
+                name = f"column_{i}.npy"
+                dtype = values[column].dtype
+                self._arrays[column] = np.lib.format.open_memmap(
+                    os.path.join(self.path, name), mode='w+', dtype=dtype, shape=(self.rows,)
+                )
+                self._columns.append({'name': str(column), 'file': name, 'dtype': dtype.str})
+        
+        for column, array in self._arrays.items():
+            if values[column].dtype.itemsize > array.dtype.itemsize and array.dtype.kind == 'U':
+                raise ValueError(f"Column {column!r} has longer strings than the first chunk fixed its width to")
+            array[self.written:self.written + len(frame)] = values[column]
+    
+    def close(self):
+        """Finish the file; for npy, flush the columns and write the manifest last"""
+        if self._parquet is not None:
+            self._parquet.close()
+        if self.fmt == 'npy':
+            for array in (self._arrays or {}).values():
+                array.flush()
+            manifest = {'version': NPY_DATASET_VERSION, 'rows': self.written, 'columns': self._columns}
+            tmp_path = os.path.join(self.path, MANIFEST + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, os.path.join(self.path, MANIFEST))
+            self._arrays = None
+
+def write_dataset(frame, path, fmt=None):
+    """Write a whole frame as CSV, Parquet or an npy directory"""
+    writer = DatasetWriter(path, fmt, rows=len(frame))
+    writer.write(frame)
+    writer.close()
+    return path
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    job TEXT NOT NULL DEFAULT 'default',
+    dataset_drift_detected INTEGER NOT NULL,
+    drift_share REAL NOT NULL,
+    number_of_drifted_columns INTEGER NOT NULL,
+    alert_triggered INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    job TEXT NOT NULL DEFAULT 'default',
+    alert_type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    drift_results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_timestamp ON alerts (timestamp);
+"""
+
+JOB_INDEXES = """
+CREATE INDEX IF NOT EXISTS history_job_timestamp ON history (job, timestamp);
+CREATE INDEX IF NOT EXISTS alerts_job_timestamp ON alerts (job, timestamp);
+"""
+
+HISTORY_FIELDS = ('timestamp', 'job', 'dataset_drift_detected', 'drift_share', 'number_of_drifted_columns', 'alert_triggered')
+
+def _timestamp(value):
+    """ISO text for a datetime or ISO string; ISO timestamps sort chronologically as text"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+class MonitoringStore:
+    """Append-only SQLite log of monitoring checks and alerts, indexed by timestamp
+    
+    Each check or alert is one INSERT, so appends cost the same however long the
+    history is, and a crash can lose at most the row being written. WAL mode lets
+    the dashboard read while a monitor writes.
+    """
+    
+    def __init__(self, path='drift_monitoring.db', output=None):
+        self.path = path
+        # Where status prints go; None is sys.stdout at print time
+        self.output = output
+        is_new = not os.path.exists(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+        self._add_job_column()
+        if is_new:
+            self.import_json_logs()
+    
+    def _add_job_column(self):
+        """Stores written before jobs existed get a job column, with their rows under 'default'"""
+        for table in ('history', 'alerts'):
+            columns = [row['name'] for row in self._connection.execute(f'PRAGMA table_info({table})')]
+            if 'job' not in columns:
+                self._connection.execute(f"ALTER TABLE {table} ADD COLUMN job TEXT NOT NULL DEFAULT 'default'")
+        self._connection.executescript(JOB_INDEXES)
+    
+    def close(self):
+        self._connection.close()
+    
+    def _insert(self, sql, values):
+        with self._lock, self._connection:
+            self._connection.execute(sql, values)
+    
+    def _query(self, sql, values):
+        with self._lock:
+            return self._connection.execute(sql, values).fetchall()
+    
+    def append_history(self, entry):
+        """Record one check (a DriftMonitor log entry)"""
+        self._insert(
+            'INSERT INTO history (timestamp, job, dataset_drift_detected, drift_share, number_of_drifted_columns, '
+            'alert_triggered) VALUES (?, ?, ?, ?, ?, ?)',
+            (entry['timestamp'], entry.get('job', 'default'), int(bool(entry['dataset_drift_detected'])),
+             float(entry['drift_share']),
+             int(entry['number_of_drifted_columns']), int(bool(entry['alert_triggered'])))
+        )
+    
+    def append_alert(self, alert):
+        """Record one alert, keeping its drift results as JSON"""
+        self._insert(
+            'INSERT INTO alerts (timestamp, job, alert_type, message, drift_results) VALUES (?, ?, ?, ?, ?)',
+            (alert['timestamp'], alert.get('job', 'default'), alert['alert_type'], alert['message'],
+             json.dumps(alert['drift_results']))
+        )
+    
+    def _range(self, start, end, job=None):
+        clauses, values = [], []
+        if job is not None:
+            clauses.append('job = ?')
+            values.append(job)
+        if start is not None:
+            clauses.append('timestamp >= ?')
+            values.append(_timestamp(start))
+        if end is not None:
+            clauses.append('timestamp < ?')
+            values.append(_timestamp(end))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', values
+    
+    def history(self, start=None, end=None, limit=None, job=None):
+        """Checks in [start, end), oldest first; with limit, the latest limit of them; with job, that job's only"""
+        where, values = self._range(start, end, job)
+        sql = f'SELECT {", ".join(HISTORY_FIELDS)} FROM history{where} ORDER BY timestamp DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(limit)
+        rows = self._query(sql, values)
+        return [
+            dict(row, dataset_drift_detected=bool(row['dataset_drift_detected']),
+                 alert_triggered=bool(row['alert_triggered']))
+            for row in reversed(rows)
+        ]
+    
+    def alerts(self, start=None, end=None, limit=None, job=None):
+        """Alerts in [start, end), oldest first; with limit, the latest limit of them; with job, that job's only"""
+        where, values = self._range(start, end, job)
+        sql = f'SELECT timestamp, job, alert_type, message, drift_results FROM alerts{where} ORDER BY timestamp DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            values.append(limit)
+        rows = self._query(sql, values)
+        return [dict(row, drift_results=json.loads(row['drift_results'])) for row in reversed(rows)]
+    
+    def summary(self, start=None, end=None, job=None):
+        """Check and alert counts plus the latest check in [start, end), aggregated in SQL"""
+        where, values = self._range(start, end, job)
+        row, = self._query(
+            f'SELECT COUNT(*) AS total_checks, COALESCE(SUM(dataset_drift_detected), 0) AS drift_detected, '
+            f'COALESCE(SUM(alert_triggered), 0) AS alerts_triggered, AVG(drift_share) AS mean_drift_share '
+            f'FROM history{where}', values
+        )
+        summary = dict(row)
+        latest = self.history(start, end, limit=1, job=job)
+        summary['latest_check'] = latest[0] if latest else None
+        return summary
+    
+    def import_json_logs(self, alerts_file='drift_alerts.json', history_file='drift_monitoring_history.json'):
+        """Carry over the JSON files earlier versions rewrote on every check, if they are next to the store"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        for name, append in ((history_file, self.append_history), (alerts_file, self.append_alert)):
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+                for entry in entries:
+                    append(entry)
+                print(f"📥 Imported {len(entries)} entries from {name} into {self.path}", file=self.output)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"⚠️  Could not import {name}: {e}", file=self.output)
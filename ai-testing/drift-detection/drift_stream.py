@@ -0,0 +1,180 @@
+import pandas as pd
+import numpy as np
+import io
+import os
+import json
+from collections import deque
+from drift_stats import RunningMoments
+
+class FeedTail:
+    """Rows appended to a CSV or JSONL file since the last read, tracked by byte offset
+    
+    Only complete lines are parsed; a trailing partial line is carried over to the
+    next read. A file that shrinks (truncated or rotated) is read again from the top.
+    """
+    
+    def __init__(self, path, from_start=False, max_bytes=64 << 20, output=None):
+        self.path = path
+        self.from_start = from_start
+        self.max_bytes = max_bytes
+        # Where status prints go; None is sys.stdout at print time
+        self.output = output
+        self.jsonl = path.endswith(('.jsonl', '.ndjson'))
+        self.offset = None
+        self.header = None
+        self._carry = b''
+        self._skip_partial = False
+    
+    def _open_at_start(self, size):
+        self.offset, self.header, self._carry, self._skip_partial = 0, None, b'', False
+        if self.from_start or size == 0:
+            return
+        
+        # Tail -f: keep only the CSV header, then start after the last complete line
+        with open(self.path, 'rb') as f:
+            if not self.jsonl:
+                self.header = f.readline()
+            f.seek(size - 1)
+            self._skip_partial = f.read(1) != b'\n'
+        self.offset = size
+    
+    def read(self):
+        """New complete rows as a frame, empty when nothing was appended"""
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return pd.DataFrame()
+        
+        if self.offset is None:
+            self._open_at_start(size)
+        elif size < self.offset:
+            print(f"🔄 {self.path} shrank, reading it again from the start", file=self.output)
+            self.from_start = True
+            self._open_at_start(size)
+        if size == self.offset:
+            return pd.DataFrame()
+        
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = self._carry + f.read(min(size - self.offset, self.max_bytes))
+        self.offset += len(data) - len(self._carry)
+        
+        end = data.rfind(b'\n') + 1
+        data, self._carry = data[:end], data[end:]
+        if self._skip_partial and end:
+            data = data[data.find(b'\n') + 1:]
+            self._skip_partial = False
+        if not self.jsonl and self.header is None and data:
+            header_end = data.find(b'\n') + 1
+            self.header, data = data[:header_end], data[header_end:]
+        if not data.strip():
+            return pd.DataFrame()
+        
+        if self.jsonl:
+            return pd.DataFrame.from_records([json.loads(line) for line in data.splitlines() if line.strip()])
+        return pd.read_csv(io.BytesIO(self.header + data))
+
+class SlidingWindow:
+    """Moments and reference-bin counts over the latest window_rows rows of a stream
+    
+    Rows arrive in blocks of at most block_rows. Each block is summarized once, as
+    sums shifted by the reference mean plus integer counts below the profile's bin
+    edges and quantile grid, so the window totals are kept by adding each new block
+    and subtracting each evicted one. Adding rows and
+    evicting old blocks therefore costs O(new rows), and a check costs
+    O(columns x grid) however long the window is. The window can overshoot
+    window_rows by less than one block.
+    """
+    
+    def __init__(self, profile, window_rows=5000, block_rows=None):
+        self.profile = profile
+        self.columns = profile.columns
+        self.window_rows = window_rows
+        self.block_rows = block_rows or max(1, window_rows // 20)
+        self.rows = 0
+        self.blocks = deque()
+        self._lookups = np.concatenate([profile.bin_edges, profile.quantiles], axis=1)
+        self._center = np.nan_to_num(profile.moments.means())
+        self._totals = self._empty_block()
+        self._evicted = 0
+    
+    def _empty_block(self):
+        columns = len(self.columns)
+        return {
+            'rows': 0,
+            'count': np.zeros(columns, dtype=np.int64),
+            'shifted_sum': np.zeros(columns),
+            'shifted_square': np.zeros(columns),
+            'below': np.zeros(self._lookups.shape, dtype=np.int64),
+            'at': np.zeros(self.profile.quantiles.shape, dtype=np.int64)
+        }
+    
+    def _summarize(self, values):
+        block = self._empty_block()
+        block['rows'] = len(values)
+        missing = np.isnan(values)
+        block['count'] = len(values) - missing.sum(axis=0)
+        
+        shifted = np.where(missing, 0.0, values - self._center)
+        block['shifted_sum'] = shifted.sum(axis=0)
+        block['shifted_square'] = np.square(shifted, out=shifted).sum(axis=0)
+        
+        # NaN sorts last, so each column's valid values are a sorted prefix
+        ordered = np.sort(values, axis=0)
+        for i, valid in enumerate(block['count'].tolist()):
+            column = ordered[:valid, i]
+            block['below'][i] = np.searchsorted(column, self._lookups[i], side='left')
+            block['at'][i] = np.searchsorted(column, self.profile.quantiles[i], side='right')
+        return block
+    
+    def _apply(self, block, sign):
+        for name, value in block.items():
+            self._totals[name] = self._totals[name] + sign * value
+    
+    def add(self, frame):
+        """Fold newly arrived rows into the window and evict blocks that fell out of it"""
+        if frame.empty:
+            return self
+        frame = frame.reindex(columns=self.columns)
+        values = frame.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        values = values[-self.window_rows:]
+        
+        for start in range(0, len(values), self.block_rows):
+            block = self._summarize(values[start:start + self.block_rows])
+            self.blocks.append(block)
+            self._apply(block, 1)
+        
+        while len(self.blocks) > 1 and self._totals['rows'] - self.blocks[0]['rows'] >= self.window_rows:
+            self._apply(self.blocks.popleft(), -1)
+            self._evicted += 1
+        
+        # Re-add the float sums from the blocks once per window turnover so rounding
+        # from repeated add/subtract cannot build up over a long-running stream
+        if self._evicted >= len(self.blocks):
+            self._totals = self._empty_block()
+            for block in self.blocks:
+                self._apply(block, 1)
+            self._evicted = 0
+        
+        self.rows = self._totals['rows']
+        return self
+    
+    def moments(self):
+        """RunningMoments of the rows currently in the window"""
+        moments = RunningMoments(self.columns)
+        count = self._totals['count'].astype(float)
+        shifted_mean = np.divide(self._totals['shifted_sum'], count, out=np.zeros_like(count), where=count > 0)
+        moments.count = count
+        moments.mean = self._center + shifted_mean
+        moments.m2 = np.maximum(self._totals['shifted_square'] - shifted_mean * self._totals['shifted_sum'], 0.0)
+        return moments
+    
+    def cdf_lookup(self, column, lookups, points):
+        """Same contract as ReferenceProfile.cdf_lookup, answered from the window's counts
+        
+        The counts are taken at the window profile's own bin edges and quantile grid, so
+        lookups and points must be those of self.profile, as in its distribution_tests.
+        """
+        i = self.columns.get_loc(column)
+        size = int(self._totals['count'][i])
+        return self._totals['below'][i] / max(size, 1), self._totals['at'][i] / max(size, 1), size
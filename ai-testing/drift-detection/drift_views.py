@@ -0,0 +1,73 @@
+import numpy as np
+from drift_storage import dataset_format, dataset_rows, iter_dataset_chunks, numeric_columns
+
+# What the dashboard shows, kept free of streamlit so it can be imported and tested on its own
+HISTOGRAM_BINS = 50
+TOP_FEATURES = 20
+FEATURES_PER_PAGE = 20
+SCHEMA_CHUNK_ROWS = 100_000
+
+def dataset_schema(path, chunk_size=SCHEMA_CHUNK_ROWS):
+    """Numeric column names and row count of a dataset, without keeping its values
+    
+    Parquet and npy keep both in their metadata. A CSV has no schema, so it is read
+    once in chunks: a column counts as numeric only if it parses as numeric all the
+    way down, as select_dtypes would decide on the whole file, not just on its
+    first rows.
+    """
+    if dataset_format(path) != 'csv':
+        return {'columns': numeric_columns(path), 'rows': dataset_rows(path)}
+    
+    columns, rows = [], 0
+    for chunk, numeric in iter_dataset_chunks(path, chunk_size):
+        columns, rows = list(numeric), rows + len(chunk)
+    return {'columns': columns, 'rows': rows}
+
+def shared_features(reference_columns, current_columns):
+    """Numeric features present in both datasets, in reference file order"""
+    current = set(current_columns)
+    return [column for column in reference_columns if column in current]
+
+def column_histograms(frame, bins=HISTOGRAM_BINS):
+    """Bin counts, edges, mean and std per numeric column, over its finite values
+    
+    NaN and +/-inf are left out; np.histogram cannot place infinite values in
+    finite bins.
+    """
+    histograms = {}
+    for column in frame.select_dtypes(include=[np.number]).columns:
+        values = frame[column].to_numpy(dtype=float, na_value=np.nan)
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins) if len(values) else (np.zeros(0, dtype=int), np.zeros(1))
+        histograms[column] = {
+            'counts': counts,
+            'edges': edges,
+            'mean': float(values.mean()) if len(values) else np.nan,
+            'std': float(values.std(ddof=1)) if len(values) > 1 else np.nan
+        }
+    return histograms
+
+def rank_features(features, drift_results=None):
+    """Features by drift score, highest first; features without a score follow in their given order"""
+    drift_by_columns = (drift_results or {}).get('drift_by_columns', {})
+    
+    def score(column):
+        value = drift_by_columns.get(column, {}).get('drift_score')
+        return value if isinstance(value, (int, float)) and not np.isnan(value) else -np.inf
+    
+    return sorted(features, key=score, reverse=True)
+
+def search_features(features, query):
+    """Features whose name contains query, ignoring case, in the given order"""
+    query = query.strip().lower()
+    return [column for column in features if query in str(column).lower()]
+
+def page_count(total, per_page=FEATURES_PER_PAGE):
+    """Pages needed for total items, at least one"""
+    return max(1, -(-total // per_page))
+
+def page_items(items, page, per_page=FEATURES_PER_PAGE):
+    """(items on the 1-based page, index of its first item), with page clamped to the pages there are"""
+    page = min(max(1, page), page_count(len(items), per_page))
+    start = (page - 1) * per_page
+    return items[start:start + per_page], start
@@ -0,0 +1,76 @@
+import os
+import time
+from drift_profile import file_digest, file_stamp
+from drift_storage import resolve_dataset
+
+def _snapshot(paths):
+    """{file: (mtime_ns, size)} for the watched files and everything under watched directories"""
+    snapshot = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in names:
+                    full = os.path.join(root, name)
+                    try:
+                        stat = os.stat(full)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[full] = (stat.st_mtime_ns, stat.st_size)
+        elif os.path.exists(path):
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+def content_digest(paths, cache=None, known=None):
+    """One hash over the content of several datasets, None if any is missing
+    
+    cache and known map absolute paths to ((mtime_ns, size), digest). A dataset whose
+    stamp matches either one reuses that digest, so only files whose stat changed
+    are read again; cache is updated with every digest used. known holds digests
+    computed elsewhere, such as the one a reference profile keeps.
+    """
+    digests = []
+    for path in paths:
+        path = resolve_dataset(path)
+        if not os.path.exists(path):
+            return None
+        key, stamp = os.path.abspath(path), file_stamp(path)
+        for entry in ((cache or {}).get(key), (known or {}).get(key)):
+            if entry is not None and entry[0] == stamp:
+                digest = entry[1]
+                break
+        else:
+            digest = file_digest(path)
+        if cache is not None:
+            cache[key] = (stamp, digest)
+        digests.append(digest)
+    return '-'.join(digests)
+
+class ChangeWatcher:
+    """Polls file and directory stats and reports a change once writes have settled
+    
+    Between changes a poll is a stat per watched file, so idle periods cost next to
+    nothing. A burst of writes (a file copied in chunks, several files landing) is
+    reported once, debounce_seconds after the last write seen.
+    """
+    
+    def __init__(self, paths, poll_seconds=1.0, debounce_seconds=2.0):
+        self.paths = [str(path).rstrip('/') for path in paths]
+        self.poll_seconds = poll_seconds
+        self.debounce_seconds = debounce_seconds
+        self._snapshot = _snapshot(self.paths)
+    
+    def wait(self):
+        """Block until something changed and then stayed unchanged for debounce_seconds; returns the changed files"""
+        changed = set()
+        last_change = None
+        while True:
+            time.sleep(self.poll_seconds)
+            snapshot = _snapshot(self.paths)
+            if snapshot != self._snapshot:
+                changed.update(name for name in snapshot.keys() | self._snapshot.keys()
+                               if snapshot.get(name) != self._snapshot.get(name))
+                self._snapshot = snapshot
+                last_change = time.monotonic()
+            elif last_change is not None and time.monotonic() - last_change >= self.debounce_seconds:
+                return sorted(changed)
@@ -0,0 +1,62 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import io
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from drift_detector import DriftDetector
+
+def legacy_drift_scores(reference, current):
+    """Original column-by-column loop, kept as the benchmark baseline"""
+    scores = {}
+    for column in reference.select_dtypes(include=[np.number]).columns:
+        if column in current.columns:
+            ref_mean = reference[column].mean()
+            curr_mean = current[column].mean()
+            ref_std = reference[column].std()
+            scores[column] = abs(curr_mean - ref_mean) / ref_std if ref_std > 0 else 0
+    
+    # calculate_simple_drift_metrics repeated the means in a second loop
+    for column in reference.columns:
+        if column in current.columns:
+            reference[column].mean()
+            current[column].mean()
+    return scores
+
+def build_frames(columns, rows, seed=42):
+    """Reference and current frames with a mean shift in every tenth column"""
+    rng = np.random.default_rng(seed)
+    names = [f"feature_{i}" for i in range(columns)]
+    reference = pd.DataFrame(rng.normal(0, 1, (rows, columns)), columns=names)
+    current = pd.DataFrame(rng.normal(0, 1, (rows, columns)), columns=names)
+    current.iloc[:, ::10] += 3
+    return reference, current
+
+def run_benchmark(column_counts=(10, 100, 1000, 10000), rows=2000):
+    """Time the per-column loop against the vectorized pass for growing column counts"""
+    print(f"📊 Drift scoring benchmark ({rows} rows per dataset)")
+    print(f"{'columns':>8} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>8}")
+    
+    for columns in column_counts:
+        reference, current = build_frames(columns, rows)
+        
+        start = time.perf_counter()
+        legacy = legacy_drift_scores(reference, current)
+        loop_seconds = time.perf_counter() - start
+        
+        detector = DriftDetector(output=io.StringIO())
+        detector.reference_data, detector.current_data = reference, current
+        start = time.perf_counter()
+        results = detector._simple_drift_detection()
+        detector.calculate_simple_drift_metrics()
+        vectorized_seconds = time.perf_counter() - start
+        
+        # Both paths must flag the same columns before their timings mean anything
+        assert all((legacy[column] > 2.0) == info['drift_detected'] for column, info in results['drift_by_columns'].items())
+        
+        print(f"{columns:>8} {loop_seconds:>10.3f} {vectorized_seconds:>15.3f} {loop_seconds / vectorized_seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,86 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+import time
+import argparse
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from drift_storage import FORMATS, EXTENSIONS, PYARROW_AVAILABLE, DatasetWriter, read_dataset
+
+def build_chunks(rows, chunk_rows=1000000, seed=42):
+    """Six float features, an integer label and a string segment column, generated chunk by chunk"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        size = min(chunk_rows, rows - start)
+        chunk = pd.DataFrame(rng.normal(0, 1, (size, 6)), columns=[f"feature_{i}" for i in range(6)])
+        chunk['label'] = rng.integers(0, 3, size)
+        chunk['segment'] = np.array(['retail', 'wholesale', 'online'])[rng.integers(0, 3, size)]
+        yield chunk
+
+def write_datasets(rows, directory, formats):
+    """Write the same rows in every format; returns {format: path}"""
+    paths = {}
+    for fmt in formats:
+        path = os.path.join(directory, f"benchmark_{rows}{EXTENSIONS[fmt][0]}")
+        writer = DatasetWriter(path, fmt, rows=rows)
+        for chunk in build_chunks(rows):
+            writer.write(chunk)
+        writer.close()
+        paths[fmt] = path
+    return paths
+
+def dataset_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+def run_benchmark(row_counts=(1000000, 50000000), directory=None):
+    """Time loading the numeric columns of each format, then a pass over them (column means)"""
+    formats = [fmt for fmt in FORMATS if fmt != 'parquet' or PYARROW_AVAILABLE]
+    if 'parquet' not in formats:
+        print("⚠️  pyarrow not installed, skipping Parquet")
+    
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for rows in row_counts:
+            print(f"\n📊 {rows:,} rows (6 float, 1 int, 1 string column)")
+            start = time.perf_counter()
+            paths = write_datasets(rows, tmp, formats)
+            print(f"Wrote {', '.join(formats)} in {time.perf_counter() - start:.1f}s")
+            print(f"{'format':>8} {'size (MB)':>10} {'load (s)':>9} {'load + means (s)':>17} {'vs CSV':>7}")
+            
+            baseline = None
+            expected = None
+            for fmt in formats:
+                start = time.perf_counter()
+                frame = read_dataset(paths[fmt], numeric_only=True)
+                load_seconds = time.perf_counter() - start
+                means = frame.mean().to_numpy()
+                total_seconds = time.perf_counter() - start
+                
+                # Every format must hold the same numbers before the timings mean anything
+                if expected is None:
+                    expected = means
+                assert np.allclose(means, expected)
+                baseline = baseline or total_seconds
+                del frame
+                
+                print(f"{fmt:>8} {dataset_size(paths[fmt]) / 1e6:>10.1f} {load_seconds:>9.3f} {total_seconds:>17.3f} "
+                      f"{baseline / total_seconds:>6.1f}x")
+            
+            # Free the disk before the next, larger row count
+            for path in paths.values():
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='CSV vs columnar load time for drift datasets')
+    parser.add_argument('rows', type=int, nargs='*', default=[1000000, 50000000],
+                        help='row counts to benchmark (50M rows needs several GB of disk and memory)')
+    parser.add_argument('--dir', default=None, help='where to write the temporary datasets')
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.dir)
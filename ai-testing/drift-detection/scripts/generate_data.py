@@ -2,31 +2,40 @@ import pandas as pd
 from sklearn.datasets import load_iris
 import numpy as np
 import os
+import sys
+import argparse
 
-def create_drifted_data():
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from drift_storage import FORMATS, EXTENSIONS, write_dataset
+
+def create_drifted_data(fmt='csv'):
     # Load the famous Iris dataset
     iris = load_iris(as_frame=True)
     df = iris.frame
     df["target"] = iris.target
-
+    
     # Split into reference & new data
     reference = df.sample(frac=0.7, random_state=42)
     new_data = df.drop(reference.index)
-
+    
     # Introduce drift in the new data (simulate real-world data changes)
     new_data = new_data.copy()
     new_data["sepal width (cm)"] = new_data["sepal width (cm)"] * np.random.uniform(0.8, 1.2, len(new_data))
-
+    
     # Create data directory if it doesn't exist
     os.makedirs("../data", exist_ok=True)
     
     # Save datasets
-    reference.to_csv("../data/reference.csv", index=False)
-    new_data.to_csv("../data/current.csv", index=False)
+    write_dataset(reference, f"../data/reference{EXTENSIONS[fmt][0]}", fmt)
+    write_dataset(new_data, f"../data/current{EXTENSIONS[fmt][0]}", fmt)
     
-    print("✅ Generated reference and current datasets!")
+    print(f"✅ Generated reference and current datasets ({fmt})!")
     print(f"Reference data: {len(reference)} rows")
     print(f"Current data: {len(new_data)} rows")
 
 if __name__ == "__main__":
-    create_drifted_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Generate reference and current Iris datasets with drift')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help='csv, parquet (needs pyarrow) or npy (a directory of memory-mappable column arrays)')
+    args = parser.parse_args()
+    create_drifted_data(args.format)
\ No newline at end of file
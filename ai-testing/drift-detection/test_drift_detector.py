@@ -0,0 +1,177 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import threading
+import pytest
+from drift_detector import DriftDetector
+from drift_stats import RunningMoments, stream_moments
+from drift_storage import iter_dataset_chunks
+
+def make_frames(rows=2000, seed=7):
+    """Reference and current frames with a shifted column, missing values, an int and a string column"""
+    rng = np.random.default_rng(seed)
+    reference = pd.DataFrame({
+        'stable': rng.normal(10, 2, rows),
+        'shifted': rng.normal(0, 1, rows),
+        'count': rng.integers(0, 50, rows),
+        'segment': rng.choice(['a', 'b', 'c'], rows)
+    })
+    reference.loc[rng.choice(rows, 50, replace=False), 'stable'] = np.nan
+    current = reference.copy()
+    current['shifted'] = rng.normal(3, 1, rows)
+    current['stable'] = reference['stable'] + rng.normal(0, 0.1, rows)
+    return reference, current
+
+def legacy_column_metrics(reference, current):
+    """{column: (drift score, percentage change)} from the original column-by-column loop"""
+    metrics = {}
+    for column in reference.select_dtypes(include=[np.number]).columns:
+        if column in current.columns:
+            ref_mean = reference[column].mean()
+            curr_mean = current[column].mean()
+            ref_std = reference[column].std()
+            drift_score = abs(curr_mean - ref_mean) / ref_std if ref_std > 0 else 0
+            pct_change = abs((curr_mean - ref_mean) / ref_mean) * 100 if ref_mean != 0 else 0
+            metrics[column] = (drift_score, pct_change)
+    return metrics
+
+class TestDriftDetector:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.reference, self.current = make_frames()
+    
+    def write_csvs(self, tmp_path):
+        reference_path, current_path = tmp_path / 'reference.csv', tmp_path / 'current.csv'
+        self.reference.to_csv(reference_path, index=False)
+        self.current.to_csv(current_path, index=False)
+        return str(reference_path), str(current_path)
+    
+    def detect(self, reference_path, current_path, **kwargs):
+        detector = DriftDetector(reference_path, current_path, results_path=None, **kwargs)
+        assert detector.load_data()
+        return detector.detect_drift()
+    
+    def test_running_moments_merge_matches_whole_frame(self):
+        """Test merging moments of row slices gives the moments of the whole frame"""
+        numeric = self.reference[['stable', 'shifted', 'count']]
+        whole = RunningMoments.from_frame(numeric)
+        
+        merged = RunningMoments(numeric.columns)
+        for part in np.array_split(np.arange(len(numeric)), [1, 500, 1313]):
+            merged.merge(RunningMoments.from_frame(numeric.iloc[part]))
+        
+        np.testing.assert_array_equal(merged.count, whole.count)
+        np.testing.assert_allclose(merged.means(), whole.means(), rtol=1e-12)
+        np.testing.assert_allclose(merged.stds(), whole.stds(), rtol=1e-12)
+        np.testing.assert_allclose(whole.means(), numeric.mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(whole.stds(), numeric.std().to_numpy(), rtol=1e-12)
+    
+    def test_vectorized_scores_match_column_loop(self):
+        """Test the one-pass drift scores and percentage changes equal the per-column loop they replaced"""
+        reference, current = self.reference.copy(), self.current.copy()
+        # A constant column (std 0) and a zero-mean one exercise the guarded divisions
+        reference['constant'], current['constant'] = 5.0, 6.0
+        reference['zero_mean'] = np.tile([-1.0, 1.0], len(reference) // 2)
+        current['zero_mean'] = current['shifted']
+        current = current.drop(columns=['count'])
+        
+        detector = DriftDetector()
+        detector.reference_data, detector.current_data = reference, current
+        results = detector._simple_drift_detection()
+        metrics = detector.calculate_simple_drift_metrics()
+        expected = legacy_column_metrics(reference, current)
+        
+        assert results['number_of_columns'] == 5
+        assert list(results['drift_by_columns']) == list(metrics) == list(expected)
+        for column, (drift_score, pct_change) in expected.items():
+            assert results['drift_by_columns'][column]['drift_score'] == pytest.approx(drift_score, rel=1e-9)
+            assert results['drift_by_columns'][column]['drift_detected'] == (drift_score > 2.0)
+            assert metrics[column]['percentage_change'] == pytest.approx(pct_change, rel=1e-9)
+        assert results['drift_by_columns']['constant']['drift_score'] == 0
+        assert metrics['zero_mean']['percentage_change'] == 0
+    
+    def test_stream_moments_match_in_memory(self, tmp_path):
+        """Test moments streamed over CSV chunks equal the moments of the loaded file"""
+        reference_path, _ = self.write_csvs(tmp_path)
+        streamed, rows, _ = stream_moments(iter_dataset_chunks(reference_path, 333))
+        loaded = RunningMoments.from_frame(pd.read_csv(reference_path).select_dtypes(include=[np.number]))
+        
+        assert rows == len(self.reference)
+        assert list(streamed.columns) == list(loaded.columns)
+        np.testing.assert_array_equal(streamed.count, loaded.count)
+        np.testing.assert_allclose(streamed.means(), loaded.means(), rtol=1e-12)
+        np.testing.assert_allclose(streamed.stds(), loaded.stds(), rtol=1e-12)
+    
+    @pytest.mark.parametrize('chunk_size', [3, 97, 1000, 5000])
+    def test_chunked_detection_matches_in_memory(self, tmp_path, chunk_size):
+        """Test DriftDetector(chunk_size=...) reports the same drift as the in-memory run"""
+        reference_path, current_path = self.write_csvs(tmp_path)
+        in_memory = self.detect(reference_path, current_path)
+        chunked = self.detect(reference_path, current_path, chunk_size=chunk_size)
+        
+        assert chunked['number_of_columns'] == in_memory['number_of_columns'] == 3
+        assert chunked['number_of_drifted_columns'] == in_memory['number_of_drifted_columns'] == 1
+        assert list(chunked['drift_by_columns']) == list(in_memory['drift_by_columns'])
+        for column, expected in in_memory['drift_by_columns'].items():
+            actual = chunked['drift_by_columns'][column]
+            assert actual['drift_detected'] == expected['drift_detected']
+            assert actual['drift_score'] == pytest.approx(expected['drift_score'], rel=1e-9)
+            assert actual['current_mean'] == pytest.approx(expected['current_mean'], rel=1e-9)
+        assert in_memory['drift_by_columns']['shifted']['drift_detected']
+    
+    def test_reloading_across_modes_keeps_no_stale_data(self, tmp_path):
+        """Test one detector reloaded in memory, in chunks and from a profile scores only what it just read"""
+        reference_path, current_path = self.write_csvs(tmp_path)
+        detector = DriftDetector(reference_path, current_path, results_path=None)
+        assert detector.load_data()
+        assert detector.detect_drift()['number_of_drifted_columns'] == 1
+        
+        detector.chunk_size = 500
+        assert detector.load_data()
+        assert detector.reference_data is None and detector.current_data is None
+        assert detector.detect_drift()['number_of_drifted_columns'] == 1
+        
+        # Every column drifts now, which the streamed moments from the last load do not show
+        self.current.assign(stable=self.current['stable'] + 100, count=self.current['count'] + 100).to_csv(
+            current_path, index=False
+        )
+        detector.chunk_size = None
+        assert detector.load_data()
+        assert detector.reference_moments is None and detector.current_moments is None
+        assert detector.detect_drift()['number_of_drifted_columns'] == 3
+        
+        detector.profile_path = str(tmp_path / 'reference.npz')
+        assert detector.load_data()
+        assert detector.reference_data is None
+        assert detector.detect_drift()['number_of_drifted_columns'] == 3
+    
+    def test_results_file_is_replaced_atomically(self, tmp_path):
+        """Test a reader polling drift_results.json while runs rewrite it always parses a whole file"""
+        results_path = str(tmp_path / 'drift_results.json')
+        detector = DriftDetector(results_path=results_path)
+        detector.use_frames(self.reference, self.current)
+        detector.detect_drift()
+        
+        done = threading.Event()
+        reads = []
+        
+        def poll():
+            while not done.is_set():
+                with open(results_path, 'r') as f:
+                    reads.append(json.load(f)['number_of_drifted_columns'])
+        reader = threading.Thread(target=poll)
+        reader.start()
+        try:
+            for _ in range(20):
+                detector.detect_drift()
+        finally:
+            done.set()
+            reader.join()
+        
+        assert reads and set(reads) == {1}
+        assert os.listdir(tmp_path) == ['drift_results.json']
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,86 @@
+import pandas as pd
+import numpy as np
+import os
+import pytest
+from multiprocessing import shared_memory
+from drift_detector import DriftDetector
+from drift_parallel import parallel_column_statistics
+from drift_profile import ReferenceProfile
+
+def make_frames(rows=3000, columns=10, seed=4):
+    rng = np.random.default_rng(seed)
+    names = [f"feature_{i}" for i in range(columns)]
+    reference = pd.DataFrame(rng.normal(0, 1, (rows, columns)), columns=names)
+    current = pd.DataFrame(rng.normal(0, 1, (rows, columns)) + np.linspace(0, 3, columns), columns=names)
+    current.iloc[::7, 2] = np.nan
+    return reference, current
+
+class TestParallelColumnStatistics:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.reference, self.current = make_frames()
+        self.blocks = []
+    
+    def record_blocks(self, monkeypatch):
+        """Remember the name of every shared memory block created, as it is created"""
+        init = shared_memory.SharedMemory.__init__
+        
+        def recording_init(block, *args, **kwargs):
+            init(block, *args, **kwargs)
+            if kwargs.get('create'):
+                self.blocks.append(block.name)
+        monkeypatch.setattr(shared_memory.SharedMemory, '__init__', recording_init)
+    
+    def assert_blocks_unlinked(self):
+        assert self.blocks
+        for name in self.blocks:
+            assert not os.path.exists(os.path.join('/dev/shm', name.lstrip('/')))
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+    
+    def detect(self, n_jobs):
+        detector = DriftDetector(distribution_tests=True, n_jobs=n_jobs, results_path=None)
+        detector.use_frames(self.reference, self.current)
+        return detector.detect_drift()
+    
+    def test_n_jobs_matches_single_process(self, monkeypatch):
+        """Test n_jobs=4 reports the same drift results as n_jobs=1, and frees its shared memory"""
+        self.record_blocks(monkeypatch)
+        single = self.detect(1)
+        assert not self.blocks
+        parallel = self.detect(4)
+        
+        assert parallel['number_of_drifted_columns'] == single['number_of_drifted_columns'] > 0
+        assert list(parallel['drift_by_columns']) == list(single['drift_by_columns'])
+        for column, expected in single['drift_by_columns'].items():
+            assert parallel['drift_by_columns'][column] == pytest.approx(expected, rel=1e-12)
+        self.assert_blocks_unlinked()
+    
+    def test_with_reference_profile_only_current_is_shared(self, monkeypatch):
+        """Test workers get profile slices, so only the current frame goes to shared memory"""
+        self.record_blocks(monkeypatch)
+        columns = list(self.reference.columns)
+        profile = ReferenceProfile.from_frame(self.reference)
+        reference, current, tests = parallel_column_statistics(None, self.current, columns, 3,
+                                                               reference_profile=profile, distribution_tests=True)
+        
+        assert reference is None and len(self.blocks) == 1
+        expected = profile.distribution_tests({column: np.sort(self.current[column].dropna().to_numpy())
+                                               for column in columns})
+        for name in ('psi', 'ks_statistic', 'js_divergence'):
+            np.testing.assert_allclose(tests[name], expected[name], rtol=1e-12)
+        np.testing.assert_allclose(current.means(), self.current.mean().to_numpy(), rtol=1e-12)
+        self.assert_blocks_unlinked()
+    
+    def test_blocks_unlinked_when_sharing_fails(self, monkeypatch):
+        """Test both the block shared before the failure and the one whose copy failed are unlinked"""
+        self.record_blocks(monkeypatch)
+        with pytest.raises(KeyError):
+            parallel_column_statistics(self.reference, self.current.drop(columns=['feature_5']),
+                                       list(self.reference.columns), 2)
+        assert len(self.blocks) == 2
+        self.assert_blocks_unlinked()
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,144 @@
+import pandas as pd
+import numpy as np
+import os
+import pytest
+from drift_profile import ReferenceProfile, QUANTILE_GRID, file_stamp, file_digest
+from drift_storage import write_dataset
+
+class TestReferenceProfileCache:
+    def setup_method(self):
+        """Setup test fixtures"""
+        rng = np.random.default_rng(3)
+        self.frame = pd.DataFrame({'a': rng.normal(0, 1, 1000).round(3), 'b': rng.integers(0, 9, 1000)})
+        self.builds = 0
+    
+    def count_builds(self, monkeypatch):
+        build = ReferenceProfile.build.__func__
+        
+        def counting_build(cls, *args, **kwargs):
+            self.builds += 1
+            return build(cls, *args, **kwargs)
+        monkeypatch.setattr(ReferenceProfile, 'build', classmethod(counting_build))
+    
+    def set_mtime(self, path, mtime_ns):
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    
+    def test_second_load_reuses_npz(self, tmp_path, monkeypatch):
+        """Test the profile is built once, then read back from the .npz or kept in memory"""
+        self.count_builds(monkeypatch)
+        path, cache_path = str(tmp_path / 'reference.csv'), str(tmp_path / 'reference.npz')
+        self.frame.to_csv(path, index=False)
+        
+        built, origin = ReferenceProfile.load_or_build(path, cache_path)
+        assert origin == 'built' and os.path.exists(cache_path)
+        
+        loaded, origin = ReferenceProfile.load_or_build(path, cache_path)
+        assert origin == 'disk'
+        assert ReferenceProfile.load_or_build(path, cache_path, cached=loaded) == (loaded, 'memory')
+        assert self.builds == 1
+        
+        np.testing.assert_array_equal(loaded.moments.count, built.moments.count)
+        np.testing.assert_allclose(loaded.moments.means(), self.frame.mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_array_equal(loaded.sketches[0].quantiles([0.1, 0.5, 0.9]),
+                                      built.sketches[0].quantiles([0.1, 0.5, 0.9]))
+        assert loaded.source['content_hash'] == file_digest(path)
+        assert (loaded.source['mtime_ns'], loaded.source['size']) == file_stamp(path)
+    
+    def test_touched_file_is_rehashed_not_rebuilt(self, tmp_path, monkeypatch):
+        """Test a new mtime with unchanged content only re-hashes and refreshes the stamp"""
+        self.count_builds(monkeypatch)
+        path, cache_path = str(tmp_path / 'reference.csv'), str(tmp_path / 'reference.npz')
+        self.frame.to_csv(path, index=False)
+        self.set_mtime(path, 1_000_000_000_000_000_000)
+        ReferenceProfile.load_or_build(path, cache_path)
+        
+        self.set_mtime(path, 2_000_000_000_000_000_000)
+        profile, origin = ReferenceProfile.load_or_build(path, cache_path)
+        assert origin == 'disk (content unchanged)'
+        assert profile.source['mtime_ns'] == 2_000_000_000_000_000_000
+        
+        # The refreshed stamp was saved, so the next load skips hashing
+        assert ReferenceProfile.load_or_build(path, cache_path)[1] == 'disk'
+        assert self.builds == 1
+    
+    @pytest.mark.parametrize('same_size', [True, False])
+    def test_edited_file_is_rebuilt(self, tmp_path, monkeypatch, same_size):
+        """Test changed content rebuilds the profile, whether or not the size changed"""
+        self.count_builds(monkeypatch)
+        path, cache_path = str(tmp_path / 'reference.csv'), str(tmp_path / 'reference.npz')
+        self.frame.to_csv(path, index=False)
+        self.set_mtime(path, 1_000_000_000_000_000_000)
+        ReferenceProfile.load_or_build(path, cache_path)
+        size = os.path.getsize(path)
+        
+        edited = self.frame.copy()
+        if same_size:
+            # Same digit count, so only the content hash tells the files apart
+            edited['b'] = (edited['b'] + 1) % 9
+        else:
+            edited['b'] = edited['b'] + 100
+        edited.to_csv(path, index=False)
+        assert (os.path.getsize(path) == size) == same_size
+        self.set_mtime(path, 2_000_000_000_000_000_000)
+        
+        profile, origin = ReferenceProfile.load_or_build(path, cache_path)
+        assert origin == 'built'
+        assert self.builds == 2
+        np.testing.assert_allclose(profile.moments.means(), edited.mean().to_numpy(), rtol=1e-12)
+        assert ReferenceProfile.load(cache_path).source['content_hash'] == file_digest(path)    
+    def test_npy_column_edit_is_rebuilt(self, tmp_path):
+        """Test the stamp and hash cover every column file of an npy dataset"""
+        path, cache_path = str(tmp_path / 'reference.npy'), str(tmp_path / 'reference.npz')
+        write_dataset(self.frame, path, 'npy')
+        assert ReferenceProfile.load_or_build(path, cache_path)[1] == 'built'
+        assert ReferenceProfile.load_or_build(path, cache_path)[1] == 'disk'
+        
+        edited = self.frame.assign(b=self.frame['b'] * 2)
+        write_dataset(edited, path, 'npy')
+        profile, origin = ReferenceProfile.load_or_build(path, cache_path)
+        assert origin == 'built'
+        np.testing.assert_allclose(profile.moments.means(), edited.mean().to_numpy(), rtol=1e-12)
+
+class TestMergeProfiles:
+    def setup_method(self):
+        """Setup test fixtures"""
+        rng = np.random.default_rng(12)
+        rows = 20000
+        self.frame = pd.DataFrame({'a': rng.normal(5, 2, rows), 'b': rng.exponential(3, rows),
+                                   'c': rng.integers(0, 1000, rows).astype(float)})
+        self.frame.loc[rng.choice(rows, 500, replace=False), 'b'] = np.nan
+    
+    def test_halves_merge_to_whole_frame(self):
+        """Test merging profiles of two halves matches profiling the whole frame"""
+        half = len(self.frame) // 2
+        first = ReferenceProfile.from_frame(self.frame.iloc[:half])
+        # The second partition lacks column c, which only counts the first half's values
+        second = ReferenceProfile.from_frame(self.frame.iloc[half:].drop(columns=['c']))
+        first_means = first.moments.means().copy()
+        
+        merged = ReferenceProfile.merge_profiles([first, second])
+        whole = ReferenceProfile.from_frame(self.frame)
+        expected = self.frame.copy()
+        expected.loc[expected.index[half:], 'c'] = np.nan
+        
+        assert list(merged.columns) == ['a', 'b', 'c']
+        assert merged.rows == whole.rows == len(self.frame)
+        np.testing.assert_array_equal(merged.moments.count, expected.count().to_numpy())
+        np.testing.assert_allclose(merged.moments.means(), expected.mean().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(merged.moments.stds(), expected.std().to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(merged.moments.means()[:2], whole.moments.means()[:2], rtol=1e-12)
+        np.testing.assert_array_equal(merged.minimum, expected.min().to_numpy())
+        np.testing.assert_array_equal(merged.maximum, expected.max().to_numpy())
+        np.testing.assert_array_equal(first.moments.means(), first_means)
+        
+        # Merging compacts the sketches, so quantiles hold only to the sketch's rank error
+        for i, column in enumerate(merged.columns):
+            values = np.sort(expected[column].dropna().to_numpy())
+            ranks = np.searchsorted(values, merged.quantiles[i][1:-1], side='right') / len(values)
+            np.testing.assert_allclose(ranks, QUANTILE_GRID[1:-1], atol=0.02)
+            assert merged.quantiles[i][0] == values[0] and merged.quantiles[i][-1] == values[-1]
+        np.testing.assert_allclose(merged.quantiles[0], whole.quantiles[0], atol=0.1)
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
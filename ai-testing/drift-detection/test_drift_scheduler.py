@@ -0,0 +1,137 @@
+import pandas as pd
+import numpy as np
+import asyncio
+import io
+import sys
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from drift_scheduler import DriftScheduler, MonitorJob
+from drift_store import MonitoringStore
+from drift_monitor import DriftMonitor
+
+class StubJob:
+    """Stands in for MonitorJob: a check that sleeps, recording how many checks overlap"""
+    
+    def __init__(self, name, interval_seconds, check_seconds, tracker, results=None, output_line=None):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.check_seconds = check_seconds
+        self.tracker = tracker
+        self.results = {'dataset_drift_detected': False, 'drift_share': 0.0} if results is None else results
+        self.output_line = output_line
+        self.monitor = SimpleNamespace(should_alert=lambda drift_results: False,
+                                       detector=SimpleNamespace(profile_path='', results_path=''))
+        self.in_flight = False
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.running = 0
+        self.max_running = 0
+    
+    def run_check(self, output=None):
+        with self.tracker['lock']:
+            self.tracker['running'] += 1
+            self.tracker['max_running'] = max(self.tracker['max_running'], self.tracker['running'])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.output_line:
+                print(self.output_line, file=output)
+            time.sleep(self.check_seconds)
+            return self.results or None
+        finally:
+            with self.tracker['lock']:
+                self.tracker['running'] -= 1
+                self.running -= 1
+
+class TestDriftScheduler:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.tracker = {'lock': threading.Lock(), 'running': 0, 'max_running': 0}
+    
+    def run(self, jobs, duration, **kwargs):
+        scheduler = DriftScheduler(jobs, jitter=0, seed=1, **kwargs)
+        asyncio.run(scheduler.run(duration=duration))
+        return scheduler
+    
+    def test_slow_job_is_skipped_while_in_flight(self):
+        """Test a job due again while its check still runs is skipped instead of queued behind itself"""
+        job = StubJob('slow', interval_seconds=0.05, check_seconds=0.3, tracker=self.tracker)
+        self.run([job], duration=0.8, max_concurrent=4)
+        
+        assert job.runs >= 2
+        assert job.skipped >= 3
+        assert job.max_running == 1
+        assert not job.in_flight
+    
+    def test_concurrent_checks_are_capped(self):
+        """Test no more than max_concurrent checks run at once, and the cap is reached"""
+        jobs = [StubJob(f"job_{i}", interval_seconds=0.05, check_seconds=0.1, tracker=self.tracker) for i in range(6)]
+        self.run(jobs, duration=0.6, max_concurrent=2)
+        
+        assert self.tracker['max_running'] == 2
+        assert sum(job.runs for job in jobs) >= 4
+        # The rest came due while queued behind the cap, and were skipped
+        assert sum(job.skipped for job in jobs) > 0
+    
+    def test_check_output_is_captured_per_job(self, capsys):
+        """Test each check prints into its own buffer, surfaced only when the check fails"""
+        ok = StubJob('ok', interval_seconds=0.1, check_seconds=0.01, tracker=self.tracker, output_line='ok job detail')
+        failing = StubJob('failing', interval_seconds=0.1, check_seconds=0.01, tracker=self.tracker, results={},
+                          output_line='failing job detail')
+        stdout = sys.stdout
+        self.run([ok, failing], duration=0.35, max_concurrent=2)
+        
+        assert sys.stdout is stdout
+        out = capsys.readouterr().out
+        assert ok.runs > 0 and failing.failures > 0
+        assert 'ok job detail' not in out
+        assert out.count('failing job detail') == failing.failures
+        assert '[ok] ✅ OK' in out
+
+class TestMonitorJob:
+    def test_run_check_prints_to_output(self, tmp_path, capsys):
+        """Test the monitor and detector of a job print to the writer passed in, not to stdout"""
+        rng = np.random.default_rng(1)
+        pd.DataFrame({'x': rng.normal(0, 1, 500)}).to_csv(tmp_path / 'reference.csv', index=False)
+        pd.DataFrame({'x': rng.normal(3, 1, 500)}).to_csv(tmp_path / 'current.csv', index=False)
+        store = MonitoringStore(str(tmp_path / 'monitoring.db'))
+        job = MonitorJob('orders', str(tmp_path / 'reference.csv'), str(tmp_path / 'current.csv'), store=store,
+                         profiles_dir=str(tmp_path), results_dir=str(tmp_path))
+        capsys.readouterr()
+        
+        output = io.StringIO()
+        drift_results = job.run_check(output)
+        output = output.getvalue()
+        
+        assert drift_results['dataset_drift_detected']
+        assert capsys.readouterr().out == ''
+        assert 'Running drift check' in output
+        assert 'DRIFT ALERT TRIGGERED' in output
+        assert store.history(job='orders')[0]['dataset_drift_detected']
+        store.close()
+    
+    def test_distribution_tests_are_opt_in(self, tmp_path):
+        """Test a spread-only change alerts only for a job that enables distribution tests"""
+        rng = np.random.default_rng(2)
+        pd.DataFrame({'x': rng.normal(0, 1, 5000)}).to_csv(tmp_path / 'reference.csv', index=False)
+        pd.DataFrame({'x': rng.normal(0, 3, 5000)}).to_csv(tmp_path / 'current.csv', index=False)
+        store = MonitoringStore(str(tmp_path / 'monitoring.db'))
+        
+        alerts = {}
+        for name, kwargs in (('default', {}), ('tested', {'distribution_tests': True})):
+            job = MonitorJob(name, str(tmp_path / 'reference.csv'), str(tmp_path / 'current.csv'), store=store,
+                             profiles_dir=str(tmp_path), results_dir=str(tmp_path), **kwargs)
+            drift_results = job.run_check(io.StringIO())
+            alerts[name] = job.monitor.should_alert(drift_results)
+            assert ('psi' in drift_results['drift_by_columns']['x']) == bool(kwargs)
+        
+        assert alerts == {'default': False, 'tested': True}
+        assert not DriftMonitor(store=store).detector.distribution_tests
+        store.close()
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,112 @@
+import pandas as pd
+import numpy as np
+import math
+import pytest
+from drift_stats import QuantileSketch, population_stability_index, jensen_shannon_divergence, ks_p_value
+from drift_profile import ReferenceProfile
+
+def exact_ks_statistic(reference, current):
+    """Two-sample KS statistic, the largest gap between the empirical CDFs over every value"""
+    reference, current = np.sort(reference), np.sort(current)
+    points = np.concatenate([reference, current])
+    gaps = (np.searchsorted(reference, points, side='right') / len(reference)
+            - np.searchsorted(current, points, side='right') / len(current))
+    return np.abs(gaps).max()
+
+class TestDistributionStatistics:
+    def test_psi_hand_computed(self):
+        """Test PSI against sum((actual - expected) * ln(actual / expected)) worked out by hand"""
+        assert population_stability_index(np.array([0.5, 0.5]), np.array([0.5, 0.5])) == 0.0
+        # (0.25 - 0.5) ln(0.5) + (0.75 - 0.5) ln(1.5) = 0.25 ln 3
+        assert population_stability_index(np.array([0.5, 0.5]), np.array([0.25, 0.75])) == \
+            pytest.approx(0.25 * math.log(3))
+        # Empty bins are floored at epsilon instead of dividing by zero
+        assert population_stability_index(np.array([0.5, 0.5]), np.array([1.0, 0.0])) == pytest.approx(
+            0.5 * math.log(2) + (1e-4 - 0.5) * math.log(1e-4 / 0.5))
+    
+    def test_js_divergence_hand_computed(self):
+        """Test base-2 JS divergence: 0 for equal, 1 for disjoint, and a worked example in between"""
+        assert jensen_shannon_divergence(np.array([0.3, 0.7]), np.array([0.3, 0.7])) == 0.0
+        assert jensen_shannon_divergence(np.array([1.0, 0.0]), np.array([0.0, 1.0])) == pytest.approx(1.0)
+        # Middle (0.75, 0.25): (0.5 log2(0.5/0.75) + 0.5 log2(0.5/0.25) + log2(1/0.75)) / 2
+        expected = (0.5 * math.log2(0.5 / 0.75) + 0.5 * math.log2(0.5 / 0.25) + math.log2(1 / 0.75)) / 2
+        assert jensen_shannon_divergence(np.array([0.5, 0.5]), np.array([1.0, 0.0])) == pytest.approx(expected)
+    
+    @pytest.mark.parametrize('critical_value, p_value', [(1.2238, 0.10), (1.3581, 0.05), (1.6276, 0.01)])
+    def test_ks_p_value_matches_kolmogorov_table(self, critical_value, p_value):
+        """Test the asymptotic p-value at the tabulated critical values of the Kolmogorov distribution"""
+        size = 10 ** 8
+        effective = math.sqrt(size / 2)
+        statistic = critical_value / (effective + 0.12 + 0.11 / effective)
+        assert ks_p_value(statistic, size, size) == pytest.approx(p_value, abs=1e-3)
+        assert ks_p_value(0.0, size, size) == 1.0
+    
+    def test_profile_tests_on_known_shift(self):
+        """Test profile PSI, JS and KS against values computed directly from the raw samples"""
+        rng = np.random.default_rng(11)
+        reference = rng.normal(0, 1, 5000)
+        shifted = rng.normal(0.5, 1, 4000)
+        same = rng.normal(0, 1, 4000)
+        profile = ReferenceProfile.from_frame(pd.DataFrame({'x': reference}))
+        
+        results = {name: {} for name in ('psi', 'js_divergence', 'ks_statistic', 'ks_p_value')}
+        for label, current in (('shifted', shifted), ('same', same)):
+            tests = profile.distribution_tests({'x': np.sort(current)})
+            for name in results:
+                results[name][label] = tests[name][0]
+            
+            # Bins are the profile's deciles, with the outer ones open-ended
+            edges = profile.bin_edges[0].copy()
+            edges[0], edges[-1] = -np.inf, np.inf
+            # The reference side comes from the sketch, within its rank error of the exact counts
+            expected = profile.bin_counts[0] / profile.bin_counts[0].sum()
+            np.testing.assert_allclose(expected, np.histogram(reference, edges)[0] / len(reference), atol=0.01)
+            actual = np.histogram(current, edges)[0] / len(current)
+            assert results['psi'][label] == pytest.approx(population_stability_index(expected, actual))
+            assert results['js_divergence'][label] == pytest.approx(jensen_shannon_divergence(expected, actual))
+            # KS is read at the 101 grid points, so it can miss the exact sup by a grid step
+            assert results['ks_statistic'][label] == pytest.approx(exact_ks_statistic(reference, current), abs=0.015)
+        
+        assert results['psi']['shifted'] > 0.2 > results['psi']['same']
+        assert results['ks_p_value']['shifted'] < 1e-6
+        assert results['ks_p_value']['same'] > 0.01
+
+class TestQuantileSketch:
+    def test_small_sketch_is_exact(self):
+        """Test a sketch that never compacted answers ranks and quantiles exactly"""
+        values = np.arange(100, dtype=float)
+        sketch = QuantileSketch(k=200).update(values[::-1])
+        np.testing.assert_allclose(sketch.rank([-1, 0, 49.5, 99]), [0.0, 0.01, 0.5, 1.0])
+        np.testing.assert_array_equal(sketch.quantiles([0.0, 0.5, 1.0]), [0, 49, 99])
+    
+    def test_merged_sketches_keep_rank_error_bounded(self):
+        """Test merging 20 partition sketches keeps every rank within 2% of the exact one"""
+        rng = np.random.default_rng(5)
+        parts = [rng.normal(i % 5, 1 + i % 3, 10000) for i in range(20)]
+        values = np.sort(np.concatenate(parts))
+        points = np.quantile(values, np.linspace(0.01, 0.99, 99))
+        exact = np.searchsorted(values, points, side='right') / len(values)
+        
+        merged = QuantileSketch(k=200)
+        for part in parts:
+            merged.merge(QuantileSketch(k=200).update(part))
+        
+        assert merged.count == len(values)
+        # Compaction keeps the sketch small whatever the input size
+        assert sum(len(items) for items in merged.levels) < 1000
+        # KLL keeps the rank error around 1/k per level; 2% is well above what k=200 gives
+        assert np.abs(merged.rank(points) - exact).max() < 0.02
+        quantile_ranks = np.searchsorted(values, merged.quantiles([0.1, 0.5, 0.9]), side='right') / len(values)
+        np.testing.assert_allclose(quantile_ranks, [0.1, 0.5, 0.9], atol=0.02)
+    
+    def test_round_trip_through_arrays(self):
+        """Test to_arrays/from_arrays keeps every level of a compacted sketch"""
+        sketch = QuantileSketch(k=50).update(np.random.default_rng(2).uniform(0, 1, 5000))
+        items, sizes = sketch.to_arrays()
+        restored = QuantileSketch.from_arrays(50, sketch.count, items, sizes)
+        points = np.linspace(0, 1, 11)
+        np.testing.assert_array_equal(restored.rank(points), sketch.rank(points))
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
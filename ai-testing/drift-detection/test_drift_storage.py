@@ -0,0 +1,125 @@
+import pandas as pd
+import numpy as np
+import io
+import os
+import pytest
+from drift_storage import (FORMATS, EXTENSIONS, dataset_format, resolve_dataset, read_dataset,
+                           iter_dataset_chunks, write_dataset, dataset_rows, numeric_columns)
+from drift_detector import DriftDetector
+
+def make_frame(rows=1000, seed=9):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'value': rng.normal(0, 1, rows),
+        'count': rng.integers(0, 100, rows),
+        'segment': rng.choice(['retail', 'online'], rows),
+        'score': rng.uniform(0, 1, rows).astype(np.float32)
+    })
+
+class TestDatasetRoundTrip:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.frame = make_frame()
+    
+    def write(self, tmp_path, fmt):
+        return write_dataset(self.frame, str(tmp_path / f"data{EXTENSIONS[fmt][0]}"), fmt)
+    
+    @pytest.mark.parametrize('fmt', FORMATS)
+    def test_read_back_whole_frame(self, tmp_path, fmt):
+        """Test every format reads back the rows, columns and values it wrote"""
+        path = self.write(tmp_path, fmt)
+        loaded = read_dataset(path)
+        
+        assert list(loaded.columns) == list(self.frame.columns)
+        assert dataset_rows(path) == len(loaded) == len(self.frame)
+        np.testing.assert_allclose(loaded['value'], self.frame['value'], rtol=1e-12)
+        np.testing.assert_allclose(loaded['score'], self.frame['score'], rtol=1e-6)
+        np.testing.assert_array_equal(loaded['count'], self.frame['count'])
+        assert loaded['segment'].astype(str).tolist() == self.frame['segment'].tolist()
+    
+    @pytest.mark.parametrize('fmt', FORMATS)
+    def test_nrows_and_column_projection(self, tmp_path, fmt):
+        """Test nrows, columns and numeric_only read only the requested slice"""
+        path = self.write(tmp_path, fmt)
+        
+        head = read_dataset(path, columns=['count', 'value'], nrows=10)
+        assert len(head) == 10
+        assert sorted(head.columns) == ['count', 'value']
+        np.testing.assert_allclose(head['value'], self.frame['value'][:10], rtol=1e-12)
+        np.testing.assert_array_equal(head['count'], self.frame['count'][:10])
+        
+        numeric = read_dataset(path, numeric_only=True)
+        assert list(numeric.columns) == ['value', 'count', 'score']
+        assert list(read_dataset(path, columns=['segment', 'count'], numeric_only=True).columns) == ['count']
+        if fmt != 'csv':
+            assert numeric_columns(path) == ['value', 'count', 'score']
+    
+    @pytest.mark.parametrize('fmt', FORMATS)
+    @pytest.mark.parametrize('chunk_size', [1, 333, 5000])
+    def test_chunks_cover_every_row(self, tmp_path, fmt, chunk_size):
+        """Test iter_dataset_chunks yields the numeric columns in order, chunk_size rows at a time"""
+        path = self.write(tmp_path, fmt)
+        chunks = list(iter_dataset_chunks(path, chunk_size))
+        
+        assert all(len(chunk) == chunk_size for chunk, _ in chunks[:-1])
+        assert 0 < len(chunks[-1][0]) <= chunk_size
+        assert list(chunks[0][1]) == ['value', 'count', 'score']
+        joined = pd.concat([chunk for chunk, _ in chunks], ignore_index=True)
+        np.testing.assert_allclose(joined['value'], self.frame['value'], rtol=1e-12)
+        np.testing.assert_array_equal(joined['count'], self.frame['count'])
+    
+    @pytest.mark.parametrize('fmt', FORMATS)
+    def test_chunks_with_columns(self, tmp_path, fmt):
+        """Test a column list narrows the numeric columns of each chunk to those asked for"""
+        path = self.write(tmp_path, fmt)
+        chunks = list(iter_dataset_chunks(path, 400, columns=['count', 'segment']))
+        assert len(chunks) == 3
+        assert all(list(numeric) == ['count'] for _, numeric in chunks)
+        np.testing.assert_array_equal(pd.concat([chunk[numeric] for chunk, numeric in chunks])['count'],
+                                      self.frame['count'])
+
+class TestResolveDataset:
+    def touch(self, path):
+        with open(path, 'w') as f:
+            f.write("a\n1\n")
+    
+    def test_pq_is_parquet(self):
+        """Test .pq is recognised as Parquet alongside .parquet"""
+        assert dataset_format('data/reference.pq') == 'parquet'
+        assert '.pq' in EXTENSIONS['parquet']
+    
+    def test_bare_path_resolves_to_its_only_format(self, tmp_path):
+        """Test a bare path picks the one format written for its stem, and names each format's files"""
+        for fmt, extension in [('csv', '.csv'), ('npy', '.npy'), ('parquet', '.pq'), ('parquet', '.parquet')]:
+            os.mkdir(tmp_path / extension[1:])
+            stem = str(tmp_path / extension[1:] / 'reference')
+            assert resolve_dataset(stem) == stem
+            write_dataset(make_frame(10), stem + extension, fmt)
+            assert resolve_dataset(stem) == stem + extension
+    
+    def test_several_formats_are_ambiguous(self, tmp_path):
+        """Test a bare path with more than one format on disk raises instead of silently picking one"""
+        stem = str(tmp_path / 'reference')
+        write_dataset(make_frame(10), stem + '.parquet', 'parquet')
+        # A CSV regenerated after the Parquet file must not be ignored in favour of it
+        self.touch(stem + '.csv')
+        with pytest.raises(ValueError, match='ambiguous'):
+            resolve_dataset(stem)
+        with pytest.raises(ValueError, match='ambiguous'):
+            resolve_dataset(stem + '.npy')
+        assert resolve_dataset(stem + '.csv') == stem + '.csv'
+        assert resolve_dataset(stem + '.parquet') == stem + '.parquet'
+        
+        detector = DriftDetector(stem, stem + '.csv', results_path=None, output=io.StringIO())
+        assert not detector.load_data()
+        assert 'ambiguous' in detector.output.getvalue()
+    
+    def test_missing_extension_falls_back_to_stem(self, tmp_path):
+        """Test a path whose file is missing resolves to another format of the same stem"""
+        stem = str(tmp_path / 'current')
+        self.touch(stem + '.pq')
+        assert resolve_dataset(stem + '.csv') == stem + '.pq'
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,169 @@
+import json
+import io
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from drift_store import MonitoringStore
+from drift_monitor import DriftMonitor
+
+START = datetime(2025, 3, 1, 12, 0, 0)
+
+def history_entry(minutes, job='default', drift_share=0.0, alert=False):
+    return {
+        'timestamp': (START + timedelta(minutes=minutes)).isoformat(),
+        'job': job,
+        'dataset_drift_detected': drift_share > 0,
+        'drift_share': drift_share,
+        'number_of_drifted_columns': int(drift_share * 4),
+        'alert_triggered': alert
+    }
+
+def alert_entry(minutes, job='default'):
+    return {
+        'timestamp': (START + timedelta(minutes=minutes)).isoformat(),
+        'job': job,
+        'alert_type': 'DATA_DRIFT',
+        'message': f"Drift in {job}",
+        'drift_results': {'drift_share': 0.5, 'drift_by_columns': {'x': {'drift_detected': True}}}
+    }
+
+class TestMonitoringStore:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.stores = []
+    
+    def teardown_method(self):
+        for store in self.stores:
+            store.close()
+    
+    def open(self, path, output=None):
+        store = MonitoringStore(str(path), output=output)
+        self.stores.append(store)
+        return store
+    
+    def test_history_alerts_and_summary_with_filters(self, tmp_path):
+        """Test appended checks and alerts come back oldest first, filtered by start, end and job"""
+        store = self.open(tmp_path / 'monitoring.db')
+        # Appended out of order; reads sort by timestamp
+        for minutes, job, share, alert in [(10, 'orders', 0.5, True), (0, 'orders', 0.0, False),
+                                           (5, 'users', 0.25, False), (20, 'orders', 0.0, False),
+                                           (15, 'users', 0.75, True)]:
+            store.append_history(history_entry(minutes, job, share, alert))
+            if alert:
+                store.append_alert(alert_entry(minutes, job))
+        
+        history = store.history()
+        assert [entry['timestamp'] for entry in history] == sorted(entry['timestamp'] for entry in history)
+        assert history[0]['dataset_drift_detected'] is False and history[1]['dataset_drift_detected'] is True
+        assert set(history[0]) == {'timestamp', 'job', 'dataset_drift_detected', 'drift_share',
+                                   'number_of_drifted_columns', 'alert_triggered'}
+        
+        assert [entry['drift_share'] for entry in store.history(job='orders')] == [0.0, 0.5, 0.0]
+        assert [entry['job'] for entry in store.history(start=START + timedelta(minutes=10))] == \
+            ['orders', 'users', 'orders']
+        assert len(store.history(start=START + timedelta(minutes=5), end=START + timedelta(minutes=15))) == 2
+        assert [entry['drift_share'] for entry in store.history(limit=2)] == [0.75, 0.0]
+        latest = store.history(start=(START + timedelta(minutes=5)).isoformat(), job='users', limit=1)
+        assert [entry['drift_share'] for entry in latest] == [0.75]
+        
+        alerts = store.alerts()
+        assert [alert['job'] for alert in alerts] == ['orders', 'users']
+        assert alerts[0]['drift_results']['drift_by_columns']['x']['drift_detected'] is True
+        assert [alert['job'] for alert in store.alerts(start=START + timedelta(minutes=11))] == ['users']
+        assert store.alerts(job='missing') == []
+        
+        summary = store.summary(job='orders')
+        assert summary['total_checks'] == 3
+        assert summary['drift_detected'] == 1 and summary['alerts_triggered'] == 1
+        assert summary['mean_drift_share'] == pytest.approx(0.5 / 3)
+        assert summary['latest_check']['timestamp'] == (START + timedelta(minutes=20)).isoformat()
+        
+        empty = store.summary(start=START + timedelta(days=1))
+        assert empty['total_checks'] == 0 and empty['drift_detected'] == 0
+        assert empty['mean_drift_share'] is None and empty['latest_check'] is None
+    
+    def test_rows_survive_reopening(self, tmp_path):
+        """Test rows written through one store are read by the next one on the same file"""
+        path = tmp_path / 'monitoring.db'
+        self.open(path).append_history(history_entry(0, 'orders', 0.5, True))
+        assert self.open(path).history()[0]['job'] == 'orders'
+    
+    def test_old_store_gets_job_column(self, tmp_path):
+        """Test a store written before jobs existed gains a job column, its rows filed under 'default'"""
+        path = tmp_path / 'monitoring.db'
+        connection = sqlite3.connect(path)
+        connection.executescript("""
+            CREATE TABLE history (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL,
+                dataset_drift_detected INTEGER NOT NULL, drift_share REAL NOT NULL,
+                number_of_drifted_columns INTEGER NOT NULL, alert_triggered INTEGER NOT NULL);
+            CREATE TABLE alerts (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, alert_type TEXT NOT NULL,
+                message TEXT NOT NULL, drift_results TEXT NOT NULL);
+        """)
+        connection.execute("INSERT INTO history (timestamp, dataset_drift_detected, drift_share, "
+                           "number_of_drifted_columns, alert_triggered) VALUES (?, 1, 0.5, 2, 1)",
+                           (START.isoformat(),))
+        connection.execute("INSERT INTO alerts (timestamp, alert_type, message, drift_results) VALUES (?, ?, ?, ?)",
+                           (START.isoformat(), 'DATA_DRIFT', 'old alert', '{}'))
+        connection.commit()
+        connection.close()
+        
+        store = self.open(path)
+        assert store.history()[0]['job'] == 'default'
+        assert store.alerts(job='default')[0]['message'] == 'old alert'
+        store.append_history(history_entry(1, 'orders'))
+        assert [entry['job'] for entry in store.history()] == ['default', 'orders']
+        
+        indexes = {row[1] for row in store._connection.execute("SELECT * FROM sqlite_master WHERE type = 'index'")}
+        assert {'history_job_timestamp', 'alerts_job_timestamp'} <= indexes
+        # Migrating twice is a no-op
+        assert len(self.open(path).history()) == 2
+    
+    def write_json_logs(self, directory, history='[]'):
+        with open(directory / 'drift_monitoring_history.json', 'w') as f:
+            f.write(history)
+        with open(directory / 'drift_alerts.json', 'w') as f:
+            json.dump([alert_entry(0)], f)
+    
+    def test_new_store_imports_json_logs(self, tmp_path, capsys):
+        """Test a new store carries over the JSON logs next to it, once, reporting to its output"""
+        self.write_json_logs(tmp_path, json.dumps([history_entry(0, drift_share=0.5, alert=True), history_entry(1)]))
+        
+        output = io.StringIO()
+        store = self.open(tmp_path / 'monitoring.db', output)
+        assert len(store.history()) == 2 and len(store.alerts()) == 1
+        assert 'Imported 2 entries' in output.getvalue()
+        assert capsys.readouterr().out == ''
+        
+        # An existing store does not import again on its own, but other files can be imported by name
+        store = self.open(tmp_path / 'monitoring.db')
+        assert len(store.history()) == 2
+        with open(tmp_path / 'archive.json', 'w') as f:
+            json.dump([history_entry(30, job='orders')], f)
+        store.import_json_logs(alerts_file='missing.json', history_file='archive.json')
+        assert [entry['job'] for entry in store.history()] == ['default', 'default', 'orders']
+        assert len(store.alerts()) == 1
+    
+    def test_import_skips_bad_json(self, tmp_path):
+        """Test an unreadable log is reported and skipped while the other one still imports"""
+        self.write_json_logs(tmp_path, '[{"timestamp": ')
+        
+        output = io.StringIO()
+        store = self.open(tmp_path / 'monitoring.db', output)
+        assert store.history() == []
+        assert len(store.alerts()) == 1
+        assert 'Could not import drift_monitoring_history.json' in output.getvalue()
+    
+    def test_monitor_store_reports_to_monitor_output(self, tmp_path, capsys):
+        """Test the store a DriftMonitor opens reports its import to the monitor's output"""
+        self.write_json_logs(tmp_path)
+        
+        output = io.StringIO()
+        monitor = DriftMonitor(store_path=str(tmp_path / 'monitoring.db'), output=output)
+        self.stores.append(monitor.store)
+        assert len(monitor.store.alerts()) == 1
+        assert 'Imported 1 entries from drift_alerts.json' in output.getvalue()
+        assert capsys.readouterr().out == ''
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
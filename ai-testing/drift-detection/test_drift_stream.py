@@ -0,0 +1,118 @@
+import pandas as pd
+import numpy as np
+import io
+import json
+import pytest
+from drift_stream import FeedTail, SlidingWindow
+from drift_stats import RunningMoments
+from drift_profile import ReferenceProfile
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+class TestFeedTail:
+    def test_partial_trailing_line_is_carried_over(self, tmp_path):
+        """Test a half-written last line is held back until its line break arrives"""
+        path = str(tmp_path / 'feed.csv')
+        append(path, "a,b\n1,10\n2,20\n3,3")
+        tail = FeedTail(path, from_start=True)
+        
+        assert tail.read().to_dict('list') == {'a': [1, 2], 'b': [10, 20]}
+        assert tail.read().empty
+        
+        append(path, "0\n4,")
+        assert tail.read().to_dict('list') == {'a': [3], 'b': [30]}
+        append(path, "40\n")
+        assert tail.read().to_dict('list') == {'a': [4], 'b': [40]}
+    
+    def test_jsonl_partial_line(self, tmp_path):
+        """Test JSONL feeds carry a partial record over the same way"""
+        path = str(tmp_path / 'feed.jsonl')
+        append(path, json.dumps({'a': 1}) + "\n" + '{"a": ')
+        tail = FeedTail(path, from_start=True)
+        assert tail.read().to_dict('list') == {'a': [1]}
+        append(path, "2}\n")
+        assert tail.read().to_dict('list') == {'a': [2]}
+    
+    def test_tail_skips_existing_rows_and_partial_line(self, tmp_path):
+        """Test tailing from the end keeps the header but skips old rows, including a partial one"""
+        path = str(tmp_path / 'feed.csv')
+        append(path, "a,b\n1,10\n2,2")
+        tail = FeedTail(path)
+        assert tail.read().empty
+        
+        append(path, "0\n5,50\n")
+        assert tail.read().to_dict('list') == {'a': [5], 'b': [50]}
+    
+    def test_truncated_file_is_read_from_the_start(self, tmp_path, capsys):
+        """Test a feed that shrinks (rotated or truncated) is read again from the top, noted on its output"""
+        path = str(tmp_path / 'feed.csv')
+        append(path, "a\n1\n2\n3\n")
+        output = io.StringIO()
+        tail = FeedTail(path, from_start=True, output=output)
+        assert len(tail.read()) == 3
+        
+        with open(path, 'w') as f:
+            f.write("a\n9\n")
+        assert tail.read().to_dict('list') == {'a': [9]}
+        assert 'shrank' in output.getvalue()
+        assert capsys.readouterr().out == ''
+
+class TestSlidingWindow:
+    def setup_method(self):
+        """Setup test fixtures"""
+        rng = np.random.default_rng(8)
+        self.profile = ReferenceProfile.from_frame(pd.DataFrame({'x': rng.normal(0, 1, 4000),
+                                                                 'y': rng.normal(100, 5, 4000)}))
+        self.rng = rng
+    
+    def test_window_matches_recompute_over_last_rows(self, tmp_path):
+        """Test window moments and tests equal a recompute over the rows still in the window after eviction"""
+        path = str(tmp_path / 'feed.csv')
+        append(path, "x,y,label\n")
+        tail = FeedTail(path, from_start=True)
+        window = SlidingWindow(self.profile, window_rows=1000, block_rows=100)
+        seen = []
+        
+        for batch, shift in enumerate([0, 0, 0.5, 1, 2, 2, 3]):
+            rows = 250 + 37 * batch
+            frame = pd.DataFrame({'x': self.rng.normal(shift, 1, rows), 'y': self.rng.normal(100, 5, rows),
+                                  'label': 'batch'})
+            frame.loc[frame.index[::11], 'y'] = np.nan
+            append(path, frame.to_csv(index=False, header=False))
+            
+            arrived = tail.read()
+            assert len(arrived) == rows
+            seen.append(arrived)
+            window.add(arrived)
+            
+            # Whole blocks are evicted, so the window is the last window.rows rows
+            assert 1000 <= window.rows < 1000 + 100 or window.rows == sum(len(part) for part in seen)
+            expected_rows = pd.concat(seen, ignore_index=True)[['x', 'y']].tail(window.rows)
+            expected = RunningMoments.from_frame(expected_rows)
+            moments = window.moments()
+            np.testing.assert_array_equal(moments.count, expected.count)
+            np.testing.assert_allclose(moments.means(), expected.means(), rtol=1e-10)
+            np.testing.assert_allclose(moments.stds(), expected.stds(), rtol=1e-10)
+            
+            tests = self.profile.distribution_tests(window)
+            recomputed = self.profile.distribution_tests({column: np.sort(expected_rows[column].dropna().to_numpy())
+                                                          for column in ('x', 'y')})
+            for name in ('psi', 'ks_statistic', 'js_divergence', 'current_count'):
+                np.testing.assert_allclose(tests[name], recomputed[name], rtol=1e-12)
+        
+        # Old blocks were evicted along the way
+        assert window.rows < sum(len(part) for part in seen)
+    
+    def test_batch_longer_than_window_keeps_the_latest_rows(self):
+        """Test one add of more rows than the window only keeps the newest ones"""
+        window = SlidingWindow(self.profile, window_rows=500, block_rows=50)
+        frame = pd.DataFrame({'x': np.arange(2000.0), 'y': np.ones(2000)})
+        window.add(frame)
+        assert window.rows == 500
+        assert window.moments().means()[0] == pytest.approx(np.arange(1500.0, 2000.0).mean())
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,105 @@
+import pandas as pd
+import numpy as np
+import pytest
+from drift_storage import write_dataset
+from drift_views import (FEATURES_PER_PAGE, column_histograms, dataset_schema, page_count, page_items, rank_features,
+                         search_features, shared_features)
+
+class TestDatasetSchema:
+    def setup_method(self):
+        """Setup test fixtures"""
+        rows = 2500
+        self.frame = pd.DataFrame({
+            'value': np.arange(rows, dtype=float),
+            # Empty for the first rows, then numbers: numeric on the whole file
+            'late_numbers': [np.nan] * 1500 + list(range(rows - 1500)),
+            # Numbers for the first rows, then text: not numeric on the whole file
+            'late_text': [str(i) for i in range(2000)] + ['unknown'] * (rows - 2000),
+            'segment': ['a', 'b'] * (rows // 2)
+        })
+    
+    @pytest.mark.parametrize('chunk_size', [700, 100_000])
+    def test_csv_schema_matches_whole_file(self, tmp_path, chunk_size):
+        """Test a CSV's numeric columns are those of the whole file, not of its first rows"""
+        path = str(tmp_path / 'reference.csv')
+        self.frame.to_csv(path, index=False)
+        
+        schema = dataset_schema(path, chunk_size)
+        loaded = pd.read_csv(path)
+        assert schema['columns'] == list(loaded.select_dtypes(include=[np.number]).columns)
+        assert schema['columns'] == ['value', 'late_numbers']
+        assert schema['rows'] == len(self.frame)
+    
+    @pytest.mark.parametrize('fmt, extension', [('parquet', '.parquet'), ('npy', '.npy')])
+    def test_columnar_schema_from_metadata(self, tmp_path, fmt, extension):
+        """Test Parquet and npy schemas come from their metadata"""
+        path = str(tmp_path / f"reference{extension}")
+        write_dataset(self.frame[['value', 'segment']].assign(count=np.arange(len(self.frame))), path, fmt)
+        assert dataset_schema(path) == {'columns': ['value', 'count'], 'rows': len(self.frame)}
+
+class TestColumnHistograms:
+    def test_infinite_and_missing_values_are_left_out(self):
+        """Test +/-inf and NaN are dropped before binning instead of making np.histogram raise"""
+        frame = pd.DataFrame({
+            'x': [1.0, 2.0, np.inf, 3.0, -np.inf, np.nan, 4.0],
+            'empty': [np.nan, np.inf, -np.inf, np.nan, np.nan, np.nan, np.nan],
+            'label': list('abcdefg')
+        })
+        histograms = column_histograms(frame, bins=3)
+        
+        assert set(histograms) == {'x', 'empty'}
+        x = histograms['x']
+        assert x['counts'].sum() == 4
+        np.testing.assert_allclose(x['edges'], [1.0, 2.0, 3.0, 4.0])
+        assert x['mean'] == pytest.approx(2.5)
+        assert x['std'] == pytest.approx(np.std([1.0, 2.0, 3.0, 4.0], ddof=1))
+        assert len(histograms['empty']['counts']) == 0 and np.isnan(histograms['empty']['mean'])
+
+class TestFeatureViews:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.features = [f"feature_{i}" for i in range(45)]
+    
+    def test_shared_features_keep_reference_order(self):
+        """Test only features in both datasets are kept, in reference order"""
+        assert shared_features(['c', 'a', 'b'], ['b', 'c', 'd']) == ['c', 'b']
+    
+    def test_rank_by_drift_score(self):
+        """Test scored features come first, highest score first, and unscored ones keep their order"""
+        drift_results = {'drift_by_columns': {
+            'feature_3': {'drift_score': 0.5},
+            'feature_7': {'drift_score': 4.0},
+            'feature_1': {'drift_score': float('nan')},
+            'feature_9': {'drift_score': 'N/A'}
+        }}
+        ranked = rank_features(self.features, drift_results)
+        
+        assert ranked[:2] == ['feature_7', 'feature_3']
+        assert ranked[2:] == [column for column in self.features if column not in ('feature_7', 'feature_3')]
+        assert rank_features(self.features) == self.features
+        assert rank_features(self.features, {}) == self.features
+    
+    def test_search_ignores_case_and_spaces(self):
+        """Test a search matches names containing the query, ignoring case and surrounding spaces"""
+        assert search_features(self.features, ' FEATURE_4 ') == ['feature_4'] + [f"feature_4{i}" for i in range(5)]
+        assert search_features(self.features, 'missing') == []
+    
+    def test_pages_cover_every_feature_once(self):
+        """Test pages split the features in order and clamp out-of-range page numbers"""
+        pages = page_count(len(self.features))
+        assert pages == 3 == -(-len(self.features) // FEATURES_PER_PAGE)
+        
+        shown = []
+        for page in range(1, pages + 1):
+            items, start = page_items(self.features, page)
+            assert start == len(shown)
+            shown += items
+        assert shown == self.features
+        
+        assert page_items(self.features, pages + 5) == page_items(self.features, pages)
+        assert page_items(self.features, 0) == (self.features[:FEATURES_PER_PAGE], 0)
+        assert page_count(0) == 1 and page_items([], 1) == ([], 0)
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,117 @@
+import pandas as pd
+import numpy as np
+import os
+import threading
+import time
+import pytest
+import drift_watch
+from drift_watch import ChangeWatcher, content_digest
+from drift_profile import ReferenceProfile, file_digest
+
+class TestContentDigest:
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.hashed = []
+    
+    def count_hashes(self, monkeypatch):
+        def counting_digest(path):
+            self.hashed.append(os.path.basename(path))
+            return file_digest(path)
+        monkeypatch.setattr(drift_watch, 'file_digest', counting_digest)
+    
+    def write(self, path, values):
+        pd.DataFrame({'x': values}).to_csv(path, index=False)
+    
+    def test_only_changed_files_are_hashed(self, tmp_path, monkeypatch):
+        """Test a cached digest is reused while the file's stamp is unchanged"""
+        self.count_hashes(monkeypatch)
+        reference, current = str(tmp_path / 'reference.csv'), str(tmp_path / 'current.csv')
+        self.write(reference, np.arange(100))
+        self.write(current, np.arange(100))
+        cache = {}
+        
+        first = content_digest([current, reference], cache)
+        assert self.hashed == ['current.csv', 'reference.csv']
+        assert content_digest([current, reference], cache) == first
+        assert len(self.hashed) == 2
+        
+        self.write(current, np.arange(100) * 2)
+        second = content_digest([current, reference], cache)
+        assert self.hashed[2:] == ['current.csv']
+        assert second != first
+        assert second == content_digest([current, reference])
+    
+    def test_reference_reuses_profile_hash(self, tmp_path, monkeypatch):
+        """Test the reference is not read when its profile's stamp and hash are known"""
+        reference, current = str(tmp_path / 'reference.csv'), str(tmp_path / 'current.csv')
+        self.write(reference, np.arange(100))
+        self.write(current, np.arange(100))
+        source = ReferenceProfile.build(reference).source
+        known = {source['path']: ((source['mtime_ns'], source['size']), source['content_hash'])}
+        self.count_hashes(monkeypatch)
+        
+        digest = content_digest([current, reference], {}, known)
+        assert self.hashed == ['current.csv']
+        assert digest == f"{file_digest(current)}-{file_digest(reference)}"
+        
+        # A stale profile stamp is not trusted
+        self.write(reference, np.arange(100) + 1)
+        content_digest([current, reference], {}, known)
+        assert self.hashed[1:] == ['current.csv', 'reference.csv']
+    
+    def test_missing_dataset(self, tmp_path):
+        """Test a missing dataset gives no digest"""
+        cache = {}
+        assert content_digest([str(tmp_path / 'missing.csv')], cache) is None
+        assert cache == {}
+
+class TestChangeWatcher:
+    def write_burst(self, path, writes, pause):
+        for i in range(writes):
+            with open(path, 'a') as f:
+                f.write(f"{i}\n")
+            time.sleep(pause)
+    
+    def test_burst_is_reported_once_after_debounce(self, tmp_path):
+        """Test several writes in a row are reported once, debounce_seconds after the last one"""
+        path = str(tmp_path / 'current.csv')
+        with open(path, 'w') as f:
+            f.write("x\n")
+        directory = tmp_path / 'incoming'
+        directory.mkdir()
+        watcher = ChangeWatcher([path, str(directory) + '/'], poll_seconds=0.01, debounce_seconds=0.3)
+        
+        last_write = []
+        
+        def burst():
+            self.write_burst(path, writes=5, pause=0.05)
+            (directory / 'part-0.csv').write_text("x\n1\n")
+            last_write.append(time.monotonic())
+        writer = threading.Thread(target=burst)
+        writer.start()
+        changed = watcher.wait()
+        finished = time.monotonic()
+        writer.join()
+        
+        assert changed == sorted([path, str(directory / 'part-0.csv')])
+        assert finished - last_write[0] >= 0.3 - 0.02
+    
+    def test_quiet_files_do_not_wake_the_watcher(self, tmp_path):
+        """Test the watcher keeps waiting while nothing changes, and reports the next write"""
+        path = str(tmp_path / 'current.csv')
+        with open(path, 'w') as f:
+            f.write("x\n")
+        watcher = ChangeWatcher([path], poll_seconds=0.01, debounce_seconds=0.05)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(watcher.wait()), daemon=True)
+        waiter.start()
+        
+        waiter.join(0.3)
+        assert waiter.is_alive() and not result
+        self.write_burst(path, writes=1, pause=0)
+        waiter.join(2)
+        assert result == [[path]]
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])